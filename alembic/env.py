@@ -0,0 +1,59 @@
+"""
+Окружение миграций Alembic
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base, get_connect_args
+import app.models.task  # noqa: F401
+import app.models.task_archive  # noqa: F401
+import app.models.task_change  # noqa: F401
+import app.models.task_counter  # noqa: F401
+import app.models.task_search  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """URL базы данных: из -x url=... или из настроек приложения"""
+    return context.get_x_argument(as_dictionary=True).get("url", settings.database_url)
+
+
+def run_migrations_offline() -> None:
+    """Генерация SQL без подключения к базе данных"""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Выполнение миграций через подключение к базе данных"""
+    url = get_url()
+    connectable = create_engine(url, connect_args=get_connect_args(url), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
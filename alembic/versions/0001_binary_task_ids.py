@@ -0,0 +1,72 @@
+"""Перевод идентификаторов задач из строк в 16-байтовые BLOB
+
+Бинарный формат включается явно: ID конвертируются, только если upgrade
+запущен с UUID_STORAGE=binary, и приложение затем запускается с ним же.
+При хранении по умолчанию (string) миграция ничего не меняет, поэтому
+alembic upgrade head не переводит ID базы, созданной без нее. Перед
+конвертацией остановите приложение; downgrade возвращает строки (после
+него запускайте приложение с UUID_STORAGE=string).
+
+В SQLite значения конвертируются на месте: столбец с TEXT-affinity хранит
+BLOB без преобразования, поэтому таблица не пересоздается, а rowid, триггеры
+счетчиков и полнотекстового индекса сохраняются. В PostgreSQL идентификаторы
+уже хранятся в нативном типе uuid (16 байт), миграция ничего не делает.
+
+Revision ID: 0001_binary_task_ids
+Revises:
+Create Date: 2026-10-17 00:00:00
+"""
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = "0001_binary_task_ids"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Количество строк, конвертируемых за один проход
+BATCH_SIZE = 10000
+
+
+def _convert(convert) -> None:
+    """Пакетная перезапись tasks.id по rowid"""
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite":
+        return
+
+    last_rowid = 0
+    while True:
+        rows = connection.execute(
+            sa.text("SELECT rowid, id FROM tasks WHERE rowid > :last ORDER BY rowid LIMIT :limit"),
+            {"last": last_rowid, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        connection.execute(
+            sa.text("UPDATE tasks SET id = :id WHERE rowid = :rowid"),
+            [{"id": convert(task_id), "rowid": rowid} for rowid, task_id in rows],
+        )
+        last_rowid = rows[-1][0]
+
+
+def _to_bytes(value):
+    return uuid.UUID(value).bytes if isinstance(value, str) else value
+
+
+def _to_string(value):
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+def upgrade() -> None:
+    if settings.uuid_storage == "binary":
+        _convert(_to_bytes)
+
+
+def downgrade() -> None:
+    _convert(_to_string)
@@ -0,0 +1,74 @@
+"""Номера изменений задач и надгробия удалений для синхронизации клиентов
+
+Добавляет tasks.change_seq с индексом (change_seq, id), таблицы
+task_change_sequence и task_tombstones и триггеры, которые их ведут.
+Существующим задачам присваивается номер 1, счетчик продолжается с него,
+поэтому первая синхронизация без токена вернет все задачи.
+
+Миграция создает только свои объекты: остальные таблицы (счетчики,
+агрегаты, история) в базе исходной версии еще не созданы, их создает
+приложение при запуске.
+
+Revision ID: 0002_task_change_seq
+Revises: 0001_binary_task_ids
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.task import GUID
+from app.models.task_archive import without_archive_check
+from app.models.task_change import POSTGRESQL_CHANGE_TRIGGERS, SEED_SEQUENCE_SQL, SQLITE_CHANGE_TRIGGERS
+
+revision = "0002_task_change_seq"
+down_revision = "0001_binary_task_ids"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False, comment="Номер последнего изменения"),
+    )
+    op.execute("UPDATE tasks SET change_seq = 1")
+    op.create_index("ix_tasks_change_seq_id", "tasks", ["change_seq", "id"])
+
+    op.create_table(
+        "task_change_sequence",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, comment="Последний выданный номер изменения"),
+        sa.Column("purged_seq", sa.BigInteger(), nullable=False, comment="Номер, до которого надгробия удалены"),
+    )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", GUID(), primary_key=True, comment="Идентификатор удаленной задачи"),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False, comment="Номер изменения удаления"),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False, comment="Время удаления"),
+    )
+    op.create_index("ix_task_tombstones_change_seq_id", "task_tombstones", ["change_seq", "id"])
+    op.execute(SEED_SEQUENCE_SQL)
+
+    # Триггеры в том виде, как до появления архива (его проверку добавляет 0004).
+    # Тексты триггеров рассчитаны на DDL: знаки % в них удвоены
+    triggers = POSTGRESQL_CHANGE_TRIGGERS if op.get_bind().dialect.name == "postgresql" else SQLITE_CHANGE_TRIGGERS
+    for statement in triggers:
+        op.execute(sa.DDL(without_archive_check(statement)))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_change_seq ON tasks")
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_tombstone ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS tasks_change_seq_trigger()")
+        op.execute("DROP FUNCTION IF EXISTS tasks_tombstone_trigger()")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_change_seq_insert")
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_change_seq_update")
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_tombstone")
+
+    op.drop_table("task_tombstones")
+    op.drop_table("task_change_sequence")
+    op.drop_index("ix_tasks_change_seq_id", table_name="tasks")
+    op.drop_column("tasks", "change_seq")
@@ -0,0 +1,41 @@
+"""Аренда задач исполнителями (POST /api/v1/tasks/claim)
+
+Добавляет tasks.lease_owner, tasks.lease_expires_at и частичный индекс
+аренд задач в работе, по которому задачи с истекшей арендой возвращаются
+в очередь.
+
+Revision ID: 0003_task_leases
+Revises: 0002_task_change_seq
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.task import LEASED_CONDITION
+
+revision = "0003_task_leases"
+down_revision = "0002_task_change_seq"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column("lease_owner", sa.String(128), nullable=True, comment="Исполнитель, взявший задачу"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True, comment="Срок аренды задачи исполнителем"),
+    )
+    op.create_index(
+        "ix_tasks_leased_expires_at", "tasks", ["status", "lease_expires_at"],
+        sqlite_where=LEASED_CONDITION, postgresql_where=LEASED_CONDITION,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_leased_expires_at", table_name="tasks")
+    op.drop_column("tasks", "lease_expires_at")
+    op.drop_column("tasks", "lease_owner")
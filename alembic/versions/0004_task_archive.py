@@ -0,0 +1,128 @@
+"""Архив завершенных задач (tasks_archive)
+
+Добавляет таблицу tasks_archive, колонку task_counters.archived и условие
+в триггерах удаления tasks (агрегаты статистики и надгробия синхронизации):
+перенос задачи в архив не считается ее удалением. Существующие задачи не
+переносятся - это делает python -m app.cli archive-tasks.
+
+Счетчики и агрегаты создает приложение при запуске, поэтому в базе исходной
+версии их еще нет: тогда колонку и триггеры с условием на архив создаст
+приложение, а миграция меняет только существующие объекты.
+
+Downgrade возвращает архивные задачи в tasks и пересчитывает агрегаты.
+
+Revision ID: 0004_task_archive
+Revises: 0003_task_leases
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.task import GUID, TaskStatus
+from app.models.task_archive import (
+    ARCHIVE_COLUMNS,
+    POSTGRESQL_ARCHIVE_COUNTER_TRIGGERS,
+    SQLITE_ARCHIVE_COUNTER_TRIGGERS,
+    without_archive_check,
+)
+from app.models.task_change import POSTGRESQL_CHANGE_TRIGGERS, SQLITE_CHANGE_TRIGGERS
+from app.models.task_rollup import POSTGRESQL_ROLLUP_TRIGGERS, SQLITE_ROLLUP_TRIGGERS, rebuild_rollups_statements
+
+revision = "0004_task_archive"
+down_revision = "0003_task_leases"
+branch_labels = None
+depends_on = None
+
+# Тип статуса PostgreSQL уже создан вместе с tasks; в SQLite - VARCHAR, как у tasks
+STATUS_TYPE = postgresql.ENUM(TaskStatus, name="taskstatus", create_type=False)
+
+# Триггеры удаления SQLite, которые получают условие на архив
+SQLITE_DELETE_TRIGGERS = ("trg_tasks_tombstone", "trg_tasks_rollups_delete")
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _delete_triggers(archive_check: bool) -> None:
+    """
+    Пересоздание триггеров удаления tasks с условием на архив или без него.
+
+    Триггеры номеров изменений выполняются через DDL (знаки % удвоены),
+    агрегатов - как text; триггер агрегатов есть, только если приложение
+    уже создало task_rollups.
+    """
+    if op.get_bind().dialect.name == "postgresql":
+        change_triggers, rollup_triggers = POSTGRESQL_CHANGE_TRIGGERS, POSTGRESQL_ROLLUP_TRIGGERS
+    else:
+        change_triggers, rollup_triggers = SQLITE_CHANGE_TRIGGERS, SQLITE_ROLLUP_TRIGGERS
+        for name in SQLITE_DELETE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    prepare = (lambda statement: statement) if archive_check else without_archive_check
+    for statement in change_triggers:
+        if "tasks_archive" in statement:
+            op.execute(sa.DDL(prepare(statement)))
+    if _has_table("task_rollups"):
+        for statement in rollup_triggers:
+            if "tasks_archive" in statement:
+                op.execute(sa.text(prepare(statement)))
+
+
+def upgrade() -> None:
+    if _has_table("task_counters"):
+        op.add_column(
+            "task_counters",
+            sa.Column("archived", sa.Integer(), server_default="0", nullable=False, comment="Количество архивных задач в статусе"),
+        )
+
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", GUID(), primary_key=True, comment="Идентификатор задачи"),
+        sa.Column("title", sa.String(255), nullable=False, comment="Название задачи"),
+        sa.Column("description", sa.Text(), nullable=True, comment="Описание задачи"),
+        sa.Column("status", STATUS_TYPE, nullable=False, comment="Статус задачи"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, comment="Дата создания"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, comment="Дата последнего обновления"),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False, comment="Номер последнего изменения"),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False, comment="Время переноса в архив"),
+    )
+    op.create_index("ix_tasks_archive_created_at_id", "tasks_archive", ["created_at", "id"])
+    op.create_index("ix_tasks_archive_status_created_at_id", "tasks_archive", ["status", "created_at", "id"])
+
+    # Счетчики архива обращаются к task_counters только при записи, поэтому
+    # создаются и до того, как приложение создаст эту таблицу
+    if op.get_bind().dialect.name == "postgresql":
+        counter_triggers = POSTGRESQL_ARCHIVE_COUNTER_TRIGGERS
+    else:
+        counter_triggers = SQLITE_ARCHIVE_COUNTER_TRIGGERS
+    for statement in counter_triggers:
+        op.execute(statement)
+
+    _delete_triggers(archive_check=True)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    columns = ", ".join(ARCHIVE_COLUMNS)
+
+    # Архивные задачи возвращаются в tasks: триггеры вставки снова учитывают их
+    # в счетчиках и агрегатах, поэтому агрегаты затем пересчитываются целиком
+    op.execute(f"INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_archive")
+    op.execute("DELETE FROM tasks_archive")
+    if _has_table("task_rollups"):
+        op.execute("DELETE FROM task_rollups")
+        for statement in rebuild_rollups_statements(connection.dialect.name):
+            op.execute(statement)
+
+    if connection.dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS trg_tasks_archive_counters ON tasks_archive")
+        op.execute("DROP FUNCTION IF EXISTS tasks_archive_counters_trigger()")
+
+    _delete_triggers(archive_check=False)
+
+    op.drop_table("tasks_archive")
+    if _has_table("task_counters"):
+        op.drop_column("task_counters", "archived")
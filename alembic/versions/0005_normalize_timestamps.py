@@ -0,0 +1,47 @@
+"""Единый формат временных меток задач в SQLite
+
+Строки, созданные до перехода на временные метки Python, хранят created_at
+и updated_at в формате server_default CURRENT_TIMESTAMP: 'YYYY-MM-DD HH:MM:SS'.
+SQLAlchemy записывает и связывает значения как 'YYYY-MM-DD HH:MM:SS.ffffff',
+а SQLite сравнивает их как текст, поэтому keyset-курсор пропускал старые
+строки из той же секунды, что и курсор, а условие If-Match их не находило.
+Миграция дописывает к старым значениям нулевые микросекунды. В PostgreSQL
+временные метки хранятся в нативном типе, миграция ничего не делает.
+
+Downgrade не нужен: исходная версия читает оба формата.
+
+Revision ID: 0005_normalize_timestamps
+Revises: 0004_task_archive
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+
+revision = "0005_normalize_timestamps"
+down_revision = "0004_task_archive"
+branch_labels = None
+depends_on = None
+
+# Таблицы и колонки с временными метками задач
+COLUMNS = {
+    "tasks": ("created_at", "updated_at"),
+    "tasks_archive": ("created_at", "updated_at"),
+}
+
+# Длина значения CURRENT_TIMESTAMP: 'YYYY-MM-DD HH:MM:SS'
+LEGACY_LENGTH = 19
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = {LEGACY_LENGTH}"
+            )
+
+
+def downgrade() -> None:
+    pass
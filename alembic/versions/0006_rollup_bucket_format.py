@@ -0,0 +1,51 @@
+"""Формат начала интервала агрегатов в SQLite
+
+Триггеры и пересчет агрегатов записывали task_rollups.bucket_start как
+'YYYY-MM-DD HH:00:00', а границы периода связываются в формате
+'YYYY-MM-DD HH:MM:SS.ffffff'. SQLite сравнивает их как текст, поэтому
+интервал, который начинается ровно в начале периода, не попадал в
+/stats?since=... Миграция дописывает к существующим значениям нулевые
+микросекунды и пересоздает триггеры агрегатов в новом формате. Если
+приложение еще не создало task_rollups, триггеры создаст оно. В PostgreSQL
+bucket_start хранится в нативном типе, миграция ничего не делает.
+
+Downgrade не нужен: исходная версия читает оба формата.
+
+Revision ID: 0006_rollup_bucket_format
+Revises: 0005_normalize_timestamps
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.task_rollup import SQLITE_ROLLUP_TRIGGERS
+
+revision = "0006_rollup_bucket_format"
+down_revision = "0005_normalize_timestamps"
+branch_labels = None
+depends_on = None
+
+# Триггеры агрегатов SQLite
+SQLITE_TRIGGERS = ("trg_tasks_rollups_insert", "trg_tasks_rollups_delete", "trg_tasks_rollups_update")
+
+# Длина значения без микросекунд: 'YYYY-MM-DD HH:MM:SS'
+LEGACY_LENGTH = 19
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite" or not sa.inspect(connection).has_table("task_rollups"):
+        return
+
+    for name in SQLITE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute(
+        f"UPDATE task_rollups SET bucket_start = bucket_start || '.000000' WHERE length(bucket_start) = {LEGACY_LENGTH}"
+    )
+    for statement in SQLITE_ROLLUP_TRIGGERS:
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    pass
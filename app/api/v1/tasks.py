@@ -2,31 +2,91 @@
 API endpoints для работы с задачами
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Union
 from uuid import UUID
 
-from app.core.database import get_db
-from app.repositories.task_repository import TaskRepository
-from app.services.task_service import TaskService, TaskNotFoundError, TaskValidationError
+from app.core import cache
+from app.core.config import settings
+from app.core.database import get_task_db
+from app.core.etag import make_etag, list_etag, http_date
+from app.core.pagination import ListOrder
+from app.repositories.task_repository import AsyncTaskRepository, SyncTaskRepository
+from app.services import broadcast, group_commit, history
+from app.services.task_export import ExportFormat, MEDIA_TYPES
+from app.services.task_service import (
+    AsyncTaskService,
+    TaskNotFoundError,
+    TaskValidationError,
+    TaskNotModifiedError,
+    TaskPreconditionFailedError,
+    TaskArchivedError,
+    TaskLeaseConflictError,
+    TaskSyncExpiredError
+)
 from app.schemas.task import (
     TaskCreate, 
     TaskUpdate, 
     TaskResponse, 
     TaskList,
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskBulkDelete,
     APIResponse,
+    TaskListResponse,
+    TaskChangesResponse,
+    TaskClaimResponse,
+    TaskPartialList,
+    TASK_FIELDS,
     ErrorResponse
 )
 from app.models.task import TaskStatus
+from app.models.task_rollup import RollupGranularity
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+FIELDS_DESCRIPTION = f"Поля задачи через запятую ({', '.join(TASK_FIELDS)}); по умолчанию все поля"
+
+
+def get_task_service(db: Union[Session, AsyncSession] = Depends(get_task_db)) -> AsyncTaskService:
+    """Dependency для получения AsyncTaskService поверх сессии выбранного пути данных"""
+    repository = AsyncTaskRepository(db) if isinstance(db, AsyncSession) else SyncTaskRepository(db)
+    return AsyncTaskService(
+        repository, cache=cache.task_cache, history=history.task_history, broadcast=broadcast.task_broadcast
+    )
+
+
+def set_task_headers(response: Response, task: TaskResponse) -> None:
+    """Заголовки версии задачи для условных запросов"""
+    response.headers["ETag"] = make_etag(task.id, task.updated_at)
+    response.headers["Last-Modified"] = http_date(task.updated_at)
+
+
+def json_response(payload: APIResponse, headers: Optional[dict] = None, exclude_unset: bool = False) -> Response:
+    """
+    Ответ, сериализованный Pydantic за один проход.
+
+    Готовый Response FastAPI отдает как есть, без повторной валидации через
+    response_model и jsonable_encoder; response_model остается для схемы OpenAPI.
+    exclude_unset оставляет у частичных задач (fields=) только выбранные поля.
+    """
+    return Response(
+        content=payload.model_dump_json(exclude_unset=exclude_unset),
+        media_type="application/json",
+        headers=headers
+    )
 
-def get_task_service(db: Session = Depends(get_db)) -> TaskService:
-    """Dependency для получения TaskService"""
-    repository = TaskRepository(db)
-    return TaskService(repository)
+
+def not_modified_response(error: TaskNotModifiedError) -> Response:
+    """Ответ 304 без тела"""
+    headers = {"ETag": error.etag}
+    if error.last_modified is not None:
+        headers["Last-Modified"] = http_date(error.last_modified)
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
 
 @router.post(
@@ -38,11 +98,15 @@ def get_task_service(db: Session = Depends(get_db)) -> TaskService:
 )
 async def create_task(
     task_data: TaskCreate,
-    task_service: TaskService = Depends(get_task_service)
+    task_service: AsyncTaskService = Depends(get_task_service)
 ):
     """Создание новой задачи"""
     try:
-        task = task_service.create_task(task_data)
+        writer = group_commit.task_group_commit
+        if writer is not None:
+            task = await writer.submit(task_data)
+        else:
+            task = await task_service.create_task(task_data)
         return APIResponse(
             success=True,
             message="Задача успешно создана",
@@ -60,24 +124,434 @@ async def create_task(
         )
 
 
+@router.post(
+    "/import",
+    response_model=APIResponse,
+    summary="Импорт задач из файла",
+    description="Потоково разбирает тело запроса в NDJSON или CSV и создает задачи пачками"
+)
+async def import_tasks(
+    request: Request,
+    file_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="Формат файла"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=50000, description="Размер транзакции"),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Импорт задач"""
+    try:
+        summary = await task_service.import_tasks(request.stream(), file_format, chunk_size)
+        return APIResponse(
+            success=summary.rejected == 0,
+            message=f"Импортировано {summary.inserted} задач, отклонено: {summary.rejected}",
+            data=summary
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.post(
+    "/bulk",
+    response_model=APIResponse,
+    summary="Массовое создание задач",
+    description="Создает до bulk_max_items задач в одной транзакции и возвращает результат по каждому элементу"
+)
+async def bulk_create_tasks(
+    bulk_data: TaskBulkCreate,
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Массовое создание задач"""
+    try:
+        result = await task_service.bulk_create_tasks(bulk_data.items)
+        return APIResponse(
+            success=result.failed == 0,
+            message=f"Создано {result.succeeded} задач, ошибок: {result.failed}",
+            data=result
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.patch(
+    "/bulk",
+    response_model=APIResponse,
+    summary="Массовое обновление задач",
+    description="Обновляет задачи в одной транзакции и возвращает результат по каждому элементу"
+)
+async def bulk_update_tasks(
+    bulk_data: TaskBulkUpdate,
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Массовое обновление задач"""
+    try:
+        result = await task_service.bulk_update_tasks(bulk_data.items)
+        return APIResponse(
+            success=result.failed == 0,
+            message=f"Обновлено {result.succeeded} задач, ошибок: {result.failed}",
+            data=result
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.delete(
+    "/bulk",
+    response_model=APIResponse,
+    summary="Массовое удаление задач",
+    description="Удаляет задачи одним запросом и возвращает результат по каждому идентификатору"
+)
+async def bulk_delete_tasks(
+    bulk_data: TaskBulkDelete,
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Массовое удаление задач"""
+    try:
+        result = await task_service.bulk_delete_tasks(bulk_data.ids)
+        return APIResponse(
+            success=result.failed == 0,
+            message=f"Удалено {result.succeeded} задач, ошибок: {result.failed}",
+            data=result
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.post(
+    "/claim",
+    response_model=APIResponse,
+    summary="Захват задач из очереди",
+    description=(
+        "Атомарно переводит до n задач в статусе created в in_progress с арендой у исполнителя owner "
+        "и возвращает их. Задачи, аренда которых не продлена до срока, возвращаются в очередь"
+    )
+)
+async def claim_tasks(
+    n: int = Query(1, ge=1, le=settings.task_claim_max_items, description="Сколько задач захватить"),
+    owner: str = Query(..., min_length=1, max_length=128, description="Идентификатор исполнителя"),
+    lease: Optional[float] = Query(
+        None, gt=0, le=settings.task_lease_max_seconds, description="Срок аренды в секундах"
+    ),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Захват задач из очереди"""
+    try:
+        claim = await task_service.claim_tasks(n, owner, lease)
+        return json_response(TaskClaimResponse.model_construct(
+            success=True,
+            message=f"Захвачено {len(claim.tasks)} задач",
+            data=claim
+        ))
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.post(
+    "/{task_id}/lease",
+    response_model=APIResponse,
+    summary="Продление аренды задачи",
+    description="Продлевает аренду задачи ее исполнителем; 409 - задача не в работе у исполнителя или аренда истекла"
+)
+async def renew_lease(
+    task_id: UUID,
+    owner: str = Query(..., min_length=1, max_length=128, description="Идентификатор исполнителя"),
+    lease: Optional[float] = Query(
+        None, gt=0, le=settings.task_lease_max_seconds, description="Новый срок аренды в секундах от текущего момента"
+    ),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Продление аренды задачи"""
+    try:
+        task = await task_service.renew_lease(task_id, owner, lease)
+        return APIResponse(
+            success=True,
+            message="Аренда задачи продлена",
+            data=task
+        )
+    except TaskNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except TaskLeaseConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Выгрузка задач",
+    description="Потоково выгружает все задачи в NDJSON или CSV без загрузки их в память"
+)
+async def export_tasks(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="Формат выгрузки"),
+    task_status: Optional[TaskStatus] = Query(None, alias="status", description="Фильтр по статусу"),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Выгрузка задач"""
+    return StreamingResponse(
+        task_service.export_tasks(export_format, task_status),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'}
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=APIResponse,
+    summary="Статистика задач",
+    description="Количество задач по статусам и созданные / завершенные задачи по часам или дням"
+)
+async def get_stats(
+    granularity: RollupGranularity = Query(RollupGranularity.DAY, description="Размер интервала"),
+    since: Optional[datetime] = Query(None, description="Начало периода (по умолчанию 48 часов / 30 дней назад)"),
+    until: Optional[datetime] = Query(None, description="Конец периода (по умолчанию сейчас)"),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Статистика задач"""
+    try:
+        stats = await task_service.get_stats(granularity, since, until)
+        return APIResponse(
+            success=True,
+            message=f"Всего {stats.total} задач",
+            data=stats
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.get(
+    "/search",
+    response_model=APIResponse,
+    summary="Поиск задач",
+    description="Полнотекстовый поиск по названию и описанию задач с сортировкой по релевантности"
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256, description="Поисковый запрос"),
+    task_status: Optional[TaskStatus] = Query(None, alias="status", description="Фильтр по статусу"),
+    limit: int = Query(100, ge=1, le=1000, description="Количество задач на странице"),
+    offset: int = Query(0, ge=0, description="Смещение для пагинации"),
+    include_total: bool = Query(True, description="Возвращать общее количество найденных задач"),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Поиск задач"""
+    try:
+        tasks = await task_service.search_tasks(
+            q,
+            status=task_status,
+            limit=limit,
+            offset=offset,
+            include_total=include_total
+        )
+        return json_response(TaskListResponse.model_construct(
+            success=True,
+            message=f"Найдено {tasks.total if tasks.total is not None else len(tasks.tasks)} задач",
+            data=tasks
+        ))
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Поток изменений задач",
+    description=(
+        "Server-Sent Events: события created / updated / deleted с задачей в data. "
+        "После переподключения с заголовком Last-Event-ID пропущенные события дочитываются "
+        "из буфера; если это невозможно, поток начинается с события reset"
+    )
+)
+async def stream_tasks(
+    statuses: Optional[List[TaskStatus]] = Query(None, alias="status", description="Фильтр по статусам"),
+    last_event_id: Optional[str] = Header(None, description="ID последнего полученного события")
+):
+    """Поток изменений задач"""
+    if broadcast.task_broadcast is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Поток изменений задач выключен"
+        )
+    
+    subscription = broadcast.task_broadcast.subscribe(statuses, last_event_id)
+    return StreamingResponse(
+        subscription.messages(settings.task_stream_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=APIResponse,
+    summary="Изменения задач",
+    description=(
+        "Задачи, созданные или измененные после токена синхронизации, и идентификаторы удаленных. "
+        "Без токена возвращаются все задачи; next_token передается в следующий запрос. "
+        "410 - токен устарел, нужна полная синхронизация"
+    )
+)
+async def get_changes(
+    since: Optional[str] = Query(None, description="Токен синхронизации (next_token предыдущего ответа)"),
+    limit: int = Query(100, ge=1, le=1000, description="Количество изменений на странице"),
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """Изменения задач после токена синхронизации"""
+    try:
+        changes = await task_service.get_changes(since, limit)
+        return json_response(TaskChangesResponse.model_construct(
+            success=True,
+            message=f"Изменено {len(changes.changes)} задач, удалено {len(changes.deleted)}",
+            data=changes
+        ))
+    except TaskSyncExpiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e)
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
 @router.get(
     "/{task_id}",
     response_model=APIResponse,
     summary="Получение задачи по ID",
-    description="Возвращает задачу с указанным идентификатором"
+    description="Возвращает задачу с указанным идентификатором, в том числе из архива"
 )
 async def get_task(
     task_id: UUID,
-    task_service: TaskService = Depends(get_task_service)
+    response: Response,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    task_service: AsyncTaskService = Depends(get_task_service)
 ):
     """Получение задачи по ID"""
     try:
-        task = task_service.get_task(task_id)
+        if fields is not None:
+            task, etag, updated_at = await task_service.get_task_fields(
+                task_id, fields, if_none_match, if_modified_since
+            )
+            return json_response(
+                APIResponse.model_construct(success=True, message="Задача найдена", data=task),
+                headers={"ETag": etag, "Last-Modified": http_date(updated_at)},
+                exclude_unset=True
+            )
+        
+        task = await task_service.get_task(task_id, if_none_match, if_modified_since)
+        set_task_headers(response, task)
         return APIResponse(
             success=True,
             message="Задача найдена",
             data=task
         )
+    except TaskNotModifiedError as e:
+        return not_modified_response(e)
+    except TaskNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Внутренняя ошибка сервера"
+        )
+
+
+@router.get(
+    "/{task_id}/history",
+    response_model=APIResponse,
+    summary="История задачи",
+    description="Возвращает создание, смены статуса и удаление задачи в порядке возникновения"
+)
+async def get_task_history(
+    task_id: UUID,
+    task_service: AsyncTaskService = Depends(get_task_service)
+):
+    """История задачи"""
+    try:
+        task_history = await task_service.get_task_history(task_id)
+        return APIResponse(
+            success=True,
+            message=f"Найдено {len(task_history.events)} событий",
+            data=task_history
+        )
     except TaskNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,21 +568,57 @@ async def get_task(
     "/",
     response_model=APIResponse,
     summary="Получение списка задач",
-    description="Возвращает список всех задач с возможностью фильтрации по статусу"
+    description="Возвращает список всех задач с возможностью фильтрации по статусу; архивные - с include_archived"
 )
 async def get_tasks(
     task_status: Optional[TaskStatus] = Query(None, description="Фильтр по статусу"),
     limit: int = Query(100, ge=1, le=1000, description="Количество задач на странице"),
     offset: int = Query(0, ge=0, description="Смещение для пагинации"),
-    task_service: TaskService = Depends(get_task_service)
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (keyset-пагинация)"),
+    include_total: bool = Query(True, description="Возвращать общее количество задач"),
+    order: ListOrder = Query(ListOrder.CREATED_AT, description="Порядок: created_at или id (для UUIDv7 / ULID)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include_archived: bool = Query(False, description="Включать задачи из архива (tasks_archive)"),
+    if_none_match: Optional[str] = Header(None),
+    task_service: AsyncTaskService = Depends(get_task_service)
 ):
     """Получение списка задач"""
     try:
-        tasks = task_service.get_tasks(status=task_status, limit=limit, offset=offset)
-        return APIResponse(
-            success=True,
-            message=f"Найдено {tasks.total} задач",
-            data=tasks
+        tasks = await task_service.get_tasks(
+            status=task_status,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+            if_none_match=if_none_match,
+            order=order,
+            fields=fields,
+            include_archived=include_archived
+        )
+        if isinstance(tasks, TaskPartialList):
+            return json_response(
+                APIResponse.model_construct(
+                    success=True,
+                    message=f"Найдено {tasks.total if tasks.total is not None else len(tasks.tasks)} задач",
+                    data=tasks
+                ),
+                headers={"ETag": tasks.etag},
+                exclude_unset=True
+            )
+        return json_response(
+            TaskListResponse.model_construct(
+                success=True,
+                message=f"Найдено {tasks.total if tasks.total is not None else len(tasks.tasks)} задач",
+                data=tasks
+            ),
+            headers={"ETag": list_etag(tasks.tasks, tasks.total, tasks.next_cursor)}
+        )
+    except TaskNotModifiedError as e:
+        return not_modified_response(e)
+    except TaskValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     except Exception as e:
         raise HTTPException(
@@ -126,11 +636,14 @@ async def get_tasks(
 async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
-    task_service: TaskService = Depends(get_task_service)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    task_service: AsyncTaskService = Depends(get_task_service)
 ):
     """Обновление задачи"""
     try:
-        task = task_service.update_task(task_id, task_data)
+        task = await task_service.update_task(task_id, task_data, if_match)
+        set_task_headers(response, task)
         return APIResponse(
             success=True,
             message="Задача успешно обновлена",
@@ -141,6 +654,16 @@ async def update_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except TaskPreconditionFailedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
+    except TaskArchivedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except TaskValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -161,11 +684,12 @@ async def update_task(
 )
 async def delete_task(
     task_id: UUID,
-    task_service: TaskService = Depends(get_task_service)
+    if_match: Optional[str] = Header(None),
+    task_service: AsyncTaskService = Depends(get_task_service)
 ):
     """Удаление задачи"""
     try:
-        success = task_service.delete_task(task_id)
+        success = await task_service.delete_task(task_id, if_match)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -178,6 +702,16 @@ async def delete_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except TaskPreconditionFailedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
+    except TaskArchivedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except TaskValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
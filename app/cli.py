@@ -0,0 +1,116 @@
+"""
+Служебные команды Task Manager
+
+Запуск:
+    python -m app.cli reconcile-counters
+    python -m app.cli rebuild-rollups
+    python -m app.cli purge-tombstones [--days N]
+    python -m app.cli archive-tasks [--days N] [--batch-size N] [--pause S]
+"""
+
+import argparse
+from datetime import timedelta
+
+import structlog
+
+from app.core.config import settings
+from app.core.database import SessionLocal, create_tables
+from app.models.task import utcnow
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
+
+logger = structlog.get_logger()
+
+
+def reconcile_counters(args: argparse.Namespace) -> None:
+    """Пересчет счетчиков задач по основной таблице"""
+    with SessionLocal() as db:
+        counters = TaskRepository(db).rebuild_counters()
+    
+    logger.info("Счетчики задач пересчитаны", **{status.value: count for status, count in counters.items()})
+
+
+def rebuild_rollups(args: argparse.Namespace) -> None:
+    """Пересчет агрегатов задач по часам и дням по основной таблице"""
+    with SessionLocal() as db:
+        rows = TaskRepository(db).rebuild_rollups()
+    
+    logger.info("Агрегаты задач пересчитаны", rows=rows)
+
+
+def purge_tombstones(args: argparse.Namespace) -> None:
+    """Удаление надгробий удаленных задач старше срока хранения"""
+    before = utcnow() - timedelta(days=args.days)
+    with SessionLocal() as db:
+        purged = TaskRepository(db).purge_tombstones(before)
+    
+    logger.info("Надгробия задач удалены", purged=purged, before=before.isoformat())
+
+
+def archive_tasks(args: argparse.Namespace) -> None:
+    """Перенос в архив завершенных задач, не изменявшихся дольше срока политики"""
+    before = utcnow() - timedelta(days=args.days)
+    with SessionLocal() as db:
+        TaskService(TaskRepository(db)).archive_tasks(before, batch_size=args.batch_size, pause=args.pause)
+
+
+def main(argv=None) -> None:
+    """Точка входа CLI"""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Служебные команды Task Manager")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    reconcile = subparsers.add_parser(
+        "reconcile-counters",
+        help="Пересчитать счетчики задач по статусам из таблицы tasks"
+    )
+    reconcile.set_defaults(handler=reconcile_counters)
+    
+    rollups = subparsers.add_parser(
+        "rebuild-rollups",
+        help="Пересчитать агрегаты задач по часам и дням из таблицы tasks"
+    )
+    rollups.set_defaults(handler=rebuild_rollups)
+    
+    tombstones = subparsers.add_parser(
+        "purge-tombstones",
+        help="Удалить надгробия удаленных задач старше срока хранения"
+    )
+    tombstones.add_argument(
+        "--days",
+        type=int,
+        default=settings.task_tombstone_retention_days,
+        help="Срок хранения надгробий в днях (TASK_TOMBSTONE_RETENTION_DAYS)"
+    )
+    tombstones.set_defaults(handler=purge_tombstones)
+    
+    archive = subparsers.add_parser(
+        "archive-tasks",
+        help="Перенести завершенные задачи старше срока политики в таблицу tasks_archive"
+    )
+    archive.add_argument(
+        "--days",
+        type=int,
+        default=settings.task_archive_after_days,
+        help="Сколько дней задача не изменялась после завершения (TASK_ARCHIVE_AFTER_DAYS)"
+    )
+    archive.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.task_archive_batch_size,
+        help="Задач в одной транзакции (TASK_ARCHIVE_BATCH_SIZE)"
+    )
+    archive.add_argument(
+        "--pause",
+        type=float,
+        default=settings.task_archive_batch_pause,
+        help="Пауза между пачками в секундах (TASK_ARCHIVE_BATCH_PAUSE)"
+    )
+    archive.set_defaults(handler=archive_tasks)
+    
+    args = parser.parse_args(argv)
+    create_tables()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Кэш задач для Task Manager
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from .config import settings
+
+
+@dataclass
+class CacheStats:
+    """Счетчики кэша"""
+    
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    
+    @property
+    def hit_ratio(self) -> float:
+        """Доля попаданий среди всех обращений"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс бэкенда кэша.
+
+    Ключи - строки, значения - объекты приложения. Внешние бэкенды
+    (например, Redis) сериализуют значения самостоятельно.
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Значение по ключу или None"""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Сохранение значения"""
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Инвалидация ключа"""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Очистка кэша"""
+    
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Текущие счетчики"""
+
+
+class LRUCache(CacheBackend):
+    """Потокобезопасный LRU-кэш в памяти процесса с TTL и ограничением размера"""
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                size=len(self._data)
+            )
+
+
+def create_task_cache() -> Optional[CacheBackend]:
+    """Кэш задач по настройкам приложения; None, если кэш выключен"""
+    if not settings.task_cache_enabled:
+        return None
+    return LRUCache(max_size=settings.task_cache_max_size, ttl=settings.task_cache_ttl)
+
+
+# Кэш задач процесса (у каждого воркера uvicorn свой)
+task_cache = create_task_cache()
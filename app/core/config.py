@@ -3,7 +3,7 @@
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -16,10 +16,113 @@ class Settings(BaseSettings):
     
     # База данных
     database_url: str = "sqlite:///./data/tasks.db"
+    # URL с асинхронным драйвером; по умолчанию выводится из database_url
+    async_database_url: Optional[str] = None
+    # Путь данных обработчиков задач: false - синхронная Session в event loop,
+    # true - AsyncSession (aiosqlite / asyncpg). На SQLite асинхронный путь
+    # медленнее (benchmarks/bench_concurrency), поэтому выключен по умолчанию
+    async_data_path: bool = False
+    
+    # Профиль пула соединений: default (значения SQLAlchemy) или postgresql
+    db_pool_profile: str = "default"
+    # Явные значения переопределяют значения профиля; pool_class: queue, null, static или singleton
+    db_pool_class: Optional[str] = None
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_timeout: Optional[float] = None
+    db_pool_recycle: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+    # Кэш подготовленных запросов драйвера (sqlite3, asyncpg, psycopg)
+    db_statement_cache_size: Optional[int] = None
+    
+    # Генератор идентификаторов задач: uuid4, uuid7 или ulid (последние упорядочены по времени)
+    task_id_generator: str = "uuid4"
+    
+    # Хранение идентификаторов задач вне PostgreSQL: string (VARCHAR(36)) или binary (BLOB 16 байт)
+    uuid_storage: str = "string"
+    
+    # Профиль PRAGMA для SQLite: default (настройки SQLite) или production
+    sqlite_profile: str = "default"
+    # Явные значения PRAGMA переопределяют значения профиля
+    sqlite_journal_mode: Optional[str] = None
+    sqlite_synchronous: Optional[str] = None
+    sqlite_cache_size: Optional[int] = None
+    sqlite_mmap_size: Optional[int] = None
+    sqlite_temp_store: Optional[str] = None
+    sqlite_busy_timeout: Optional[int] = None
     
     # API
     api_v1_prefix: str = "/api/v1"
     
+    # Максимальное количество элементов в массовых операциях
+    bulk_max_items: int = 1000
+    
+    # Размер пачки строк при потоковой выгрузке задач
+    export_batch_size: int = 1000
+    
+    # Конфигурация текстового поиска PostgreSQL (to_tsvector / websearch_to_tsquery)
+    search_pg_config: str = "simple"
+    
+    # История задач: события пишутся фоновым потоком пачками по размеру или по времени
+    task_history_enabled: bool = True
+    task_history_batch_size: int = 500
+    task_history_flush_interval: float = 1.0
+    task_history_max_pending: int = 100000
+    
+    # Поток изменений задач (SSE): общий буфер для дочитывания по Last-Event-ID,
+    # очередь подписчика и интервал keepalive-сообщений
+    task_stream_enabled: bool = True
+    task_stream_buffer_size: int = 1000
+    task_stream_queue_size: int = 100
+    task_stream_heartbeat: float = 15.0
+    
+    # Синхронизация клиентов: сколько дней хранятся надгробия удаленных задач
+    # (python -m app.cli purge-tombstones); клиент с более старым токеном получает 410
+    task_tombstone_retention_days: int = 30
+    
+    # Очередь задач (POST /tasks/claim): срок аренды по умолчанию и максимальный,
+    # наибольшее число задач за запрос и фоновый возврат задач с истекшей арендой
+    task_lease_seconds: float = 300.0
+    task_lease_max_seconds: float = 3600.0
+    task_claim_max_items: int = 100
+    task_lease_reaper_enabled: bool = True
+    task_lease_reaper_interval: float = 10.0
+    task_lease_reaper_batch_size: int = 1000
+    
+    # Архивация (python -m app.cli archive-tasks): завершенные задачи без изменений
+    # дольше after_days дней переносятся в tasks_archive пачками по batch_size,
+    # каждая пачка - отдельная короткая транзакция, между пачками пауза в секундах
+    task_archive_after_days: int = 90
+    task_archive_batch_size: int = 200
+    task_archive_batch_pause: float = 0.05
+    
+    # Групповая фиксация создания задач: один писатель создает задачи пачкой
+    # в одной транзакции раз в interval секунд или по max_items задач
+    task_group_commit_enabled: bool = False
+    task_group_commit_interval: float = 0.005
+    task_group_commit_max_items: int = 100
+    
+    # Импорт задач: размер транзакции, количество ошибок в отчете и
+    # максимальная длина записи CSV в символах (с переводами строк в кавычках)
+    import_chunk_size: int = 1000
+    import_max_errors: int = 100
+    import_max_record_size: int = 65536
+    
+    # Кэш задач в памяти процесса. Выключен по умолчанию: при нескольких
+    # воркерах запись в одном не инвалидирует кэш других до истечения TTL
+    task_cache_enabled: bool = False
+    task_cache_ttl: float = 5.0
+    task_cache_max_size: int = 10000
+    
+    # Метрики Prometheus: задержки HTTP и SQL, ожидание соединения из пула
+    metrics_enabled: bool = True
+    
+    # Проверка готовности (/health/ready): таймаут запроса к базе, порог ожидания
+    # соединения из пула и время жизни результата, секунды
+    health_check_timeout: float = 2.0
+    health_checkout_wait_threshold: float = 1.0
+    health_cache_ttl: float = 2.0
+    
     # CORS
     cors_origins: List[str] = ["*"]
     
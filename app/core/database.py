@@ -2,20 +2,297 @@
 Настройка базы данных для Task Manager
 """
 
-from sqlalchemy import create_engine
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool, SingletonThreadPool, StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import DB_POOL_CHECKOUT_WAIT, DB_QUERY_DURATION, CallbackMetric, Histogram, registry
+
+# Драйверы для асинхронного доступа к базе данных
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Преобразование URL базы данных в URL с асинхронным драйвером"""
+    scheme, separator, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+# Профили PRAGMA для SQLite
+SQLITE_PROFILES = {
+    # Поведение SQLite по умолчанию (rollback journal, synchronous=FULL)
+    "default": {},
+    # WAL: читатели не блокируют писателя, fsync только на checkpoint
+    "production": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+SQLITE_PRAGMAS = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def get_sqlite_pragmas(profile: str = None) -> dict:
+    """Итоговые PRAGMA: значения профиля с учетом явных переопределений из настроек"""
+    profile = profile or settings.sqlite_profile
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Неизвестный профиль SQLite: {profile}")
+    
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in SQLITE_PRAGMAS:
+        value = getattr(settings, f"sqlite_{name}")
+        if value is not None:
+            pragmas[name] = value
+    
+    # busy_timeout выставляется первым, чтобы смена journal_mode дождалась блокировки
+    return {name: pragmas[name] for name in SQLITE_PRAGMAS if name in pragmas}
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """Применение PRAGMA к каждому новому соединению движка SQLite"""
+    for name, value in pragmas.items():
+        if name not in SQLITE_PRAGMAS or not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Недопустимая PRAGMA SQLite: {name}={value}")
+    
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+    
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def get_connect_args(database_url: str) -> dict:
+    """Параметры подключения для драйвера базы данных"""
+    return {"check_same_thread": False} if "sqlite" in database_url else {}
+
+
+# Классы пула соединений
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton": SingletonThreadPool,
+}
+
+# Профили пула соединений; пустой профиль - значения SQLAlchemy для диалекта
+POOL_PROFILES = {
+    "default": {},
+    # PostgreSQL (psycopg / asyncpg) под постоянную нагрузку: пул на все
+    # одновременные запросы воркера, быстрый отказ вместо очереди на 30 с,
+    # пересоздание соединений раньше таймаутов балансировщика
+    "postgresql": {
+        "pool_class": "queue",
+        "pool_size": 20,
+        "max_overflow": 20,
+        "pool_timeout": 5,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+    },
+}
+
+POOL_SETTINGS = (
+    "pool_class", "pool_size", "max_overflow", "pool_timeout",
+    "pool_recycle", "pool_pre_ping", "statement_cache_size",
+)
+
+# Параметры, которые принимает только пул с очередью
+QUEUE_POOL_SETTINGS = ("pool_size", "max_overflow", "pool_timeout")
+
+
+def get_pool_settings(profile: str = None) -> dict:
+    """Итоговые настройки пула: значения профиля с учетом явных переопределений"""
+    profile = profile or settings.db_pool_profile
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Неизвестный профиль пула соединений: {profile}")
+    
+    options = dict(POOL_PROFILES[profile])
+    for name in POOL_SETTINGS:
+        value = getattr(settings, f"db_{name}")
+        if value is not None:
+            options[name] = value
+    
+    if options.get("pool_class", "queue") not in POOL_CLASSES:
+        raise ValueError(f"Неизвестный класс пула соединений: {options['pool_class']}")
+    return options
+
+
+def get_pool_class(database_url: str, name: str = None) -> type:
+    """Класс пула по имени или класс диалекта по умолчанию"""
+    url = make_url(database_url)
+    dialect = url.get_dialect()
+    if name is None:
+        return dialect.get_pool_class(url)
+    pool_class = POOL_CLASSES[name]
+    # Асинхронным драйверам нужна очередь, совместимая с asyncio
+    if pool_class is QueuePool and dialect.is_async:
+        return AsyncAdaptedQueuePool
+    return pool_class
+
+
+def get_statement_cache_args(database_url: str, size: int) -> dict:
+    """Параметры подключения, задающие размер кэша подготовленных запросов драйвера"""
+    driver = make_url(database_url).get_driver_name()
+    if driver in ("pysqlite", "aiosqlite"):
+        return {"cached_statements": size}
+    if driver == "asyncpg":
+        return {"prepared_statement_cache_size": size}
+    return {}
+
+
+def install_statement_cache(engine: Engine, size: int) -> None:
+    """Размер кэша подготовленных запросов psycopg (задается у соединения, а не при подключении)"""
+    if engine.dialect.driver != "psycopg":
+        return
+    
+    @event.listens_for(engine, "connect")
+    def set_prepared_max(dbapi_connection, connection_record):
+        getattr(dbapi_connection, "_connection", dbapi_connection).prepared_max = size
+
+
+# Операции SQL, для которых ведутся отдельные гистограммы; остальные попадают в "other"
+QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+
+_timed_pool_classes = {}
+
+
+def get_timed_pool_class(base: type, engine_name: str) -> type:
+    """
+    Подкласс пула с замером ожидания соединения.
+    
+    Событие checkout вызывается уже после получения соединения, поэтому
+    время ожидания измеряется вокруг Pool._do_get.
+    """
+    key = (base, engine_name)
+    if key not in _timed_pool_classes:
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return base._do_get(self)
+            finally:
+                DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, (engine_name,))
+        
+        _timed_pool_classes[key] = type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+    return _timed_pool_classes[key]
+
+
+def install_query_metrics(engine: Engine, engine_name: str, histogram: Histogram = DB_QUERY_DURATION) -> None:
+    """Гистограмма времени выполнения SQL-запросов движка по типу операции"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def observe_query_time(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        operation = statement.lstrip()[:6].upper()
+        if operation not in QUERY_OPERATIONS:
+            operation = "WITH" if operation.startswith("WITH") else "other"
+        histogram.observe(elapsed, (engine_name, operation))
+
+
+def pool_status(pool: Pool) -> dict:
+    """Состояние пула соединений (для пулов без очереди - пустой словарь)"""
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
+
+
+def get_engine_options(database_url: str, engine_name: str, pool_settings: dict = None) -> dict:
+    """Аргументы create_engine: параметры подключения и пула"""
+    pool_settings = get_pool_settings() if pool_settings is None else pool_settings
+    connect_args = get_connect_args(database_url)
+    if pool_settings.get("statement_cache_size") is not None:
+        connect_args.update(get_statement_cache_args(database_url, pool_settings["statement_cache_size"]))
+    
+    pool_class = get_pool_class(database_url, pool_settings.get("pool_class"))
+    options = {"connect_args": connect_args}
+    for name in ("pool_recycle", "pool_pre_ping"):
+        if pool_settings.get(name) is not None:
+            options[name] = pool_settings[name]
+    if issubclass(pool_class, QueuePool):
+        for name in QUEUE_POOL_SETTINGS:
+            if pool_settings.get(name) is not None:
+                options[name] = pool_settings[name]
+    
+    options["poolclass"] = get_timed_pool_class(pool_class, engine_name) if settings.metrics_enabled else pool_class
+    return options
+
+
+# Настройки пула по выбранному профилю
+_pool_settings = get_pool_settings()
 
 # Создание движка базы данных
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+engine = create_engine(settings.database_url, **get_engine_options(settings.database_url, "sync", _pool_settings))
+
+# Асинхронный движок (aiosqlite / asyncpg) для обработчиков API
+_async_database_url = settings.async_database_url or get_async_database_url(settings.database_url)
+async_engine = create_async_engine(
+    _async_database_url,
+    **get_engine_options(_async_database_url, "async", _pool_settings)
 )
 
+# Кэш подготовленных запросов psycopg
+if _pool_settings.get("statement_cache_size") is not None:
+    install_statement_cache(engine, _pool_settings["statement_cache_size"])
+    install_statement_cache(async_engine.sync_engine, _pool_settings["statement_cache_size"])
+
+# Настройка SQLite по выбранному профилю
+install_sqlite_pragmas(engine, get_sqlite_pragmas())
+install_sqlite_pragmas(async_engine.sync_engine, get_sqlite_pragmas())
+
+if settings.metrics_enabled:
+    install_query_metrics(engine, "sync")
+    install_query_metrics(async_engine.sync_engine, "async")
+    registry.register(CallbackMetric(
+        "db_pool_connections",
+        "Соединения пула: размер, выданные и сверх размера",
+        lambda: [
+            ({"engine": name, "state": state}, value)
+            for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool))
+            for state, value in pool_status(pool).items()
+        ],
+    ))
+
 # Создание сессии
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Синхронная сессия обработчиков API: объекты не устаревают после commit,
+# как у AsyncSessionLocal, и ответ не перечитывает записанные строки
+TaskSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Создание асинхронной сессии
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Базовый класс для моделей
 Base = declarative_base()
 
@@ -29,6 +306,27 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """Создание всех таблиц в базе данных"""
-    Base.metadata.create_all(bind=engine)
+async def get_async_db():
+    """Dependency для получения асинхронной сессии базы данных"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_task_db():
+    """Dependency сессии обработчиков задач: Session или AsyncSession при ASYNC_DATA_PATH=true"""
+    if settings.async_data_path:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        with TaskSessionLocal() as db:
+            yield db
+
+
+def create_tables(bind: Optional[Engine] = None):
+    """Создание всех таблиц в базе данных (по умолчанию - базе приложения)"""
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    # create_all не добавляет новые индексы в уже существующие таблицы
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
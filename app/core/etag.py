@@ -0,0 +1,78 @@
+"""
+ETag и условные HTTP-запросы для задач
+"""
+
+import base64
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+
+def make_etag(task_id: UUID, updated_at: datetime) -> str:
+    """Сильный ETag задачи из (id, updated_at); updated_at восстанавливается из ETag"""
+    version = base64.urlsafe_b64encode(updated_at.isoformat().encode()).decode().rstrip("=")
+    return f'"{task_id.hex}-{version}"'
+
+
+def parse_etag(etag: str) -> Optional[Tuple[UUID, datetime]]:
+    """Разбор ETag задачи в (id, updated_at); None, если ETag не наш"""
+    try:
+        task_hex, version = etag.strip().strip('"').split("-", 1)
+        padded = version + "=" * (-len(version) % 4)
+        return UUID(hex=task_hex), datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except ValueError:
+        return None
+
+
+def list_etag(
+    tasks: Iterable,
+    total: Optional[int],
+    next_cursor: Optional[str],
+    fields: Optional[Iterable[str]] = None
+) -> str:
+    """ETag страницы списка по (id, updated_at) задач, total, курсору и набору полей (fields=)"""
+    digest = hashlib.sha1()
+    for task in tasks:
+        digest.update(f"{task.id}:{task.updated_at.isoformat()};".encode())
+    digest.update(f"{total}:{next_cursor}".encode())
+    if fields is not None:
+        digest.update(f":{','.join(fields)}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def parse_etag_header(header: Optional[str]) -> List[str]:
+    """Список ETag из If-Match / If-None-Match (включая '*')"""
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Слабое сравнение для If-None-Match (префикс W/ игнорируется)"""
+    for tag in parse_etag_header(header):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def as_utc(value: datetime) -> datetime:
+    """Приведение времени к UTC (SQLite возвращает naive-время в UTC)"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    """Форматирование времени для заголовка Last-Modified"""
+    return format_datetime(as_utc(value), usegmt=True)
+
+
+def not_modified_since(header: Optional[str], updated_at: datetime) -> bool:
+    """Проверка If-Modified-Since с точностью до секунды"""
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return as_utc(updated_at).replace(microsecond=0) <= as_utc(since)
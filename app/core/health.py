@@ -0,0 +1,150 @@
+"""
+Проверка готовности Task Manager к приему запросов
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .database import async_engine, engine, pool_status
+
+# Запрос проверки: SELECT 1 в SQLite не обращается к файлу базы, поэтому
+# читается sqlite_master - при заблокированном файле запрос завершится ошибкой
+PING_QUERIES = {
+    "sqlite": "SELECT 1 FROM sqlite_master LIMIT 1",
+}
+DEFAULT_PING_QUERY = "SELECT 1"
+
+
+@dataclass
+class ReadinessResult:
+    """Результат проверки готовности"""
+    
+    ready: bool
+    checked_at: float
+    checkout_wait: Optional[float] = None
+    query_time: Optional[float] = None
+    error: Optional[str] = None
+    pools: Dict[str, dict] = field(default_factory=dict)
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        data = asdict(self)
+        data["status"] = "ready" if self.ready else "not_ready"
+        del data["checked_at"]
+        return data
+
+
+class ReadinessProbe:
+    """
+    Проверка базы данных с ограничением по времени и кэшированием результата.
+
+    Проверка берет соединение из пула асинхронного движка и выполняет
+    легкий запрос. База считается недоступной при ошибке, превышении
+    timeout или если ожидание соединения дольше checkout_wait_threshold.
+    Результат переиспользуется cache_ttl секунд, а одновременные запросы
+    ждут одну проверку, поэтому частые пробы не нагружают базу.
+    """
+    
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        timeout: float = 2.0,
+        checkout_wait_threshold: float = 1.0,
+        cache_ttl: float = 2.0,
+        pools: Optional[Callable[[], Dict[str, dict]]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.engine = engine
+        self.timeout = timeout
+        self.checkout_wait_threshold = checkout_wait_threshold
+        self.cache_ttl = cache_ttl
+        self.pools = pools or (lambda: {"async": pool_status(engine.sync_engine.pool)})
+        self.clock = clock
+        self.query = PING_QUERIES.get(engine.dialect.name, DEFAULT_PING_QUERY)
+        self._result: Optional[ReadinessResult] = None
+        self._pending: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
+    
+    async def check(self) -> ReadinessResult:
+        """Результат проверки (из кэша, если он еще действителен)"""
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if not self._fresh():
+                self._result = await self._probe()
+            return self._result
+    
+    def _fresh(self) -> bool:
+        return self._result is not None and self.clock() - self._result.checked_at < self.cache_ttl
+    
+    async def _probe(self) -> ReadinessResult:
+        timings = {}
+        error = None
+        if self._pending is not None and not self._pending.done():
+            # Предыдущая проверка еще висит на базе - новую не запускаем
+            error = "Предыдущая проверка базы данных еще не завершилась"
+        else:
+            # asyncio.wait не ждет отмены задачи: драйвер может не прерывать
+            # запрос (aiosqlite ждет busy_timeout), а ответ пробы должен уложиться в timeout
+            self._pending = asyncio.ensure_future(self._ping(timings))
+            self._pending.add_done_callback(_consume_exception)
+            done, _ = await asyncio.wait({self._pending}, timeout=self.timeout)
+            if not done:
+                error = f"Проверка базы данных не уложилась в {self.timeout} с"
+            elif self._pending.exception() is not None:
+                exc = self._pending.exception()
+                error = f"{type(exc).__name__}: {exc}"
+        
+        checkout_wait = timings.get("checkout_wait")
+        if error is None and checkout_wait > self.checkout_wait_threshold:
+            error = (
+                f"Ожидание соединения {checkout_wait:.3f} с превышает порог "
+                f"{self.checkout_wait_threshold} с"
+            )
+        
+        return ReadinessResult(
+            ready=error is None,
+            checked_at=self.clock(),
+            checkout_wait=checkout_wait,
+            query_time=timings.get("query_time"),
+            error=error,
+            pools=self.pools()
+        )
+    
+    async def _ping(self, timings: dict) -> None:
+        start = time.perf_counter()
+        async with self.engine.connect() as conn:
+            connected = time.perf_counter()
+            timings["checkout_wait"] = connected - start
+            await conn.execute(text(self.query))
+            timings["query_time"] = time.perf_counter() - connected
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Ошибка зависшей проверки уже не попадет в ответ; забираем ее, чтобы asyncio не писал в лог
+    if not future.cancelled():
+        future.exception()
+
+
+def create_readiness_probe() -> ReadinessProbe:
+    """Проверка готовности по настройкам приложения"""
+    return ReadinessProbe(
+        async_engine,
+        timeout=settings.health_check_timeout,
+        checkout_wait_threshold=settings.health_checkout_wait_threshold,
+        cache_ttl=settings.health_cache_ttl,
+        pools=lambda: {
+            "sync": pool_status(engine.pool),
+            "async": pool_status(async_engine.sync_engine.pool),
+        }
+    )
+
+
+# Проверка готовности процесса
+readiness_probe = create_readiness_probe()
@@ -0,0 +1,79 @@
+"""
+Генераторы идентификаторов задач: uuid4, UUIDv7 и ULID
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict
+
+from app.core.config import settings
+
+
+class TimeOrderedGenerator:
+    """
+    Генератор 128-битных идентификаторов с миллисекундной меткой времени в старших битах.
+
+    Внутри одной миллисекунды случайная часть увеличивается на единицу, поэтому
+    идентификаторы одного процесса строго возрастают и новые ключи попадают в
+    правый край B-дерева первичного ключа.
+    """
+
+    def __init__(self, random_bits: int, pack: Callable[[int, int], int]):
+        self.random_bits = random_bits
+        self.pack = pack
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def __call__(self) -> uuid.UUID:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                # Старший бит оставляем нулевым, чтобы инкременты не переполняли случайную часть
+                self._last_random = int.from_bytes(os.urandom(16), "big") >> (129 - self.random_bits)
+            else:
+                self._last_random += 1
+                if self._last_random >> self.random_bits:
+                    self._last_ms += 1
+                    self._last_random = 0
+            return uuid.UUID(int=self.pack(self._last_ms, self._last_random))
+
+
+def _pack_uuid7(unix_ms: int, random: int) -> int:
+    """RFC 9562: 48 бит времени, версия 7, 74 бита случайной части и вариант 10"""
+    rand_a, rand_b = random >> 62, random & ((1 << 62) - 1)
+    return (unix_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b
+
+
+def _pack_ulid(unix_ms: int, random: int) -> int:
+    """ULID: 48 бит времени и 80 бит случайной части (хранится как UUID)"""
+    return (unix_ms & ((1 << 48) - 1)) << 80 | random
+
+
+uuid7 = TimeOrderedGenerator(74, _pack_uuid7)
+ulid = TimeOrderedGenerator(80, _pack_ulid)
+
+ID_GENERATORS: Dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+    "ulid": ulid,
+}
+
+# Генераторы, у которых порядок идентификаторов совпадает с порядком создания
+TIME_ORDERED_GENERATORS = ("uuid7", "ulid")
+
+
+def get_id_generator(name: str = None) -> Callable[[], uuid.UUID]:
+    """Генератор идентификаторов по имени (по умолчанию из настроек)"""
+    name = name or settings.task_id_generator
+    if name not in ID_GENERATORS:
+        raise ValueError(f"Неизвестный генератор идентификаторов: {name}")
+    return ID_GENERATORS[name]
+
+
+def new_task_id() -> uuid.UUID:
+    """Новый идентификатор задачи выбранным в настройках генератором"""
+    return get_id_generator()()
@@ -0,0 +1,244 @@
+"""
+Метрики Task Manager в формате Prometheus
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Границы интервалов гистограмм задержек, секунды
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ShardedMetric(ABC):
+    """
+    Метрика с отдельным набором значений у каждого потока.
+
+    Поток увеличивает только свои счетчики, поэтому запись идет без
+    блокировок; блокировка берется один раз при первом обращении потока
+    и при сборе значений. При выгрузке значения потоков суммируются.
+    """
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+    
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+    
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() выполняется атомарно под GIL, даже если поток-владелец пишет в словарь
+        return [shard.copy() for shard in shards]
+    
+    def _labels(self, values: Tuple[str, ...], **extra: str) -> str:
+        return _format_labels([*zip(self.labelnames, values), *extra.items()])
+    
+    @abstractmethod
+    def render(self) -> Iterable[str]:
+        """Строки метрики в текстовом формате Prometheus"""
+
+
+class Counter(ShardedMetric):
+    """Монотонный счетчик"""
+    
+    type_name = "counter"
+    
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+    
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        """Суммарные значения по наборам меток"""
+        totals: Dict[Tuple[str, ...], float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+    
+    def render(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{self._labels(labels)} {_format(value)}"
+
+
+class Histogram(ShardedMetric):
+    """Гистограмма с фиксированными границами интервалов"""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # Счетчики интервалов (последний - +Inf) и сумма наблюдений
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def values(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Суммарные счетчики интервалов и сумма по наборам меток"""
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in self._snapshot():
+            for labels, series in shard.items():
+                total = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    total[index] += value
+        return totals
+    
+    def render(self) -> Iterable[str]:
+        for labels, series in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                yield f"{self.name}_bucket{self._labels(labels, le=le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {_format(series[-1])}"
+            yield f"{self.name}_count{self._labels(labels)} {cumulative}"
+
+
+class CallbackMetric:
+    """Метрика, значения которой вычисляются при выгрузке (размер пула, состояние кэша)"""
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+        type_name: str = "gauge"
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.type_name = type_name
+    
+    def render(self) -> Iterable[str]:
+        for labels, value in self.callback():
+            yield f"{self.name}{_format_labels(labels.items())} {_format(value)}"
+
+
+class MetricsRegistry:
+    """Набор метрик процесса"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        """Регистрация метрики (повторная регистрация имени заменяет метрику)"""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Текстовый формат Prometheus 0.0.4"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(pairs) -> str:
+    """Метки в формате {name="value",...}"""
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Метрики приложения
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ("method", "route", "status"),
+))
+
+DB_QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения SQL-запроса",
+    ("engine", "operation"),
+))
+
+DB_POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Ожидание соединения из пула",
+    ("engine",),
+))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: гистограмма времени запросов по методу, шаблону маршрута и статусу.
+    
+    Шаблон маршрута (/api/v1/tasks/{task_id}) вместо пути ограничивает
+    количество рядов; запросы без маршрута учитываются как "unmatched".
+    """
+    
+    def __init__(self, app, histogram: Histogram = HTTP_REQUEST_DURATION):
+        self.app = app
+        self.histogram = histogram
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.histogram.observe(
+                time.perf_counter() - start,
+                (scope["method"], getattr(route, "path", "unmatched"), str(status)),
+            )
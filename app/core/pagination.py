@@ -0,0 +1,54 @@
+"""
+Курсоры для keyset-пагинации списка задач и токены синхронизации
+"""
+
+import base64
+import enum
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+
+class ListOrder(str, enum.Enum):
+    """Порядок списка задач"""
+    CREATED_AT = "created_at"
+    # Только по id: хронологический порядок при UUIDv7 / ULID
+    ID = "id"
+
+
+def encode_cursor(created_at: Optional[datetime], task_id: UUID) -> str:
+    """Кодирование позиции (created_at, id) в непрозрачный курсор (created_at=None - порядок по id)"""
+    payload = json.dumps(
+        [created_at.isoformat() if created_at is not None else None, str(task_id)],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], UUID]:
+    """Декодирование курсора в позицию (created_at, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at) if created_at is not None else None, UUID(task_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Некорректный курсор пагинации: {cursor}") from e
+
+
+def encode_sync_token(change_seq: int, task_id: Optional[UUID]) -> str:
+    """Кодирование позиции синхронизации (номер изменения, id) в непрозрачный токен"""
+    payload = json.dumps([change_seq, str(task_id) if task_id is not None else None], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[int, Optional[UUID]]:
+    """Декодирование токена синхронизации в позицию (номер изменения, id)"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        change_seq, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(change_seq, int) or change_seq < 0:
+            raise ValueError(change_seq)
+        return change_seq, UUID(task_id) if task_id is not None else None
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Некорректный токен синхронизации: {token}") from e
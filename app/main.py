@@ -4,13 +4,16 @@ Task Manager API - Полноценное FastAPI приложение
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 import structlog
 
+from app.core import cache, health, metrics
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import create_tables, engine, get_sqlite_pragmas
+from app.core.ids import get_id_generator
 from app.api.v1.tasks import router as tasks_router
+from app.services import broadcast, group_commit, history, lease_reaper
 from app.services.task_service import TaskNotFoundError, TaskValidationError
 
 # Настройка логирования
@@ -34,16 +37,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Метрики времени обработки запросов
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Подключение маршрутов
 app.include_router(tasks_router, prefix=settings.api_v1_prefix)
 
 
+def _cache_metrics():
+    """Счетчики кэша задач (кэш может быть заменен во время работы)"""
+    if cache.task_cache is None:
+        return []
+    stats = cache.task_cache.stats()
+    return [
+        ({"kind": "hits"}, stats.hits),
+        ({"kind": "misses"}, stats.misses),
+        ({"kind": "hit_ratio"}, stats.hit_ratio),
+    ]
+
+
+def _history_metrics():
+    """Состояние буфера истории задач"""
+    if history.task_history is None:
+        return []
+    return [({"kind": kind}, value) for kind, value in history.task_history.stats().as_dict().items()]
+
+
+def _stream_metrics():
+    """Подписчики и события потока изменений задач"""
+    if broadcast.task_broadcast is None:
+        return []
+    return [({"kind": kind}, value) for kind, value in broadcast.task_broadcast.stats().as_dict().items()]
+
+
+def _group_commit_metrics():
+    """Счетчики групповой фиксации создания задач"""
+    if group_commit.task_group_commit is None:
+        return []
+    return [({"kind": kind}, value) for kind, value in group_commit.task_group_commit.stats().as_dict().items()]
+
+
+def _lease_reaper_metrics():
+    """Счетчики возврата в очередь задач с истекшей арендой"""
+    if lease_reaper.task_lease_reaper is None:
+        return []
+    return [({"kind": kind}, value) for kind, value in lease_reaper.task_lease_reaper.stats().as_dict().items()]
+
+
+metrics.registry.register(metrics.CallbackMetric(
+    "task_cache", "Кэш задач: попадания, промахи и доля попаданий", _cache_metrics
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "task_history", "Буфер истории задач", _history_metrics
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "task_group_commit", "Групповая фиксация создания задач", _group_commit_metrics
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "task_stream", "Поток изменений задач: подписчики и события", _stream_metrics
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "task_lease_reaper", "Возврат в очередь задач с истекшей арендой", _lease_reaper_metrics
+))
+
+
 @app.on_event("startup")
 async def startup_event():
     """Инициализация при запуске приложения"""
     logger.info("Запуск Task Manager API")
+    get_id_generator()
     create_tables()
     logger.info("Таблицы базы данных созданы")
+    history.task_history = history.create_task_history()
+    if history.task_history is not None:
+        history.task_history.start()
+    group_commit.task_group_commit = group_commit.create_group_commit_writer()
+    if group_commit.task_group_commit is not None:
+        group_commit.task_group_commit.start()
+    lease_reaper.task_lease_reaper = lease_reaper.create_lease_reaper()
+    if lease_reaper.task_lease_reaper is not None:
+        lease_reaper.task_lease_reaper.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Завершение работы: закрытие потоков изменений, остановка возврата аренд, запись задач из очереди и событий истории"""
+    if broadcast.task_broadcast is not None:
+        broadcast.task_broadcast.close()
+    if lease_reaper.task_lease_reaper is not None:
+        await lease_reaper.task_lease_reaper.stop()
+        lease_reaper.task_lease_reaper = None
+    if group_commit.task_group_commit is not None:
+        await group_commit.task_group_commit.stop()
+        group_commit.task_group_commit = None
+    if history.task_history is not None:
+        history.task_history.stop()
+        history.task_history = None
 
 
 @app.exception_handler(TaskNotFoundError)
@@ -103,10 +193,48 @@ async def health_check():
         "service": "task-manager-api",
         "version": settings.version,
         "timestamp": datetime.utcnow().isoformat(),
-        "database": "connected"
+        "database": "connected",
+        "database_profile": {
+            "name": settings.sqlite_profile if engine.dialect.name == "sqlite" else engine.dialect.name,
+            "pragmas": get_sqlite_pragmas() if engine.dialect.name == "sqlite" else {}
+        },
+        "cache": cache.task_cache.stats().as_dict() if cache.task_cache is not None else None,
+        "history": history.task_history.stats().as_dict() if history.task_history is not None else None,
+        "group_commit": (
+            group_commit.task_group_commit.stats().as_dict() if group_commit.task_group_commit is not None else None
+        ),
+        "stream": broadcast.task_broadcast.stats().as_dict() if broadcast.task_broadcast is not None else None,
+        "lease_reaper": (
+            lease_reaper.task_lease_reaper.stats().as_dict() if lease_reaper.task_lease_reaper is not None else None
+        )
+    }
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Процесс жив и обслуживает запросы (база данных не проверяется)"""
+    return {
+        "status": "alive",
+        "timestamp": datetime.utcnow().isoformat()
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Готовность к приему трафика: база отвечает, пул не исчерпан; 503, если нет"""
+    result = await health.readiness_probe.check()
+    return JSONResponse(
+        status_code=200 if result.ready else 503,
+        content={**result.as_dict(), "timestamp": datetime.utcnow().isoformat()}
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint():
+    """Метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
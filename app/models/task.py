@@ -2,46 +2,76 @@
 Модель задачи для Task Manager
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Enum, TypeDecorator
+from sqlalchemy import BigInteger, Column, String, Text, DateTime, Enum, Index, LargeBinary, TypeDecorator, literal_column
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
+from datetime import datetime, timezone
+from typing import Optional
 import uuid
 import enum
+from app.core.config import settings
+from app.core.ids import new_task_id
 from app.core.database import Base
 
+# Режимы хранения UUID вне PostgreSQL
+UUID_STORAGES = ("string", "binary")
+
+
+def utcnow() -> datetime:
+    """Текущее время в UTC с микросекундами (для стабильной сортировки по времени)"""
+    return datetime.now(timezone.utc)
+
 
 class GUID(TypeDecorator):
     """
     Platform-independent GUID type.
-    Uses PostgreSQL's UUID type when available, otherwise String(36).
+    Uses PostgreSQL's UUID type when available, otherwise String(36)
+    or, with storage="binary", a compact 16-byte BLOB.
     """
     impl = String
     cache_ok = True
 
+    def __init__(self, storage: Optional[str] = None):
+        super().__init__()
+        # Режим хранения вне PostgreSQL: string (36 символов) или binary (16 байт)
+        self.storage = storage or settings.uuid_storage
+        if self.storage not in UUID_STORAGES:
+            raise ValueError(f"Неизвестный режим хранения UUID: {self.storage}")
+
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
             return dialect.type_descriptor(UUID())
+        elif self.storage == 'binary':
+            return dialect.type_descriptor(LargeBinary(16))
         else:
             return dialect.type_descriptor(String(36))
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        elif dialect.name == 'postgresql':
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        if dialect.name != 'postgresql' and self.storage == 'binary':
+            return value.bytes
+        return str(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        if isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        return uuid.UUID(value)
+
+
+# Следующий номер изменения (строка счетчика task_change_sequence, см. app.models.task_change).
+# В SQLite номер ставится этим выражением и продвигается триггером, в PostgreSQL
+# значение заменяет BEFORE-триггер
+NEXT_CHANGE_SEQ = literal_column("(SELECT value + 1 FROM task_change_sequence WHERE id = 1)")
+
+# Условие частичного индекса аренд. Статус записан литералом: SQLite использует
+# частичный индекс, только если условие запроса совпадает с ним дословно, а не
+# через связанный параметр
+LEASED_CONDITION = text("status = 'IN_PROGRESS'")
 
 
 class TaskStatus(str, enum.Enum):
@@ -56,12 +86,28 @@ class Task(Base):
     
     __tablename__ = "tasks"
     
+    # Индексы под keyset-пагинацию по (created_at, id), в т.ч. с фильтром по статусу
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        # Порядок только по id (для UUIDv7 / ULID) с фильтром по статусу
+        Index("ix_tasks_status_id", "status", "id"),
+        # Выборка изменений для синхронизации по (change_seq, id)
+        Index("ix_tasks_change_seq_id", "change_seq", "id"),
+        # Аренды задач в работе по сроку истечения (возврат в очередь). Частичный
+        # индекс не растет с завершенными задачами; status в ключе нужен SQLite,
+        # чтобы без ANALYZE выбрать этот индекс, а не ix_tasks_status_created_at_id
+        Index(
+            "ix_tasks_leased_expires_at", "status", "lease_expires_at",
+            sqlite_where=LEASED_CONDITION, postgresql_where=LEASED_CONDITION
+        ),
+    )
+    
     # Основные поля
     id = Column(
         GUID(), 
         primary_key=True, 
-        default=uuid.uuid4,
-        unique=True,
+        default=new_task_id,
         nullable=False
     )
     
@@ -87,6 +133,7 @@ class Task(Base):
     # Временные метки
     created_at = Column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
         nullable=False,
         comment="Дата создания"
@@ -94,12 +141,36 @@ class Task(Base):
     
     updated_at = Column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utcnow,
         nullable=False,
         comment="Дата последнего обновления"
     )
     
+    # Номер последнего изменения задачи: растет в порядке фиксации транзакций
+    change_seq = Column(
+        BigInteger,
+        default=NEXT_CHANGE_SEQ,
+        onupdate=NEXT_CHANGE_SEQ,
+        server_default="0",
+        nullable=False,
+        comment="Номер последнего изменения"
+    )
+    
+    # Аренда задачи исполнителем (POST /tasks/claim)
+    lease_owner = Column(
+        String(128),
+        nullable=True,
+        comment="Исполнитель, взявший задачу"
+    )
+    
+    lease_expires_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Срок аренды задачи исполнителем"
+    )
+    
     def __repr__(self):
         """Строковое представление модели"""
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status.value}')>"
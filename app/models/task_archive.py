@@ -0,0 +1,146 @@
+"""
+Архив завершенных задач для Task Manager
+"""
+
+import re
+
+from sqlalchemy import BigInteger, Column, DDL, DateTime, Enum, Index, String, Text, event
+
+from app.core.database import Base
+from app.models.task import GUID, TaskStatus, utcnow
+
+
+class TaskArchive(Base):
+    """
+    Архивная (холодная) задача.
+
+    Завершенные задачи старше срока политики архивации переносятся сюда из
+    tasks пачками (python -m app.cli archive-tasks), чтобы основная таблица
+    и ее индексы не росли вместе с историей. Архивная задача доступна только
+    для чтения: по ID и в списках с include_archived. Перенос не считается
+    удалением: счетчики по статусам, агрегаты статистики и надгробия
+    синхронизации не меняются (см. условия триггеров удаления tasks).
+    """
+    
+    __tablename__ = "tasks_archive"
+    
+    # Те же ключи сортировки, что у списков tasks (для include_archived)
+    __table_args__ = (
+        Index("ix_tasks_archive_created_at_id", "created_at", "id"),
+        Index("ix_tasks_archive_status_created_at_id", "status", "created_at", "id"),
+    )
+    
+    id = Column(
+        GUID(),
+        primary_key=True,
+        comment="Идентификатор задачи"
+    )
+    
+    title = Column(
+        String(255),
+        nullable=False,
+        comment="Название задачи"
+    )
+    
+    description = Column(
+        Text,
+        nullable=True,
+        comment="Описание задачи"
+    )
+    
+    status = Column(
+        Enum(TaskStatus),
+        nullable=False,
+        comment="Статус задачи"
+    )
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Дата создания"
+    )
+    
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Дата последнего обновления"
+    )
+    
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        comment="Номер последнего изменения"
+    )
+    
+    archived_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        nullable=False,
+        comment="Время переноса в архив"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskArchive(id={self.id}, title='{self.title}', status='{self.status.value}')>"
+
+
+# Колонки, общие для tasks и tasks_archive (в порядке переноса)
+ARCHIVE_COLUMNS = ("id", "title", "description", "status", "created_at", "updated_at", "change_seq")
+
+# Условие для триггеров удаления tasks: строка переносится в архив, а не удаляется.
+# Архивация вставляет строку в tasks_archive до удаления из tasks в той же транзакции
+ARCHIVED_ROW_SQL = "EXISTS (SELECT 1 FROM tasks_archive WHERE tasks_archive.id = OLD.id)"
+
+# Проверка архива в триггерах: WHEN-условие SQLite и IF ... END IF в функциях PostgreSQL
+ARCHIVE_CHECK = re.compile(r"\s*WHEN NOT EXISTS \(SELECT 1 FROM tasks_archive[^\n]*|\s*IF [^\n]*tasks_archive.*?END IF;", re.S)
+
+
+def without_archive_check(statement: str) -> str:
+    """Текст триггера удаления tasks без проверки архива (для миграций до появления tasks_archive)"""
+    return ARCHIVE_CHECK.sub("", statement)
+
+
+# Архивные задачи учитываются в колонке archived таблицы task_counters. Триггеры
+# создаются вместе с таблицей архива (событие таблицы, а не metadata)
+SQLITE_ARCHIVE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_archive_counters_insert AFTER INSERT ON tasks_archive
+    BEGIN
+        INSERT INTO task_counters (status, count, archived) VALUES (NEW.status, 0, 1)
+        ON CONFLICT (status) DO UPDATE SET archived = archived + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_archive_counters_delete AFTER DELETE ON tasks_archive
+    BEGIN
+        UPDATE task_counters SET archived = archived - 1 WHERE status = OLD.status;
+    END
+    """,
+)
+
+POSTGRESQL_ARCHIVE_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION tasks_archive_counters_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            UPDATE task_counters SET archived = archived - 1 WHERE status = OLD.status;
+        ELSE
+            INSERT INTO task_counters (status, count, archived) VALUES (NEW.status, 0, 1)
+            ON CONFLICT (status) DO UPDATE SET archived = task_counters.archived + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_tasks_archive_counters ON tasks_archive",
+    """
+    CREATE TRIGGER trg_tasks_archive_counters
+    AFTER INSERT OR DELETE ON tasks_archive
+    FOR EACH ROW EXECUTE FUNCTION tasks_archive_counters_trigger()
+    """,
+)
+
+for statement in SQLITE_ARCHIVE_COUNTER_TRIGGERS:
+    event.listen(TaskArchive.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_ARCHIVE_COUNTER_TRIGGERS:
+    event.listen(TaskArchive.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
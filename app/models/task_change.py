@@ -0,0 +1,167 @@
+"""
+Номера изменений и надгробия удаленных задач для синхронизации клиентов
+"""
+
+from sqlalchemy import BigInteger, Column, DDL, DateTime, Index, Integer, event
+
+from app.core.database import Base
+from app.models.task import GUID, utcnow
+from app.models.task_archive import ARCHIVED_ROW_SQL
+
+
+class TaskChangeSequence(Base):
+    """
+    Счетчик номеров изменений задач (одна строка с id = 1).
+
+    Номер берется в той же транзакции, что и запись задачи. В PostgreSQL
+    строка счетчика остается заблокированной до конца транзакции, поэтому
+    номера изменений растут в порядке фиксации и клиент, дочитавший до
+    номера N, не пропустит изменение с меньшим номером.
+    """
+    
+    __tablename__ = "task_change_sequence"
+    
+    id = Column(Integer, primary_key=True)
+    
+    value = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Последний выданный номер изменения"
+    )
+    
+    purged_seq = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Номер, до которого надгробия удалены"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskChangeSequence(value={self.value}, purged_seq={self.purged_seq})>"
+
+
+class TaskTombstone(Base):
+    """
+    Надгробие удаленной задачи.
+
+    Записывается триггером при удалении строки tasks с новым номером
+    изменения, чтобы синхронизация могла сообщить клиенту об удалении.
+    Старые надгробия удаляются командой purge-tombstones.
+    """
+    
+    __tablename__ = "task_tombstones"
+    
+    __table_args__ = (
+        Index("ix_task_tombstones_change_seq_id", "change_seq", "id"),
+    )
+    
+    id = Column(
+        GUID(),
+        primary_key=True,
+        comment="Идентификатор удаленной задачи"
+    )
+    
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        comment="Номер изменения удаления"
+    )
+    
+    deleted_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        nullable=False,
+        comment="Время удаления"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskTombstone(id={self.id}, change_seq={self.change_seq})>"
+
+
+# Строка счетчика; для существующей таблицы продолжает максимальный номер
+SEED_SEQUENCE_SQL = """
+INSERT INTO task_change_sequence (id, value, purged_seq)
+SELECT 1, coalesce(max(change_seq), 0), 0 FROM tasks WHERE true
+ON CONFLICT (id) DO NOTHING
+"""
+
+# SQLite: номер вычисляется выражением NEXT_CHANGE_SEQ в самом INSERT / UPDATE,
+# триггеры только продвигают счетчик (запись одна, транзакции не пересекаются).
+# Перенос задачи в архив - не удаление, надгробие для него не пишется.
+# Знаки % удвоены: DDL форматирует текст оператором %
+SQLITE_CHANGE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_seq_insert AFTER INSERT ON tasks
+    BEGIN
+        UPDATE task_change_sequence SET value = NEW.change_seq WHERE id = 1 AND value < NEW.change_seq;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_change_seq_update AFTER UPDATE OF change_seq ON tasks
+    BEGIN
+        UPDATE task_change_sequence SET value = NEW.change_seq WHERE id = 1 AND value < NEW.change_seq;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_tombstone AFTER DELETE ON tasks
+    WHEN NOT {ARCHIVED_ROW_SQL}
+    BEGIN
+        UPDATE task_change_sequence SET value = value + 1 WHERE id = 1;
+        INSERT INTO task_tombstones (id, change_seq, deleted_at)
+        VALUES (OLD.id, (SELECT value FROM task_change_sequence WHERE id = 1), strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now'))
+        ON CONFLICT (id) DO UPDATE SET change_seq = excluded.change_seq, deleted_at = excluded.deleted_at;
+    END
+    """,
+)
+
+# PostgreSQL: номер выдает BEFORE-триггер, блокируя строку счетчика до фиксации
+POSTGRESQL_CHANGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION tasks_change_seq_trigger() RETURNS trigger AS $$
+    BEGIN
+        -- Номер, явно оставленный прежним (продление аренды), не меняется
+        IF TG_OP = 'UPDATE' AND NEW.change_seq = OLD.change_seq THEN
+            RETURN NEW;
+        END IF;
+        UPDATE task_change_sequence SET value = value + 1 WHERE id = 1 RETURNING value INTO NEW.change_seq;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_tasks_change_seq ON tasks",
+    """
+    CREATE TRIGGER trg_tasks_change_seq
+    BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_change_seq_trigger()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION tasks_tombstone_trigger() RETURNS trigger AS $$
+    DECLARE
+        seq bigint;
+    BEGIN
+        IF {ARCHIVED_ROW_SQL} THEN
+            RETURN NULL;
+        END IF;
+        UPDATE task_change_sequence SET value = value + 1 WHERE id = 1 RETURNING value INTO seq;
+        INSERT INTO task_tombstones (id, change_seq, deleted_at) VALUES (OLD.id, seq, now())
+        ON CONFLICT (id) DO UPDATE SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_tasks_tombstone ON tasks",
+    """
+    CREATE TRIGGER trg_tasks_tombstone
+    AFTER DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_tombstone_trigger()
+    """,
+)
+
+event.listen(Base.metadata, "after_create", DDL(SEED_SEQUENCE_SQL))
+for statement in SQLITE_CHANGE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_CHANGE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
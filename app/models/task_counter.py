@@ -0,0 +1,118 @@
+"""
+Счетчики задач по статусам для Task Manager
+"""
+
+from sqlalchemy import Column, DDL, Enum, Integer, event, text
+
+from app.core.database import Base
+from app.models.task import TaskStatus
+
+
+class TaskCounter(Base):
+    """
+    Количество задач в каждом статусе.
+
+    Таблица поддерживается триггерами на tasks в той же транзакции, что и
+    сама запись, поэтому любые изменения задач (в т.ч. массовые) сразу
+    отражаются в счетчиках без отдельных запросов из приложения.
+    count - задачи в tasks, archived - в архиве tasks_archive.
+    """
+    
+    __tablename__ = "task_counters"
+    
+    status = Column(
+        Enum(TaskStatus),
+        primary_key=True,
+        comment="Статус задачи"
+    )
+    
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Количество задач в статусе"
+    )
+    
+    archived = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Количество архивных задач в статусе"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskCounter(status='{self.status.value}', count={self.count}, archived={self.archived})>"
+
+
+# Начальное заполнение счетчиков для уже существующей таблицы tasks
+SEED_COUNTERS_SQL = """
+INSERT INTO task_counters (status, count)
+SELECT status, count(*) FROM tasks WHERE true GROUP BY status
+ON CONFLICT (status) DO NOTHING
+"""
+
+SQLITE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counters_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counters_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_counters_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+)
+
+POSTGRESQL_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION tasks_counters_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.status IS NOT DISTINCT FROM NEW.status THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = task_counters.count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_tasks_counters ON tasks",
+    """
+    CREATE TRIGGER trg_tasks_counters
+    AFTER INSERT OR DELETE OR UPDATE OF status ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_counters_trigger()
+    """,
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def seed_counters(target, connection, **kw):
+    """Начальное заполнение счетчиков; полный проход по tasks - только пока таблица счетчиков пуста"""
+    if connection.execute(text("SELECT 1 FROM task_counters LIMIT 1")).first() is None:
+        connection.execute(text(SEED_COUNTERS_SQL))
+
+
+for statement in SQLITE_COUNTER_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_COUNTER_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,67 @@
+"""
+История изменений задач для Task Manager
+"""
+
+import enum
+
+from sqlalchemy import BigInteger, Column, DateTime, Enum, Index, Integer
+
+from app.core.database import Base
+from app.models.task import GUID, TaskStatus, utcnow
+
+
+class TaskEventType(str, enum.Enum):
+    """Типы событий истории задачи"""
+    CREATED = "created"
+    STATUS_CHANGED = "status_changed"
+    DELETED = "deleted"
+
+
+class TaskEvent(Base):
+    """
+    Событие истории задачи.
+
+    Таблица только дополняется: записи не изменяются и не удаляются вместе
+    с задачей, поэтому история удаленных задач сохраняется.
+    """
+    
+    __tablename__ = "task_events"
+    
+    __table_args__ = (
+        Index("ix_task_events_task_id_id", "task_id", "id"),
+    )
+    
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True
+    )
+    
+    task_id = Column(
+        GUID(),
+        nullable=False,
+        comment="Идентификатор задачи"
+    )
+    
+    event_type = Column(
+        Enum(TaskEventType),
+        nullable=False,
+        comment="Тип события"
+    )
+    
+    status = Column(
+        Enum(TaskStatus),
+        nullable=True,
+        comment="Статус задачи после события"
+    )
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        default=utcnow,
+        nullable=False,
+        comment="Время события"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskEvent(task_id={self.task_id}, event_type='{self.event_type.value}')>"
@@ -0,0 +1,200 @@
+"""
+Агрегаты задач по временным интервалам для Task Manager
+"""
+
+import enum
+
+from sqlalchemy import Column, DateTime, Integer, String, event, text
+
+from app.core.database import Base
+from app.models.task_archive import ARCHIVED_ROW_SQL
+
+
+class RollupGranularity(str, enum.Enum):
+    """Размер интервала агрегации"""
+    HOUR = "hour"
+    DAY = "day"
+
+
+class RollupMetric(str, enum.Enum):
+    """Агрегируемые показатели"""
+    CREATED = "created"
+    COMPLETED = "completed"
+
+
+class TaskRollup(Base):
+    """
+    Количество задач по часам и дням.
+
+    created - задачи по времени создания, completed - завершенные задачи по
+    времени последнего изменения (для задач, которые не правили после
+    завершения, это время завершения). Учитываются только существующие
+    задачи, в т.ч. архивные: удаление уменьшает счетчики, перенос в архив -
+    нет. Таблица поддерживается триггерами на tasks в той же транзакции,
+    что и запись задачи, и может быть пересчитана целиком
+    (python -m app.cli rebuild-rollups).
+    """
+    
+    __tablename__ = "task_rollups"
+    
+    granularity = Column(
+        String(8),
+        primary_key=True,
+        comment="Размер интервала: hour или day"
+    )
+    
+    metric = Column(
+        String(16),
+        primary_key=True,
+        comment="Показатель: created или completed"
+    )
+    
+    bucket_start = Column(
+        DateTime,
+        primary_key=True,
+        comment="Начало интервала (UTC)"
+    )
+    
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Количество задач"
+    )
+    
+    def __repr__(self):
+        """Строковое представление модели"""
+        return f"<TaskRollup({self.granularity} {self.metric} {self.bucket_start}: {self.count})>"
+
+
+# Начало интервала для значения времени в SQLite и PostgreSQL. В SQLite
+# значение пишется в формате, в котором SQLAlchemy связывает границы периода
+# (с микросекундами): даты сравниваются как текст
+SQLITE_BUCKETS = {
+    RollupGranularity.HOUR: "strftime('%Y-%m-%d %H:00:00.000000', {column})",
+    RollupGranularity.DAY: "strftime('%Y-%m-%d 00:00:00.000000', {column})",
+}
+
+POSTGRESQL_BUCKETS = {
+    RollupGranularity.HOUR: "date_trunc('hour', {column} AT TIME ZONE 'UTC')",
+    RollupGranularity.DAY: "date_trunc('day', {column} AT TIME ZONE 'UTC')",
+}
+
+
+def _upserts(buckets: dict, metric: RollupMetric, column: str, delta: int, condition: str = "true") -> str:
+    """Обновление счетчиков всех интервалов для одной строки tasks"""
+    sign = "+" if delta > 0 else "-"
+    return "\n".join(
+        f"""
+        INSERT INTO task_rollups (granularity, metric, bucket_start, count)
+        SELECT '{granularity.value}', '{metric.value}', {expression.format(column=column)}, {delta}
+        WHERE {condition}
+        ON CONFLICT (granularity, metric, bucket_start) DO UPDATE SET count = task_rollups.count {sign} 1;"""
+        for granularity, expression in buckets.items()
+    )
+
+
+SQLITE_ROLLUP_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_rollups_insert AFTER INSERT ON tasks
+    BEGIN
+        {_upserts(SQLITE_BUCKETS, RollupMetric.CREATED, "NEW.created_at", 1)}
+        {_upserts(SQLITE_BUCKETS, RollupMetric.COMPLETED, "NEW.updated_at", 1, "NEW.status = 'COMPLETED'")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_rollups_delete AFTER DELETE ON tasks
+    WHEN NOT {ARCHIVED_ROW_SQL}
+    BEGIN
+        {_upserts(SQLITE_BUCKETS, RollupMetric.CREATED, "OLD.created_at", -1)}
+        {_upserts(SQLITE_BUCKETS, RollupMetric.COMPLETED, "OLD.updated_at", -1, "OLD.status = 'COMPLETED'")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_rollups_update AFTER UPDATE OF status, updated_at ON tasks
+    WHEN OLD.status = 'COMPLETED' OR NEW.status = 'COMPLETED'
+    BEGIN
+        {_upserts(SQLITE_BUCKETS, RollupMetric.COMPLETED, "OLD.updated_at", -1, "OLD.status = 'COMPLETED'")}
+        {_upserts(SQLITE_BUCKETS, RollupMetric.COMPLETED, "NEW.updated_at", 1, "NEW.status = 'COMPLETED'")}
+    END
+    """,
+)
+
+POSTGRESQL_ROLLUP_TRIGGERS = (
+    f"""
+    CREATE OR REPLACE FUNCTION tasks_rollups_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' AND {ARCHIVED_ROW_SQL} THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            {_upserts(POSTGRESQL_BUCKETS, RollupMetric.CREATED, "NEW.created_at", 1)}
+        END IF;
+        IF TG_OP = 'DELETE' THEN
+            {_upserts(POSTGRESQL_BUCKETS, RollupMetric.CREATED, "OLD.created_at", -1)}
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'COMPLETED' THEN
+            {_upserts(POSTGRESQL_BUCKETS, RollupMetric.COMPLETED, "OLD.updated_at", -1)}
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'COMPLETED' THEN
+            {_upserts(POSTGRESQL_BUCKETS, RollupMetric.COMPLETED, "NEW.updated_at", 1)}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_tasks_rollups ON tasks",
+    """
+    CREATE TRIGGER trg_tasks_rollups
+    AFTER INSERT OR DELETE OR UPDATE OF status, updated_at ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_rollups_trigger()
+    """,
+)
+
+
+# Задачи основной таблицы и архива для пересчета агрегатов
+ALL_TASKS_SQL = """
+(SELECT status, created_at, updated_at FROM tasks
+ UNION ALL
+ SELECT status, created_at, updated_at FROM tasks_archive) AS all_tasks
+"""
+
+
+def rebuild_rollups_statements(dialect: str) -> list:
+    """Запросы полного пересчета агрегатов по таблицам tasks и tasks_archive"""
+    buckets = POSTGRESQL_BUCKETS if dialect == "postgresql" else SQLITE_BUCKETS
+    statements = []
+    for granularity, expression in buckets.items():
+        for metric, column, condition in (
+            (RollupMetric.CREATED, "created_at", "true"),
+            (RollupMetric.COMPLETED, "updated_at", "status = 'COMPLETED'"),
+        ):
+            bucket = expression.format(column=column)
+            statements.append(
+                f"""
+                INSERT INTO task_rollups (granularity, metric, bucket_start, count)
+                SELECT '{granularity.value}', '{metric.value}', {bucket}, count(*)
+                FROM {ALL_TASKS_SQL} WHERE {condition} GROUP BY {bucket}
+                """
+            )
+    return statements
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_rollup_triggers(target, connection, **kw):
+    """Триггеры агрегатов и их начальное заполнение для уже существующих задач"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        triggers = SQLITE_ROLLUP_TRIGGERS
+    elif dialect == "postgresql":
+        triggers = POSTGRESQL_ROLLUP_TRIGGERS
+    else:
+        return
+    
+    empty = connection.execute(text("SELECT 1 FROM task_rollups LIMIT 1")).first() is None
+    for statement in triggers:
+        connection.execute(text(statement))
+    
+    if empty:
+        for statement in rebuild_rollups_statements(dialect):
+            connection.execute(text(statement))
@@ -0,0 +1,104 @@
+"""
+Полнотекстовый индекс задач: FTS5 для SQLite, tsvector + GIN для PostgreSQL
+"""
+
+import structlog
+from sqlalchemy import column, event, table, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import Base
+
+logger = structlog.get_logger()
+
+# Виртуальная таблица FTS5 с внешним содержимым (строки берутся из tasks по rowid)
+tasks_fts = table("tasks_fts", column("rowid"), column("title"), column("description"))
+
+SQLITE_FTS_TABLE = """
+CREATE VIRTUAL TABLE tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+)
+"""
+
+SQLITE_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+)
+
+POSTGRESQL_SEARCH_DDL = (
+    """
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('{config}', coalesce(title, '') || ' ' || coalesce(description, ''))
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    """Создание полнотекстового индекса и его синхронизации с tasks"""
+    if connection.dialect.name == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        ).first()
+        
+        if not exists:
+            try:
+                connection.execute(text(SQLITE_FTS_TABLE))
+            except OperationalError as e:
+                # SQLite собран без FTS5: поиск работает через LIKE
+                logger.warning("FTS5 недоступен, поиск будет использовать LIKE", error=str(e))
+                return
+            # Индексация уже существующих задач
+            connection.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+        
+        for statement in SQLITE_FTS_TRIGGERS:
+            connection.execute(text(statement))
+    
+    elif connection.dialect.name == "postgresql":
+        for statement in POSTGRESQL_SEARCH_DDL:
+            connection.execute(text(statement.format(config=settings.search_pg_config)))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_search_index(target, connection, **kw):
+    """Удаление FTS5-таблицы вместе с tasks (триггеры удаляются вместе с таблицей)"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS tasks_fts"))
+
+
+def to_fts5_query(q: str) -> str:
+    """
+    Преобразование пользовательской строки в безопасный запрос FTS5.
+
+    Каждое слово берется в кавычки (операторы FTS5 не интерпретируются),
+    слова объединяются через AND, последнее ищется по префиксу.
+    """
+    tokens = ['"' + token.replace('"', '""') + '"' for token in q.split()]
+    if not tokens:
+        return ""
+    tokens[-1] += "*"
+    return " ".join(tokens)
@@ -2,14 +2,56 @@
 Repository для работы с задачами
 """
 
+from sqlalchemy import Select, delete, func, insert, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+import heapq
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
 from uuid import UUID
 
-from app.models.task import Task, TaskStatus
+from app.core.config import settings
+from app.core.ids import new_task_id
+from app.core.pagination import ListOrder
+from app.models.task import LEASED_CONDITION, Task, TaskStatus
+from app.models.task_archive import ARCHIVE_COLUMNS, TaskArchive
+from app.models.task_change import TaskChangeSequence, TaskTombstone
+from app.models.task_counter import TaskCounter
+from app.models.task_event import TaskEvent
+from app.models.task_rollup import RollupGranularity, TaskRollup, rebuild_rollups_statements
+from app.models.task_search import tasks_fts, to_fts5_query
 from app.schemas.task import TaskCreate, TaskUpdate
 
+T = TypeVar("T")
+
+# Колонки выгрузки задач (в порядке полей TaskResponse)
+EXPORT_COLUMNS = (Task.id, Task.title, Task.description, Task.status, Task.created_at, Task.updated_at)
+
+
+def export_query(status: Optional[TaskStatus] = None, batch_size: int = 1000) -> Select:
+    """Core-запрос выгрузки задач с потоковой выборкой по batch_size строк"""
+    query = select(*EXPORT_COLUMNS).order_by(Task.created_at, Task.id)
+    
+    if status:
+        query = query.where(Task.status == status)
+    
+    return query.execution_options(yield_per=batch_size)
+
+
+def with_lease_reset(values: dict) -> dict:
+    """
+    Значения UPDATE со сбросом аренды, если в них есть статус.
+
+    Статус вне захвата и продления задает клиент, а не исполнитель: аренда
+    прежнего исполнителя снимается, иначе LeaseReaper вернул бы в очередь
+    задачу, снова переведенную в работу через PUT или массовое обновление.
+    """
+    if "status" in values:
+        return {**values, "lease_owner": None, "lease_expires_at": None}
+    return values
+
 
 class TaskRepository:
     """Repository для работы с задачами"""
@@ -20,15 +62,14 @@ class TaskRepository:
     def create(self, task_data: TaskCreate) -> Task:
         """Создание новой задачи"""
         try:
-            db_task = Task(
-                title=task_data.title,
-                description=task_data.description,
-                status=task_data.status
-            )
-            
-            self.db.add(db_task)
+            # INSERT ... RETURNING возвращает значения в том виде, в каком их
+            # сохранила база (как при чтении задачи), и refresh после commit не нужен
+            db_task = self.db.scalars(
+                insert(Task)
+                .values(title=task_data.title, description=task_data.description, status=task_data.status)
+                .returning(Task)
+            ).one()
             self.db.commit()
-            self.db.refresh(db_task)
             
             return db_task
             
@@ -40,17 +81,304 @@ class TaskRepository:
         """Получение задачи по ID"""
         return self.db.query(Task).filter(Task.id == task_id).first()
     
-    def get_all(self, status: Optional[TaskStatus] = None, limit: int = 100, offset: int = 0) -> List[Task]:
-        """Получение списка всех задач с опциональной фильтрацией"""
-        query = self.db.query(Task)
+    def get_columns_by_id(self, task_id: UUID, columns: Sequence[str]) -> Optional[Row]:
+        """Выбранные колонки задачи по ID (Core select без ORM-объекта)"""
+        query = select(*(getattr(Task, name) for name in columns)).where(Task.id == task_id)
+        return self.db.execute(query).first()
+    
+    def get_archived_by_id(self, task_id: UUID) -> Optional[TaskArchive]:
+        """Получение архивной задачи по ID"""
+        return self.db.get(TaskArchive, task_id)
+    
+    def get_archived_columns_by_id(self, task_id: UUID, columns: Sequence[str]) -> Optional[Row]:
+        """Выбранные колонки архивной задачи по ID"""
+        query = select(*(getattr(TaskArchive, name) for name in columns)).where(TaskArchive.id == task_id)
+        return self.db.execute(query).first()
+    
+    def is_archived(self, task_id: UUID) -> bool:
+        """Проверка, перенесена ли задача в архив"""
+        return self.db.execute(select(TaskArchive.id).where(TaskArchive.id == task_id)).first() is not None
+    
+    def get_all(
+        self,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[Optional[datetime], UUID]] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        include_archived: bool = False
+    ) -> List[Task | TaskArchive]:
+        """
+        Получение списка всех задач с опциональной фильтрацией.
+
+        Задачи упорядочены по (created_at, id) или, при order=ID, только по id.
+        Если передана позиция after, используется keyset-пагинация по индексу вместо offset.
+        С include_archived в страницу попадают и архивные задачи (TaskArchive).
+        """
+        if include_archived:
+            return self._merge_archived(
+                lambda model: self.db.scalars(
+                    self._list_query(select(model), status, 0, after, order, model).limit(offset + limit)
+                ).all(),
+                limit, offset, order
+            )
         
+        query = self._list_query(self.db.query(Task), status, offset, after, order)
+        return query.limit(limit).all()
+    
+    def get_all_columns(
+        self,
+        columns: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[Optional[datetime], UUID]] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        include_archived: bool = False
+    ) -> List[Row]:
+        """
+        Страница задач из выбранных колонок.
+
+        Core select не создает ORM-объекты и не заполняет identity map,
+        а невыбранные колонки (например, description) не читаются вовсе.
+        Фильтрация и порядок те же, что у get_all; колонки должны включать id и created_at.
+        """
+        if include_archived:
+            return self._merge_archived(
+                lambda model: self.db.execute(
+                    self._list_query(
+                        select(*(getattr(model, name) for name in columns)), status, 0, after, order, model
+                    ).limit(offset + limit)
+                ).all(),
+                limit, offset, order
+            )
+        
+        query = select(*(getattr(Task, name) for name in columns))
+        query = self._list_query(query, status, offset, after, order)
+        return self.db.execute(query.limit(limit)).all()
+    
+    @staticmethod
+    def _merge_archived(fetch: Callable[[type], list], limit: int, offset: int, order: ListOrder) -> list:
+        """
+        Страница из tasks и tasks_archive.
+
+        Каждая таблица читается по своему индексу с тем же фильтром и началом
+        страницы (offset + limit строк), упорядоченные выборки сливаются по
+        ключу сортировки, и из результата берется страница.
+        """
+        key = (lambda row: row.id) if order == ListOrder.ID else (lambda row: (row.created_at, row.id))
+        merged = heapq.merge(fetch(Task), fetch(TaskArchive), key=key)
+        return list(merged)[offset:offset + limit]
+    
+    def _list_query(
+        self,
+        query: T,
+        status: Optional[TaskStatus],
+        offset: int,
+        after: Optional[Tuple[Optional[datetime], UUID]],
+        order: ListOrder,
+        model: type = Task
+    ) -> T:
+        """Фильтр по статусу, порядок и начало страницы для ORM Query или Core select по tasks или архиву"""
         if status:
-            query = query.filter(Task.status == status)
+            query = query.where(model.status == status)
         
-        return query.offset(offset).limit(limit).all()
+        if order == ListOrder.ID:
+            query = query.order_by(model.id)
+        else:
+            query = query.order_by(model.created_at, model.id)
+        
+        if after is not None and order == ListOrder.ID:
+            query = query.where(model.id > after[1])
+        elif after is not None:
+            query = query.where(tuple_(model.created_at, model.id) > tuple(after))
+        elif offset:
+            query = query.offset(offset)
+        
+        return query
+    
+    def get_count(self, status: Optional[TaskStatus] = None, include_archived: bool = False) -> int:
+        """Получение количества задач (с include_archived - вместе с архивными) из таблицы счетчиков"""
+        count = TaskCounter.count + TaskCounter.archived if include_archived else TaskCounter.count
+        query = select(func.coalesce(func.sum(count), 0))
+        
+        if status:
+            query = query.where(TaskCounter.status == status)
+        
+        return self.db.execute(query).scalar_one()
+    
+    def iter_all(self, status: Optional[TaskStatus] = None, batch_size: int = 1000) -> Iterator[List[Row]]:
+        """Потоковая выгрузка задач пачками строк без загрузки ORM-объектов"""
+        result = self.db.execute(export_query(status, batch_size))
+        yield from result.partitions()
+    
+    def _search_query(self, q: str, status: Optional[TaskStatus] = None) -> Select:
+        """Запрос полнотекстового поиска с ранжированием по релевантности"""
+        dialect = self.db.get_bind().dialect.name
+        
+        if dialect == "sqlite":
+            query = (
+                select(Task)
+                .join(tasks_fts, tasks_fts.c.rowid == literal_column("tasks.rowid"))
+                .where(text("tasks_fts MATCH :fts_query").bindparams(fts_query=to_fts5_query(q)))
+                .order_by(func.bm25(literal_column("tasks_fts")), Task.created_at, Task.id)
+            )
+        elif dialect == "postgresql":
+            tsquery = func.websearch_to_tsquery(settings.search_pg_config, q)
+            search_vector = literal_column("tasks.search_vector")
+            query = (
+                select(Task)
+                .where(search_vector.op("@@")(tsquery))
+                .order_by(func.ts_rank(search_vector, tsquery).desc(), Task.created_at, Task.id)
+            )
+        else:
+            return self._like_query(q, status)
+        
+        if status:
+            query = query.where(Task.status == status)
+        
+        return query
     
-    def get_count(self, status: Optional[TaskStatus] = None) -> int:
-        """Получение количества задач"""
+    def _like_query(self, q: str, status: Optional[TaskStatus] = None) -> Select:
+        """Поиск подстроки через LIKE (полный просмотр таблицы, без ранжирования)"""
+        pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = select(Task).where(
+            or_(
+                Task.title.ilike(pattern, escape="\\"),
+                Task.description.ilike(pattern, escape="\\")
+            )
+        ).order_by(Task.created_at, Task.id)
+        
+        if status:
+            query = query.where(Task.status == status)
+        
+        return query
+    
+    def search(
+        self,
+        q: str,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        use_index: bool = True
+    ) -> List[Task]:
+        """
+        Полнотекстовый поиск задач по названию и описанию.
+
+        Использует FTS5 (SQLite) или tsvector (PostgreSQL) с сортировкой по
+        релевантности. Если полнотекстовый индекс недоступен или use_index=False,
+        выполняется поиск подстроки через LIKE.
+        """
+        if use_index:
+            try:
+                query = self._search_query(q, status).limit(limit).offset(offset)
+                return list(self.db.execute(query).scalars())
+            except OperationalError:
+                self.db.rollback()
+        
+        query = self._like_query(q, status).limit(limit).offset(offset)
+        return list(self.db.execute(query).scalars())
+    
+    def search_count(self, q: str, status: Optional[TaskStatus] = None, use_index: bool = True) -> int:
+        """Количество задач, найденных полнотекстовым поиском"""
+        if use_index:
+            try:
+                query = self._search_query(q, status).order_by(None)
+                return self.db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+            except OperationalError:
+                self.db.rollback()
+        
+        query = self._like_query(q, status).order_by(None)
+        return self.db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+    
+    def get_change_bounds(self) -> Tuple[int, int]:
+        """Последний зафиксированный номер изменения и номер, до которого удалены надгробия"""
+        row = self.db.execute(
+            select(TaskChangeSequence.value, TaskChangeSequence.purged_seq).where(TaskChangeSequence.id == 1)
+        ).first()
+        return (row.value, row.purged_seq) if row is not None else (0, 0)
+    
+    def get_changes(
+        self,
+        after: Tuple[int, Optional[UUID]],
+        until: int,
+        limit: int = 100,
+        include_deleted: bool = True
+    ) -> Tuple[List[Task], List[Row]]:
+        """
+        Задачи и надгробия с позицией (change_seq, id) после after и номером не больше until.
+
+        Обе выборки идут по индексам (change_seq, id) и ограничены limit строками
+        каждая; после слияния по позиции вызывающий берет первые limit элементов.
+        Граница until (номер, прочитанный до выборок) не дает вернуть изменения,
+        зафиксированные между запросами. id = None в after - все изменения после номера.
+        """
+        tasks = self.db.scalars(
+            self._changes_query(select(Task), Task, after, until).limit(limit)
+        ).all()
+        
+        tombstones = []
+        if include_deleted:
+            tombstones = self.db.execute(
+                self._changes_query(
+                    select(TaskTombstone.id, TaskTombstone.change_seq), TaskTombstone, after, until
+                ).limit(limit)
+            ).all()
+        
+        return tasks, tombstones
+    
+    @staticmethod
+    def _changes_query(query: Select, model, after: Tuple[int, Optional[UUID]], until: int) -> Select:
+        """Keyset-фильтр и порядок по (change_seq, id) для задач или надгробий"""
+        seq, task_id = after
+        if task_id is None:
+            query = query.where(model.change_seq > seq)
+        else:
+            query = query.where(tuple_(model.change_seq, model.id) > (seq, task_id))
+        return query.where(model.change_seq <= until).order_by(model.change_seq, model.id)
+    
+    def purge_tombstones(self, before: datetime) -> int:
+        """
+        Удаление надгробий, записанных раньше before; возвращает их количество.
+
+        Номер последнего удаленного надгробия сохраняется в purged_seq: клиент
+        с более старым токеном синхронизации мог пропустить удаление и должен
+        загрузить задачи заново.
+        """
+        try:
+            purged = self.db.execute(
+                select(func.max(TaskTombstone.change_seq), func.count()).where(TaskTombstone.deleted_at < before)
+            ).one()
+            if not purged[1]:
+                return 0
+            
+            self.db.execute(
+                update(TaskChangeSequence)
+                .where(TaskChangeSequence.id == 1, TaskChangeSequence.purged_seq < purged[0])
+                .values(purged_seq=purged[0])
+            )
+            self.db.execute(delete(TaskTombstone).where(TaskTombstone.change_seq <= purged[0]))
+            self.db.commit()
+            
+            return purged[1]
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка удаления надгробий: {str(e)}")
+    
+    def get_events(self, task_id: UUID) -> List[TaskEvent]:
+        """
+        События истории задачи в порядке их времени.
+
+        id задает порядок сброса буферов воркеров, а не порядок событий,
+        поэтому он только упорядочивает события с одинаковым временем.
+        """
+        return list(self.db.scalars(
+            select(TaskEvent).where(TaskEvent.task_id == task_id).order_by(TaskEvent.created_at, TaskEvent.id)
+        ))
+    
+    def get_exact_count(self, status: Optional[TaskStatus] = None) -> int:
+        """Точный подсчет задач по основной таблице (COUNT(*))"""
         query = self.db.query(Task)
         
         if status:
@@ -58,22 +386,101 @@ class TaskRepository:
         
         return query.count()
     
-    def update(self, task_id: UUID, task_data: TaskUpdate) -> Optional[Task]:
-        """Обновление задачи"""
+    def rebuild_counters(self) -> dict:
+        """Пересчет таблицы счетчиков по основной таблице и архиву в одной транзакции"""
+        try:
+            self.db.execute(delete(TaskCounter))
+            counts = dict(self.db.execute(select(Task.status, func.count()).group_by(Task.status)).all())
+            archived = dict(
+                self.db.execute(select(TaskArchive.status, func.count()).group_by(TaskArchive.status)).all()
+            )
+            rows = [
+                {"status": status, "count": counts.get(status, 0), "archived": archived.get(status, 0)}
+                for status in TaskStatus
+                if status in counts or status in archived
+            ]
+            if rows:
+                self.db.execute(insert(TaskCounter), rows)
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка пересчета счетчиков: {str(e)}")
+        
+        return {
+            counter.status: counter.count
+            for counter in self.db.execute(select(TaskCounter)).scalars()
+        }
+    
+    def get_status_counts(self) -> Dict[TaskStatus, int]:
+        """Количество задач (вместе с архивными) по всем статусам из таблицы счетчиков"""
+        return {
+            counter.status: counter.count + counter.archived
+            for counter in self.db.execute(select(TaskCounter)).scalars()
+        }
+    
+    def get_rollups(
+        self,
+        granularity: RollupGranularity,
+        since: datetime,
+        until: datetime
+    ) -> List[TaskRollup]:
+        """Ненулевые агрегаты за интервал [since, until) по первичному ключу task_rollups"""
+        return list(self.db.scalars(
+            select(TaskRollup)
+            .where(
+                TaskRollup.granularity == granularity.value,
+                TaskRollup.bucket_start >= since,
+                TaskRollup.bucket_start < until,
+                TaskRollup.count != 0
+            )
+            .order_by(TaskRollup.bucket_start)
+        ))
+    
+    def rebuild_rollups(self) -> int:
+        """Пересчет агрегатов по основной таблице и архиву в одной транзакции; возвращает число строк"""
+        try:
+            self.db.execute(delete(TaskRollup))
+            for statement in rebuild_rollups_statements(self.db.get_bind().dialect.name):
+                self.db.execute(text(statement))
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка пересчета агрегатов: {str(e)}")
+        
+        return self.db.execute(select(func.count()).select_from(TaskRollup)).scalar_one()
+    
+    def update(
+        self,
+        task_id: UUID,
+        task_data: TaskUpdate,
+        expected_updated_at: Optional[List[datetime]] = None
+    ) -> Optional[Task]:
+        """
+        Обновление задачи одним UPDATE ... RETURNING.
+
+        Если передан expected_updated_at, задача обновляется только при
+        совпадении updated_at с одним из значений (оптимистичная блокировка).
+        Возвращает None, если задача не найдена или версия не совпала.
+        """
         try:
-            db_task = self.get_by_id(task_id)
-            
-            if not db_task:
-                return None
-            
             # Обновляем только переданные поля
             update_data = task_data.model_dump(exclude_unset=True)
             
-            for field, value in update_data.items():
-                setattr(db_task, field, value)
+            if not update_data:
+                db_task = self.get_by_id(task_id)
+                if db_task and expected_updated_at is not None and db_task.updated_at not in expected_updated_at:
+                    return None
+                return db_task
+            
+            query = update(Task).where(Task.id == task_id)
+            if expected_updated_at is not None:
+                query = query.where(Task.updated_at.in_(expected_updated_at))
+            
+            db_task = self.db.scalars(
+                query.values(**with_lease_reset(update_data)).returning(Task)
+            ).one_or_none()
             
             self.db.commit()
-            self.db.refresh(db_task)
             
             return db_task
             
@@ -81,18 +488,23 @@ class TaskRepository:
             self.db.rollback()
             raise ValueError(f"Ошибка обновления задачи: {str(e)}")
     
-    def delete(self, task_id: UUID) -> bool:
-        """Удаление задачи"""
+    def delete(self, task_id: UUID, expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        """
+        Удаление задачи одним DELETE ... RETURNING.
+
+        Возвращает False, если задача не найдена или (при expected_updated_at)
+        ее версия не совпала.
+        """
         try:
-            db_task = self.get_by_id(task_id)
+            query = delete(Task).where(Task.id == task_id)
+            if expected_updated_at is not None:
+                query = query.where(Task.updated_at.in_(expected_updated_at))
             
-            if not db_task:
-                return False
+            deleted_id = self.db.scalars(query.returning(Task.id)).one_or_none()
             
-            self.db.delete(db_task)
             self.db.commit()
             
-            return True
+            return deleted_id is not None
             
         except IntegrityError as e:
             self.db.rollback()
@@ -101,3 +513,439 @@ class TaskRepository:
     def exists(self, task_id: UUID) -> bool:
         """Проверка существования задачи"""
         return self.db.query(Task).filter(Task.id == task_id).first() is not None
+    
+    def claim(self, n: int, owner: str, expires_at: datetime) -> List[Task]:
+        """
+        Атомарный захват до n свободных задач одним UPDATE ... RETURNING.
+
+        Задачи берутся в порядке создания по индексу (status, created_at, id).
+        В PostgreSQL подзапрос блокирует строки FOR UPDATE SKIP LOCKED, и
+        конкурирующие исполнители получают разные задачи, не ожидая друг друга.
+        В SQLite FOR UPDATE не поддерживается (диалект его опускает): запись
+        сериализована блокировкой базы, и следующий UPDATE уже не видит
+        захваченные задачи. Условие на статус повторяется во внешнем UPDATE,
+        чтобы задача, измененная после выборки, не была захвачена.
+        """
+        try:
+            claimable = (
+                select(Task.id)
+                .where(Task.status == TaskStatus.CREATED)
+                .order_by(Task.created_at, Task.id)
+                .limit(n)
+                .with_for_update(skip_locked=True)
+                .correlate(None)
+            )
+            tasks = self.db.scalars(
+                update(Task)
+                .where(Task.id.in_(claimable), Task.status == TaskStatus.CREATED)
+                .values(status=TaskStatus.IN_PROGRESS, lease_owner=owner, lease_expires_at=expires_at)
+                .returning(Task)
+                .execution_options(synchronize_session=False)
+            ).all()
+            self.db.commit()
+            
+            return tasks
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка захвата задач: {str(e)}")
+    
+    def renew_lease(self, task_id: UUID, owner: str, expires_at: datetime, now: datetime) -> Optional[Task]:
+        """
+        Продление аренды задачи ее исполнителем одним UPDATE ... RETURNING.
+
+        updated_at и change_seq не меняются: аренда не входит в данные задачи
+        для клиентов, и продление не попадает в /changes.
+        Возвращает None, если задача не в работе у owner или аренда уже истекла.
+        """
+        try:
+            task = self.db.scalars(
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    LEASED_CONDITION,
+                    Task.lease_owner == owner,
+                    Task.lease_expires_at > now
+                )
+                .values(lease_expires_at=expires_at, updated_at=Task.updated_at, change_seq=Task.change_seq)
+                .returning(Task)
+                .execution_options(synchronize_session=False)
+            ).one_or_none()
+            self.db.commit()
+            
+            return task
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка продления аренды задачи: {str(e)}")
+    
+    def release_expired(self, now: datetime, limit: int = 1000) -> List[Task]:
+        """
+        Возврат в очередь до limit задач с истекшей арендой.
+
+        Выборка идет по частичному индексу задач в работе; в PostgreSQL строки,
+        которые сейчас продлеваются или завершаются, пропускаются (SKIP LOCKED)
+        и проверяются при следующем проходе.
+        """
+        try:
+            expired = (
+                select(Task.id)
+                .where(LEASED_CONDITION, Task.lease_expires_at < now)
+                .order_by(Task.lease_expires_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .correlate(None)
+            )
+            tasks = self.db.scalars(
+                update(Task)
+                .where(Task.id.in_(expired), LEASED_CONDITION, Task.lease_expires_at < now)
+                .values(status=TaskStatus.CREATED, lease_owner=None, lease_expires_at=None)
+                .returning(Task)
+                .execution_options(synchronize_session=False)
+            ).all()
+            self.db.commit()
+            
+            return tasks
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка возврата задач в очередь: {str(e)}")
+    
+    def archive_completed(self, before: datetime, limit: int = 1000) -> List[UUID]:
+        """
+        Перенос в tasks_archive до limit завершенных задач, не изменявшихся с before.
+
+        Пачка - одна короткая транзакция из двух запросов. INSERT ... SELECT ...
+        RETURNING копирует строки первым, поэтому SQLite сразу берет блокировку
+        записи и выбранные строки не изменятся до DELETE; в PostgreSQL строки,
+        которые сейчас изменяются, пропускаются (SKIP LOCKED) до следующей
+        пачки. Триггеры удаления tasks находят строку в архиве и не меняют
+        агрегаты и надгробия. Возвращает ID перенесенных задач.
+        """
+        try:
+            candidates = (
+                select(*(getattr(Task, name) for name in ARCHIVE_COLUMNS))
+                .where(Task.status == TaskStatus.COMPLETED, Task.updated_at < before)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            task_ids = self.db.scalars(
+                insert(TaskArchive).from_select(ARCHIVE_COLUMNS, candidates).returning(TaskArchive.id)
+            ).all()
+            if task_ids:
+                self.db.execute(
+                    delete(Task).where(Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+                )
+            self.db.commit()
+            
+            return task_ids
+        
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка архивации задач: {str(e)}")
+    
+    def bulk_create(self, items: List[TaskCreate]) -> List[Task]:
+        """Массовое создание задач одним INSERT (executemany) в одной транзакции"""
+        try:
+            tasks = self.db.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                [
+                    {"title": item.title, "description": item.description, "status": item.status}
+                    for item in items
+                ]
+            ).all()
+            self.db.commit()
+            
+            return tasks
+            
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка массового создания задач: {str(e)}")
+    
+    def bulk_insert(self, items: List[TaskCreate]) -> List[UUID]:
+        """Вставка пачки задач одним executemany INSERT без RETURNING; возвращает ID созданных задач"""
+        try:
+            rows = [
+                {"id": new_task_id(), "title": item.title, "description": item.description, "status": item.status}
+                for item in items
+            ]
+            self.db.execute(insert(Task), rows)
+            self.db.commit()
+            
+            return [row["id"] for row in rows]
+            
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка вставки задач: {str(e)}")
+    
+    def bulk_update(self, updates: List[Tuple[List[UUID], dict]]) -> Dict[UUID, Task]:
+        """
+        Массовое обновление задач в одной транзакции.
+
+        Каждый элемент updates - это список ID и общие для них значения полей,
+        он выполняется одним UPDATE ... WHERE id IN (...).
+        Возвращает обновленные задачи по ID.
+        """
+        try:
+            updated = {}
+            
+            for task_ids, values in updates:
+                for task in self.db.scalars(
+                    update(Task)
+                    .where(Task.id.in_(task_ids))
+                    .values(**with_lease_reset(values))
+                    .returning(Task)
+                    .execution_options(synchronize_session=False)
+                ):
+                    updated[task.id] = task
+            
+            self.db.commit()
+            
+            return updated
+            
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка массового обновления задач: {str(e)}")
+    
+    def bulk_delete(self, task_ids: List[UUID]) -> Set[UUID]:
+        """Массовое удаление задач одним DELETE ... WHERE id IN (...); возвращает удаленные ID"""
+        try:
+            deleted = set(self.db.scalars(
+                delete(Task)
+                .where(Task.id.in_(task_ids))
+                .returning(Task.id)
+                .execution_options(synchronize_session=False)
+            ))
+            self.db.commit()
+            
+            return deleted
+            
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError(f"Ошибка массового удаления задач: {str(e)}")
+
+
+class AsyncTaskRepository:
+    """
+    Асинхронный repository для работы с задачами.
+
+    Запросы выполняются через AsyncSession (aiosqlite / asyncpg), поэтому
+    ожидание базы данных не блокирует event loop. Логика запросов не
+    дублируется: методы TaskRepository исполняются через AsyncSession.run_sync.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def run_sync(self, fn: Callable[[TaskRepository], T]) -> T:
+        """Выполнение функции над синхронным TaskRepository без блокировки event loop"""
+        return await self.db.run_sync(lambda session: fn(TaskRepository(session)))
+    
+    async def create(self, task_data: TaskCreate) -> Task:
+        """Создание новой задачи"""
+        return await self.run_sync(lambda repo: repo.create(task_data))
+    
+    async def get_by_id(self, task_id: UUID) -> Optional[Task]:
+        """Получение задачи по ID"""
+        return await self.run_sync(lambda repo: repo.get_by_id(task_id))
+    
+    async def get_columns_by_id(self, task_id: UUID, columns: Sequence[str]) -> Optional[Row]:
+        """Выбранные колонки задачи по ID"""
+        return await self.run_sync(lambda repo: repo.get_columns_by_id(task_id, columns))
+    
+    async def get_archived_by_id(self, task_id: UUID) -> Optional[TaskArchive]:
+        """Получение архивной задачи по ID"""
+        return await self.run_sync(lambda repo: repo.get_archived_by_id(task_id))
+    
+    async def get_archived_columns_by_id(self, task_id: UUID, columns: Sequence[str]) -> Optional[Row]:
+        """Выбранные колонки архивной задачи по ID"""
+        return await self.run_sync(lambda repo: repo.get_archived_columns_by_id(task_id, columns))
+    
+    async def is_archived(self, task_id: UUID) -> bool:
+        """Проверка, перенесена ли задача в архив"""
+        return await self.run_sync(lambda repo: repo.is_archived(task_id))
+    
+    async def get_all(
+        self,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[Optional[datetime], UUID]] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        include_archived: bool = False
+    ) -> List[Task | TaskArchive]:
+        """Получение списка всех задач с опциональной фильтрацией"""
+        return await self.run_sync(
+            lambda repo: repo.get_all(
+                status=status, limit=limit, offset=offset, after=after, order=order, include_archived=include_archived
+            )
+        )
+    
+    async def get_all_columns(
+        self,
+        columns: Sequence[str],
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[Tuple[Optional[datetime], UUID]] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        include_archived: bool = False
+    ) -> List[Row]:
+        """Страница задач из выбранных колонок"""
+        return await self.run_sync(
+            lambda repo: repo.get_all_columns(
+                columns, status=status, limit=limit, offset=offset, after=after, order=order,
+                include_archived=include_archived
+            )
+        )
+    
+    async def get_count(self, status: Optional[TaskStatus] = None, include_archived: bool = False) -> int:
+        """Получение количества задач из таблицы счетчиков"""
+        return await self.run_sync(lambda repo: repo.get_count(status=status, include_archived=include_archived))
+    
+    async def stream_all(self, status: Optional[TaskStatus] = None, batch_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Потоковая выгрузка задач пачками строк через серверный курсор"""
+        result = await self.db.stream(export_query(status, batch_size))
+        async for partition in result.partitions():
+            yield partition
+    
+    async def search(
+        self,
+        q: str,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Task]:
+        """Полнотекстовый поиск задач по названию и описанию"""
+        return await self.run_sync(
+            lambda repo: repo.search(q, status=status, limit=limit, offset=offset)
+        )
+    
+    async def search_count(self, q: str, status: Optional[TaskStatus] = None) -> int:
+        """Количество задач, найденных полнотекстовым поиском"""
+        return await self.run_sync(lambda repo: repo.search_count(q, status=status))
+    
+    async def get_change_bounds(self) -> Tuple[int, int]:
+        """Последний зафиксированный номер изменения и номер удаленных надгробий"""
+        return await self.run_sync(lambda repo: repo.get_change_bounds())
+    
+    async def get_changes(
+        self,
+        after: Tuple[int, Optional[UUID]],
+        until: int,
+        limit: int = 100,
+        include_deleted: bool = True
+    ) -> Tuple[List[Task], List[Row]]:
+        """Задачи и надгробия после позиции синхронизации"""
+        return await self.run_sync(
+            lambda repo: repo.get_changes(after, until, limit=limit, include_deleted=include_deleted)
+        )
+    
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Удаление старых надгробий"""
+        return await self.run_sync(lambda repo: repo.purge_tombstones(before))
+    
+    async def get_events(self, task_id: UUID) -> List[TaskEvent]:
+        """События истории задачи в порядке записи"""
+        return await self.run_sync(lambda repo: repo.get_events(task_id))
+    
+    async def get_status_counts(self) -> Dict[TaskStatus, int]:
+        """Количество задач по всем статусам из таблицы счетчиков"""
+        return await self.run_sync(lambda repo: repo.get_status_counts())
+    
+    async def get_rollups(
+        self,
+        granularity: RollupGranularity,
+        since: datetime,
+        until: datetime
+    ) -> List[TaskRollup]:
+        """Ненулевые агрегаты за интервал"""
+        return await self.run_sync(lambda repo: repo.get_rollups(granularity, since, until))
+    
+    async def rebuild_rollups(self) -> int:
+        """Пересчет агрегатов по основной таблице"""
+        return await self.run_sync(lambda repo: repo.rebuild_rollups())
+    
+    async def rebuild_counters(self) -> dict:
+        """Пересчет таблицы счетчиков по основной таблице"""
+        return await self.run_sync(lambda repo: repo.rebuild_counters())
+    
+    async def update(
+        self,
+        task_id: UUID,
+        task_data: TaskUpdate,
+        expected_updated_at: Optional[List[datetime]] = None
+    ) -> Optional[Task]:
+        """Обновление задачи"""
+        return await self.run_sync(lambda repo: repo.update(task_id, task_data, expected_updated_at))
+    
+    async def delete(self, task_id: UUID, expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        """Удаление задачи"""
+        return await self.run_sync(lambda repo: repo.delete(task_id, expected_updated_at))
+    
+    async def exists(self, task_id: UUID) -> bool:
+        """Проверка существования задачи"""
+        return await self.run_sync(lambda repo: repo.exists(task_id))
+    
+    async def claim(self, n: int, owner: str, expires_at: datetime) -> List[Task]:
+        """Атомарный захват свободных задач"""
+        return await self.run_sync(lambda repo: repo.claim(n, owner, expires_at))
+    
+    async def renew_lease(self, task_id: UUID, owner: str, expires_at: datetime, now: datetime) -> Optional[Task]:
+        """Продление аренды задачи"""
+        return await self.run_sync(lambda repo: repo.renew_lease(task_id, owner, expires_at, now))
+    
+    async def release_expired(self, now: datetime, limit: int = 1000) -> List[Task]:
+        """Возврат в очередь задач с истекшей арендой"""
+        return await self.run_sync(lambda repo: repo.release_expired(now, limit))
+    
+    async def archive_completed(self, before: datetime, limit: int = 1000) -> List[UUID]:
+        """Перенос пачки завершенных задач в архив"""
+        return await self.run_sync(lambda repo: repo.archive_completed(before, limit))
+    
+    async def bulk_create(self, items: List[TaskCreate]) -> List[Task]:
+        """Массовое создание задач"""
+        return await self.run_sync(lambda repo: repo.bulk_create(items))
+    
+    async def bulk_insert(self, items: List[TaskCreate]) -> List[UUID]:
+        """Вставка пачки задач без RETURNING"""
+        return await self.run_sync(lambda repo: repo.bulk_insert(items))
+    
+    async def bulk_update(self, updates: List[Tuple[List[UUID], dict]]) -> Dict[UUID, Task]:
+        """Массовое обновление задач"""
+        return await self.run_sync(lambda repo: repo.bulk_update(updates))
+    
+    async def bulk_delete(self, task_ids: List[UUID]) -> Set[UUID]:
+        """Массовое удаление задач"""
+        return await self.run_sync(lambda repo: repo.bulk_delete(task_ids))
+
+
+class SyncTaskRepository(AsyncTaskRepository):
+    """
+    Интерфейс AsyncTaskRepository поверх синхронной Session.
+
+    Путь данных обработчиков по умолчанию (ASYNC_DATA_PATH=false): методы
+    TaskRepository выполняются прямо в event loop, без переключения в поток
+    aiosqlite, что на быстрых запросах SQLite дешевле. После каждого вызова
+    сессия закрывается и возвращает соединение в пул: event loop не держит
+    соединение между запросами и не ждет свободного соединения пула.
+    Загруженные объекты остаются доступными после закрытия сессии.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    async def run_sync(self, fn: Callable[[TaskRepository], T]) -> T:
+        """Выполнение функции над TaskRepository в event loop"""
+        try:
+            return fn(TaskRepository(self.db))
+        finally:
+            self.db.close()
+    
+    async def stream_all(self, status: Optional[TaskStatus] = None, batch_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """Потоковая выгрузка задач пачками строк; соединение занято до конца выгрузки"""
+        try:
+            for partition in self.db.execute(export_query(status, batch_size)).partitions():
+                yield partition
+        finally:
+            self.db.close()
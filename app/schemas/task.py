@@ -2,11 +2,14 @@
 Pydantic схемы для Task Manager
 """
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, TypeAdapter
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
+from app.core.config import settings
 from app.models.task import TaskStatus
+from app.models.task_event import TaskEventType
+from app.models.task_rollup import RollupGranularity
 
 
 class TaskBase(BaseModel):
@@ -72,7 +75,180 @@ class TaskList(BaseModel):
     """Схема для списка задач"""
     
     tasks: list[TaskResponse] = Field(description="Список задач")
+    total: Optional[int] = Field(None, description="Общее количество задач (не считается при include_total=false)")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы")
+
+
+# Страница задач из строк ORM за один проход валидатора (быстрее model_validate по строкам)
+TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
+
+# Поля задачи, доступные для выборки через fields=
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+
+class TaskPartial(BaseModel):
+    """Задача с выбранными полями (fields=); в ответ попадают только запрошенные поля"""
+    
+    # Без лишних ключей схема не подходит под другие варианты data в APIResponse
+    model_config = ConfigDict(extra="forbid")
+    
+    id: Optional[UUID] = Field(None, description="Уникальный идентификатор задачи")
+    title: Optional[str] = Field(None, description="Название задачи")
+    description: Optional[str] = Field(None, description="Описание задачи")
+    status: Optional[TaskStatus] = Field(None, description="Статус задачи")
+    created_at: Optional[datetime] = Field(None, description="Дата создания")
+    updated_at: Optional[datetime] = Field(None, description="Дата последнего обновления")
+
+
+class TaskPartialList(BaseModel):
+    """Схема для списка задач с выбранными полями"""
+    
+    model_config = ConfigDict(extra="forbid")
+    
+    tasks: list[TaskPartial] = Field(description="Список задач")
+    total: Optional[int] = Field(None, description="Общее количество задач (не считается при include_total=false)")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы")
+    
+    # ETag страницы считается по id и updated_at, которых может не быть среди выбранных полей
+    _etag: Optional[str] = PrivateAttr(None)
+    
+    @property
+    def etag(self) -> Optional[str]:
+        """ETag страницы"""
+        return self._etag
+
+
+TASK_PARTIAL_LIST_ADAPTER = TypeAdapter(list[TaskPartial])
+
+
+class TaskBulkCreate(BaseModel):
+    """Схема для массового создания задач"""
+    
+    items: list[TaskCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.bulk_max_items,
+        description="Создаваемые задачи"
+    )
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Элемент массового обновления задач"""
+    
+    id: UUID = Field(description="Идентификатор обновляемой задачи")
+
+
+class TaskBulkUpdate(BaseModel):
+    """Схема для массового обновления задач"""
+    
+    items: list[TaskBulkUpdateItem] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.bulk_max_items,
+        description="Обновления задач"
+    )
+
+
+class TaskBulkDelete(BaseModel):
+    """Схема для массового удаления задач"""
+    
+    ids: list[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.bulk_max_items,
+        description="Идентификаторы удаляемых задач"
+    )
+
+
+class BulkItemResult(BaseModel):
+    """Результат обработки одного элемента массовой операции"""
+    
+    index: int = Field(description="Позиция элемента в запросе")
+    id: Optional[UUID] = Field(None, description="Идентификатор задачи")
+    success: bool = Field(description="Успешность операции для элемента")
+    error: Optional[str] = Field(None, description="Описание ошибки")
+    data: Optional[TaskResponse] = Field(None, description="Данные задачи")
+
+
+class BulkResult(BaseModel):
+    """Схема результата массовой операции"""
+    
+    results: list[BulkItemResult] = Field(description="Результаты по элементам")
+    succeeded: int = Field(description="Количество успешных элементов")
+    failed: int = Field(description="Количество элементов с ошибкой")
+
+
+class ImportLineError(BaseModel):
+    """Ошибка в строке файла импорта"""
+    
+    line: int = Field(description="Номер строки")
+    error: str = Field(description="Описание ошибки")
+
+
+class ImportSummary(BaseModel):
+    """Итоги импорта задач"""
+    
+    inserted: int = Field(description="Количество созданных задач")
+    rejected: int = Field(description="Количество отклоненных строк")
+    errors: list[ImportLineError] = Field(description="Ошибки (не более import_max_errors)")
+
+
+class TaskEventResponse(BaseModel):
+    """Событие истории задачи"""
+    
+    event_type: TaskEventType = Field(description="Тип события")
+    previous_status: Optional[TaskStatus] = Field(None, description="Статус до события")
+    status: Optional[TaskStatus] = Field(None, description="Статус после события")
+    created_at: datetime = Field(description="Время события")
+
+
+class TaskHistory(BaseModel):
+    """История задачи"""
+    
+    task_id: UUID = Field(description="Идентификатор задачи")
+    events: list[TaskEventResponse] = Field(description="События в порядке возникновения")
+
+
+class TaskStatsBucket(BaseModel):
+    """Показатели за интервал"""
+    
+    bucket_start: datetime = Field(description="Начало интервала (UTC)")
+    created: int = Field(0, description="Создано задач")
+    completed: int = Field(0, description="Завершено задач")
+
+
+class TaskStats(BaseModel):
+    """Сводная статистика задач"""
+    
+    by_status: dict[TaskStatus, int] = Field(description="Количество задач по статусам")
     total: int = Field(description="Общее количество задач")
+    granularity: RollupGranularity = Field(description="Размер интервала")
+    buckets: list[TaskStatsBucket] = Field(description="Показатели по интервалам")
+
+
+class TaskLease(TaskResponse):
+    """Задача в работе у исполнителя с условиями аренды"""
+    
+    lease_owner: Optional[str] = Field(None, description="Исполнитель, взявший задачу")
+    lease_expires_at: Optional[datetime] = Field(None, description="Срок аренды; после него задача возвращается в очередь")
+
+
+TASK_LEASE_LIST_ADAPTER = TypeAdapter(list[TaskLease])
+
+
+class TaskClaim(BaseModel):
+    """Задачи, захваченные исполнителем"""
+    
+    tasks: list[TaskLease] = Field(description="Захваченные задачи (пустой список, если свободных нет)")
+
+
+class TaskChanges(BaseModel):
+    """Изменения задач после токена синхронизации"""
+    
+    changes: list[TaskResponse] = Field(description="Созданные и измененные задачи в порядке изменений")
+    deleted: list[UUID] = Field(description="Идентификаторы удаленных задач")
+    next_token: str = Field(description="Токен для следующего запроса изменений")
+    has_more: bool = Field(description="Есть ли еще изменения после next_token")
 
 
 class APIResponse(BaseModel):
@@ -80,7 +256,33 @@ class APIResponse(BaseModel):
     
     success: bool = Field(description="Успешность операции")
     message: str = Field(description="Сообщение")
-    data: Optional[TaskResponse | TaskList] = Field(None, description="Данные")
+    data: Optional[
+        TaskLease | TaskResponse | TaskList | BulkResult | ImportSummary | TaskHistory | TaskStats | TaskChanges
+        | TaskClaim | TaskPartial | TaskPartialList
+    ] = Field(None, description="Данные")
+
+
+class TaskListResponse(APIResponse):
+    """
+    Ответ со списком задач.
+
+    Схема ответа та же, что у APIResponse; конкретный тип data избавляет
+    сериализатор от перебора вариантов объединения.
+    """
+    
+    data: TaskList = Field(description="Данные")
+
+
+class TaskChangesResponse(APIResponse):
+    """Ответ с изменениями задач"""
+    
+    data: TaskChanges = Field(description="Данные")
+
+
+class TaskClaimResponse(APIResponse):
+    """Ответ с захваченными задачами"""
+    
+    data: TaskClaim = Field(description="Данные")
 
 
 class ErrorResponse(BaseModel):
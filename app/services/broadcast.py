@@ -0,0 +1,299 @@
+"""
+Трансляция изменений задач подписчикам (Server-Sent Events)
+"""
+
+import asyncio
+import enum
+import json
+import threading
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+from app.models.task import TaskStatus
+
+logger = structlog.get_logger()
+
+# Служебные сообщения потока: клиенту нужно перечитать список целиком / переподключиться
+RESET_MESSAGE = b"event: reset\ndata: {}\n\n"
+OVERFLOW_MESSAGE = b"event: overflow\ndata: {}\n\n"
+HEARTBEAT_MESSAGE = b": keepalive\n\n"
+
+
+class TaskChangeType(str, enum.Enum):
+    """Типы изменений задач в потоке"""
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class TaskChange:
+    """Изменение задачи, уже закодированное в сообщение SSE"""
+    
+    seq: int
+    status: Optional[TaskStatus]
+    message: bytes
+
+
+@dataclass
+class BroadcastStats:
+    """Счетчики трансляции"""
+    
+    published: int = 0
+    subscribers: int = 0
+    overflows: int = 0
+    resets: int = 0
+    buffered: int = 0
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        return asdict(self)
+
+
+class Subscription:
+    """
+    Подписка на изменения задач.
+
+    Изменения хранятся в общем буфере трансляции, в очереди подписчика -
+    только ссылки на них. Очередь ограничена max_pending: подписчик, который
+    не успевает читать, получает сообщение overflow и отключается, а затем
+    переподключается с Last-Event-ID и дочитывает пропущенное из общего буфера.
+    """
+    
+    def __init__(
+        self,
+        broadcast: "TaskBroadcast",
+        statuses: Optional[frozenset],
+        max_pending: int,
+        loop: asyncio.AbstractEventLoop
+    ):
+        self.broadcast = broadcast
+        self.statuses = statuses
+        self.max_pending = max_pending
+        self.loop = loop
+        self.reset = False
+        self.overflowed = False
+        self.closed = False
+        self._pending: deque = deque()
+        self._wakeup = asyncio.Event()
+    
+    def matches(self, change: TaskChange) -> bool:
+        """Фильтр по статусу; удаления (статус неизвестен) получают все подписчики"""
+        return self.statuses is None or change.status is None or change.status in self.statuses
+    
+    def offer(self, change: TaskChange) -> bool:
+        """Постановка изменения в очередь (под блокировкой трансляции); True - подписчика нужно разбудить"""
+        if self.overflowed or not self.matches(change):
+            return False
+        if len(self._pending) >= self.max_pending:
+            self.overflowed = True
+            self._pending.clear()
+            return True
+        self._pending.append(change)
+        return len(self._pending) == 1
+    
+    def wake(self) -> None:
+        """Пробуждение ожидающего читателя (в event loop подписчика)"""
+        self._wakeup.set()
+    
+    async def get(self, timeout: float) -> Optional[List[TaskChange]]:
+        """
+        Накопленные изменения; пустой список, если за timeout секунд
+        изменений не было, и None, если очередь переполнилась.
+        """
+        timer = self.loop.call_later(timeout, self._wakeup.set)
+        try:
+            return await self._next()
+        finally:
+            timer.cancel()
+    
+    async def messages(self, heartbeat: float) -> AsyncIterator[bytes]:
+        """Поток сообщений SSE; подписка закрывается вместе с потоком"""
+        ticker = None
+        
+        # Один перезапускающийся таймер keepalive вместо таймера на каждое ожидание
+        def tick():
+            nonlocal ticker
+            ticker = self.loop.call_later(heartbeat, tick)
+            self._wakeup.set()
+        
+        ticker = self.loop.call_later(heartbeat, tick)
+        try:
+            if self.reset:
+                yield RESET_MESSAGE
+            while True:
+                changes = await self._next()
+                if changes is None:
+                    yield OVERFLOW_MESSAGE
+                    return
+                if self.closed:
+                    return
+                yield b"".join(change.message for change in changes) if changes else HEARTBEAT_MESSAGE
+        finally:
+            ticker.cancel()
+            self.close()
+    
+    async def _next(self) -> Optional[List[TaskChange]]:
+        self._wakeup.clear()
+        changes = self.broadcast.drain(self)
+        if not changes and not self.overflowed and not self.closed:
+            await self._wakeup.wait()
+            changes = self.broadcast.drain(self)
+        return None if self.overflowed else changes
+    
+    def close(self) -> None:
+        """Отписка"""
+        self.broadcast.unsubscribe(self)
+
+
+class TaskBroadcast:
+    """
+    Общий буфер изменений задач процесса.
+
+    Каждое изменение кодируется в сообщение SSE один раз при публикации и
+    хранится в кольцевом буфере на buffer_size сообщений; по нему
+    переподключившиеся клиенты дочитывают пропущенное по Last-Event-ID.
+    Идентификатор события - "<эпоха>-<номер>", эпоха меняется при
+    перезапуске процесса. Публиковать можно из любого потока.
+    """
+    
+    def __init__(self, buffer_size: int = 1000, max_pending: int = 100):
+        self.max_pending = max_pending
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self._stats = BroadcastStats()
+    
+    def publish(self, change_type: TaskChangeType, changes: Iterable[Tuple[Optional[TaskStatus], str]]) -> None:
+        """Публикация изменений (статус задачи, JSON задачи) одного типа"""
+        wake = []
+        with self._lock:
+            for status, data in changes:
+                self._seq += 1
+                change = TaskChange(
+                    seq=self._seq,
+                    status=status,
+                    message=f"id: {self.epoch}-{self._seq}\nevent: {change_type.value}\ndata: {data}\n\n".encode()
+                )
+                self._buffer.append(change)
+                self._stats.published += 1
+                for subscription in self._subscribers:
+                    if subscription.offer(change):
+                        wake.append(subscription)
+        
+        for subscription in wake:
+            self._wake(subscription)
+    
+    def subscribe(
+        self,
+        statuses: Optional[Iterable[TaskStatus]] = None,
+        last_event_id: Optional[str] = None
+    ) -> Subscription:
+        """
+        Подписка в текущем event loop.
+
+        С last_event_id в очередь сразу попадают изменения из буфера после
+        этого события. Если событие вытеснено из буфера или выдано до
+        перезапуска процесса, поток начинается с сообщения reset.
+        """
+        subscription = Subscription(
+            self,
+            frozenset(statuses) if statuses else None,
+            self.max_pending,
+            asyncio.get_running_loop()
+        )
+        
+        with self._lock:
+            if last_event_id is not None:
+                after = self._parse_event_id(last_event_id)
+                oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+                if after is None or after > self._seq or after < oldest - 1:
+                    subscription.reset = True
+                    self._stats.resets += 1
+                else:
+                    subscription._pending.extend(
+                        change for change in self._buffer if change.seq > after and subscription.matches(change)
+                    )
+            self._subscribers.add(subscription)
+        
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Удаление подписчика"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.discard(subscription)
+                if subscription.overflowed:
+                    self._stats.overflows += 1
+                    logger.warning("Подписчик отключен: очередь изменений переполнена", max_pending=self.max_pending)
+    
+    def close(self) -> None:
+        """Завершение всех потоков (при остановке приложения)"""
+        with self._lock:
+            subscriptions = list(self._subscribers)
+            for subscription in subscriptions:
+                subscription.closed = True
+        
+        for subscription in subscriptions:
+            self._wake(subscription)
+    
+    def drain(self, subscription: Subscription) -> List[TaskChange]:
+        """Забрать все изменения из очереди подписчика"""
+        with self._lock:
+            changes = list(subscription._pending)
+            subscription._pending.clear()
+            return changes
+    
+    def stats(self) -> BroadcastStats:
+        """Текущие счетчики"""
+        with self._lock:
+            return BroadcastStats(**{
+                **asdict(self._stats),
+                "subscribers": len(self._subscribers),
+                "buffered": len(self._buffer)
+            })
+    
+    def _parse_event_id(self, event_id: str) -> Optional[int]:
+        epoch, _, seq = event_id.strip().partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+    
+    @staticmethod
+    def _wake(subscription: Subscription) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is subscription.loop:
+            subscription.wake()
+            return
+        try:
+            subscription.loop.call_soon_threadsafe(subscription.wake)
+        except RuntimeError:
+            # Event loop подписчика уже закрыт
+            pass
+
+
+def deleted_payload(task_id: uuid.UUID) -> str:
+    """JSON изменения для удаленной задачи"""
+    return json.dumps({"id": str(task_id)})
+
+
+def create_task_broadcast() -> Optional[TaskBroadcast]:
+    """Трансляция по настройкам приложения; None, если поток изменений выключен"""
+    if not settings.task_stream_enabled:
+        return None
+    return TaskBroadcast(buffer_size=settings.task_stream_buffer_size, max_pending=settings.task_stream_queue_size)
+
+
+# Трансляция изменений процесса (у каждого воркера uvicorn своя)
+task_broadcast = create_task_broadcast()
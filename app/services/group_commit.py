@@ -0,0 +1,175 @@
+"""
+Групповая фиксация создания задач
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.repositories.task_repository import AsyncTaskRepository
+from app.schemas.task import BulkResult, TaskCreate, TaskResponse
+from app.services import broadcast, history
+from app.services.task_service import AsyncTaskService, TaskValidationError
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class GroupCommitStats:
+    """Счетчики групповой фиксации"""
+    
+    submitted: int = 0
+    committed: int = 0
+    batches: int = 0
+    max_batch: int = 0
+    retried_batches: int = 0
+    pending: int = 0
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        return asdict(self)
+
+
+class GroupCommitWriter:
+    """
+    Очередь создания задач с одним писателем.
+
+    Обработчики кладут задачу в очередь и ждут future. Писатель собирает
+    пачку до max_items задач или до истечения interval секунд с момента
+    первой задачи и создает ее одной транзакцией (один fsync на пачку
+    вместо fsync на задачу). Если транзакция пачки не удалась, задачи
+    создаются по одной, чтобы ошибка одной задачи не отменила остальные.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_items: int = 100,
+        interval: float = 0.005
+    ):
+        self.session_factory = session_factory
+        self.max_items = max_items
+        self.interval = interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = GroupCommitStats()
+    
+    async def submit(self, task_data: TaskCreate) -> TaskResponse:
+        """Создание задачи в составе ближайшей пачки"""
+        if self._queue is None:
+            raise RuntimeError("Писатель групповой фиксации не запущен")
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((task_data, future))
+        self._stats.submitted += 1
+        return await future
+    
+    def start(self) -> None:
+        """Запуск писателя в текущем event loop"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="task-group-commit")
+    
+    async def stop(self) -> None:
+        """Остановка писателя после записи задач, уже стоящих в очереди"""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        self._queue = None
+    
+    def stats(self) -> GroupCommitStats:
+        """Текущие счетчики"""
+        pending = self._queue.qsize() if self._queue is not None else 0
+        return GroupCommitStats(**{**asdict(self._stats), "pending": pending})
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + self.interval
+            while len(batch) < self.max_items:
+                timeout = deadline - loop.time()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: List[Tuple[TaskCreate, asyncio.Future]]) -> None:
+        try:
+            result = await self._create([task_data for task_data, _ in batch])
+        except Exception as e:
+            logger.warning("Ошибка групповой фиксации, задачи создаются по одной", count=len(batch), error=str(e))
+            self._stats.retried_batches += 1
+            for item in batch:
+                await self._flush_one(item)
+            return
+        
+        self._stats.batches += 1
+        self._stats.max_batch = max(self._stats.max_batch, len(batch))
+        self._resolve(batch, result)
+    
+    async def _flush_one(self, item: Tuple[TaskCreate, asyncio.Future]) -> None:
+        try:
+            result = await self._create([item[0]])
+        except Exception as e:
+            if not item[1].done():
+                item[1].set_exception(e)
+            return
+        self._resolve([item], result)
+    
+    def _resolve(self, batch: List[Tuple[TaskCreate, asyncio.Future]], result: BulkResult) -> None:
+        for (_, future), item_result in zip(batch, result.results):
+            if future.done():
+                # Обработчик отменен (клиент отключился), задача уже создана
+                continue
+            if item_result.success:
+                self._stats.committed += 1
+                future.set_result(item_result.data)
+            else:
+                future.set_exception(TaskValidationError(item_result.error))
+    
+    async def _create(self, items: List[TaskCreate]) -> BulkResult:
+        async with self.session_factory() as db:
+            service = AsyncTaskService(
+                AsyncTaskRepository(db),
+                cache=cache.task_cache,
+                history=history.task_history,
+                broadcast=broadcast.task_broadcast
+            )
+            return await service.bulk_create_tasks(items)
+
+
+def create_group_commit_writer() -> Optional[GroupCommitWriter]:
+    """Писатель по настройкам приложения; None, если групповая фиксация выключена"""
+    if not settings.task_group_commit_enabled:
+        return None
+    
+    return GroupCommitWriter(
+        AsyncSessionLocal,
+        max_items=settings.task_group_commit_max_items,
+        interval=settings.task_group_commit_interval
+    )
+
+
+# Писатель процесса; создается и запускается при старте приложения
+task_group_commit: Optional[GroupCommitWriter] = None
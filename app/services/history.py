@@ -0,0 +1,183 @@
+"""
+Буферизованная запись истории задач
+"""
+
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.task import TaskStatus, utcnow
+from app.models.task_event import TaskEvent, TaskEventType
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class HistoryStats:
+    """Счетчики буфера истории"""
+    
+    recorded: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    dropped: int = 0
+    pending: int = 0
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        return asdict(self)
+
+
+class TaskHistoryBuffer:
+    """
+    Буфер событий истории задач.
+
+    События складываются в память процесса и записываются фоновым потоком
+    одним INSERT (executemany) - по достижении batch_size или раз в
+    flush_interval секунд. Запись задачи не ждет записи истории и не платит
+    за дополнительный fsync. Цена - события последних flush_interval секунд
+    теряются при аварийном завершении процесса; при переполнении
+    max_pending отбрасываются самые старые события.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 100000
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: deque = deque(maxlen=max_pending)
+        # Пачка, которая сейчас записывается: видна в pending(), пока не закоммичена
+        self._in_flight: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = HistoryStats()
+    
+    def record(
+        self,
+        task_id: UUID,
+        event_type: TaskEventType,
+        status: Optional[TaskStatus] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """Добавление события в буфер"""
+        self.record_many([(task_id, event_type, status)], created_at)
+    
+    def record_many(
+        self,
+        events: Iterable[tuple],
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """Добавление пачки событий (task_id, event_type, status) с общим временем"""
+        created_at = created_at or utcnow()
+        with self._lock:
+            for task_id, event_type, status in events:
+                if len(self._pending) == self._pending.maxlen:
+                    self._stats.dropped += 1
+                self._pending.append({
+                    "task_id": task_id,
+                    "event_type": event_type,
+                    "status": status,
+                    "created_at": created_at
+                })
+                self._stats.recorded += 1
+            full = len(self._pending) >= self.batch_size
+        
+        if full:
+            self._wakeup.set()
+    
+    def pending(self, task_id: UUID) -> List[dict]:
+        """Еще не записанные события задачи в порядке добавления"""
+        with self._lock:
+            return [
+                event for event in (*self._in_flight, *self._pending)
+                if event["task_id"] == task_id
+            ]
+    
+    def flush(self) -> int:
+        """Запись накопленных событий одной транзакцией; возвращает число записанных"""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+                self._in_flight = batch
+            
+            if not batch:
+                return 0
+            
+            try:
+                with self.session_factory() as db:
+                    db.execute(insert(TaskEvent), batch)
+                    db.commit()
+            except Exception as e:
+                logger.error("Ошибка записи истории задач", events=len(batch), error=str(e))
+                with self._lock:
+                    self._stats.dropped += len(batch)
+                    self._in_flight = []
+                return 0
+            
+            with self._lock:
+                self._stats.flushed += len(batch)
+                self._stats.flushes += 1
+                self._in_flight = []
+            return len(batch)
+    
+    def start(self) -> None:
+        """Запуск фонового потока записи"""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="task-history-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Остановка фонового потока с записью оставшихся событий"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+    
+    def stats(self) -> HistoryStats:
+        """Текущие счетчики буфера"""
+        with self._lock:
+            return HistoryStats(**{**asdict(self._stats), "pending": len(self._pending)})
+    
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+def create_task_history() -> Optional[TaskHistoryBuffer]:
+    """Буфер истории по настройкам приложения; None, если история выключена"""
+    if not settings.task_history_enabled:
+        return None
+    
+    return TaskHistoryBuffer(
+        SessionLocal,
+        batch_size=settings.task_history_batch_size,
+        flush_interval=settings.task_history_flush_interval,
+        max_pending=settings.task_history_max_pending
+    )
+
+
+# Буфер истории процесса; создается и запускается при старте приложения
+task_history: Optional[TaskHistoryBuffer] = None
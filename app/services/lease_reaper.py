@@ -0,0 +1,126 @@
+"""
+Возврат в очередь задач с истекшей арендой
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.repositories.task_repository import AsyncTaskRepository
+from app.services import broadcast, history
+from app.services.task_service import AsyncTaskService
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class LeaseReaperStats:
+    """Счетчики возврата задач в очередь"""
+    
+    runs: int = 0
+    released: int = 0
+    errors: int = 0
+    
+    def as_dict(self) -> dict:
+        """Представление для ответов API"""
+        return asdict(self)
+
+
+class LeaseReaper:
+    """
+    Фоновый возврат в очередь задач, исполнитель которых не продлил аренду.
+
+    Раз в interval секунд задачи in_progress с истекшей арендой переводятся
+    в created пачками по batch_size (одна транзакция на пачку), пока
+    истекших аренд не останется. При нескольких воркерах процессы возврата
+    не мешают друг другу: задача возвращается в очередь одним UPDATE.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval: float = 10.0,
+        batch_size: int = 1000
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stopping: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = LeaseReaperStats()
+    
+    def start(self) -> None:
+        """Запуск в текущем event loop"""
+        if self._task is not None:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="task-lease-reaper")
+    
+    async def stop(self) -> None:
+        """Остановка после текущего прохода"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        self._stopping = None
+    
+    def stats(self) -> LeaseReaperStats:
+        """Текущие счетчики"""
+        return LeaseReaperStats(**asdict(self._stats))
+    
+    async def run_once(self) -> int:
+        """Один проход: возврат всех задач с истекшей арендой; возвращает их количество"""
+        released = 0
+        while True:
+            async with self.session_factory() as db:
+                service = AsyncTaskService(
+                    AsyncTaskRepository(db),
+                    cache=cache.task_cache,
+                    history=history.task_history,
+                    broadcast=broadcast.task_broadcast
+                )
+                count = await service.release_expired_leases(self.batch_size)
+            released += count
+            if count < self.batch_size:
+                break
+        
+        self._stats.runs += 1
+        self._stats.released += released
+        return released
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._stats.errors += 1
+                logger.error("Ошибка возврата задач с истекшей арендой", error=str(e))
+
+
+def create_lease_reaper() -> Optional[LeaseReaper]:
+    """Процесс возврата по настройкам приложения; None, если он выключен"""
+    if not settings.task_lease_reaper_enabled:
+        return None
+    
+    return LeaseReaper(
+        AsyncSessionLocal,
+        interval=settings.task_lease_reaper_interval,
+        batch_size=settings.task_lease_reaper_batch_size
+    )
+
+
+# Процесс возврата задач в очередь; создается и запускается при старте приложения
+task_lease_reaper: Optional[LeaseReaper] = None
@@ -0,0 +1,49 @@
+"""
+Форматы выгрузки задач (NDJSON / CSV)
+"""
+
+import csv
+import enum
+import io
+import json
+from typing import List
+
+from sqlalchemy.engine import Row
+
+EXPORT_FIELDS = ("id", "title", "description", "status", "created_at", "updated_at")
+
+
+class ExportFormat(str, enum.Enum):
+    """Форматы выгрузки"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _row_values(row: Row) -> tuple:
+    """Значения строки в виде, пригодном для JSON/CSV"""
+    task_id, title, description, status, created_at, updated_at = row
+    return str(task_id), title, description, status.value, created_at.isoformat(), updated_at.isoformat()
+
+
+def format_ndjson(rows: List[Row]) -> bytes:
+    """Пачка строк в NDJSON (одна задача - одна строка)"""
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, _row_values(row))), ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode()
+
+
+def format_csv(rows: List[Row], header: bool = False) -> bytes:
+    """Пачка строк в CSV (с заголовком для первой пачки)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(_row_values(row) for row in rows)
+    return buffer.getvalue().encode()
@@ -0,0 +1,111 @@
+"""
+Потоковый разбор файлов импорта задач (NDJSON / CSV)
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Optional, Tuple
+
+from app.core.config import settings
+from app.services.task_export import ExportFormat
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Построчное чтение потока байтов; в памяти держится только незавершенная строка"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+    
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, object]]:
+    """Записи NDJSON: (номер строки, объект или исключение разбора)"""
+    line_number = 0
+    
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+async def iter_csv(
+    chunks: AsyncIterator[bytes],
+    max_record_size: Optional[int] = None
+) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Записи CSV с заголовком: (номер первой строки записи, dict или исключение).
+
+    Физические строки накапливаются, пока в записи нечетное число кавычек,
+    поэтому поля с переводами строк внутри кавычек разбираются корректно.
+    Четность кавычек обновляется по каждой новой строке. Незакрытая запись
+    длиннее max_record_size символов отклоняется одной ошибкой, и разбор
+    продолжается со следующей строки.
+    """
+    max_record_size = max_record_size or settings.import_max_record_size
+    header = None
+    record = []
+    record_start = line_number = record_size = 0
+    open_quote = False
+    
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            record_start = line_number
+            record_size = 0
+        record.append(line)
+        record_size += len(line) + 1
+        if line.count('"') % 2:
+            open_quote = not open_quote
+        
+        if open_quote:
+            if record_size > max_record_size:
+                record = []
+                open_quote = False
+                yield record_start, ValueError(
+                    f"Запись длиннее {max_record_size} символов: вероятно, незакрытая кавычка"
+                )
+            continue
+        
+        text = "\n".join(record)
+        record = []
+        
+        if not text.strip():
+            continue
+        
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield record_start, e
+            continue
+        
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        
+        if len(values) != len(header):
+            yield record_start, ValueError(f"Ожидалось {len(header)} полей, получено {len(values)}")
+            continue
+        
+        # Пустые ячейки CSV означают отсутствие значения
+        yield record_start, {name: value for name, value in zip(header, values) if value != ""}
+    
+    if record:
+        yield record_start, ValueError("Незакрытая кавычка в конце файла")
+
+
+def iter_records(chunks: AsyncIterator[bytes], file_format: ExportFormat) -> AsyncIterator[Tuple[int, object]]:
+    """Записи файла импорта в выбранном формате"""
+    return iter_csv(chunks) if file_format == ExportFormat.CSV else iter_ndjson(chunks)
@@ -2,16 +2,66 @@
 Сервис для работы с задачами (бизнес-логика)
 """
 
-from typing import List, Optional
+from datetime import datetime, timedelta
+import time
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
 import structlog
+from pydantic import ValidationError
 
-from app.repositories.task_repository import TaskRepository
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskList
-from app.models.task import TaskStatus
+from app.core.cache import CacheBackend
+from app.core.config import settings
+from app.core.etag import (
+    as_utc,
+    make_etag,
+    parse_etag,
+    parse_etag_header,
+    etag_matches,
+    list_etag,
+    not_modified_since
+)
+from app.repositories.task_repository import TaskRepository, AsyncTaskRepository
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskList,
+    TASK_LIST_ADAPTER,
+    TASK_FIELDS,
+    TaskPartial,
+    TaskPartialList,
+    TASK_PARTIAL_LIST_ADAPTER,
+    TaskBulkUpdateItem,
+    BulkItemResult,
+    BulkResult,
+    ImportLineError,
+    ImportSummary,
+    TaskEventResponse,
+    TaskHistory,
+    TaskStats,
+    TaskStatsBucket,
+    TaskChanges,
+    TaskLease,
+    TaskClaim,
+    TASK_LEASE_LIST_ADAPTER
+)
+from app.models.task import TaskStatus, utcnow
+from app.models.task_event import TaskEventType
+from app.models.task_rollup import RollupGranularity
+from app.core.pagination import ListOrder, encode_cursor, decode_cursor, encode_sync_token, decode_sync_token
+from app.services.broadcast import TaskBroadcast, TaskChangeType, deleted_payload
+from app.services.history import TaskHistoryBuffer
+from app.services.task_export import ExportFormat, format_csv, format_ndjson
+from app.services.task_import import iter_records
 
 logger = structlog.get_logger()
 
+# Период статистики по умолчанию для каждого размера интервала
+STATS_WINDOWS = {
+    RollupGranularity.HOUR: timedelta(hours=48),
+    RollupGranularity.DAY: timedelta(days=30),
+}
+
 
 class TaskNotFoundError(Exception):
     """Исключение когда задача не найдена"""
@@ -23,11 +73,76 @@ class TaskValidationError(Exception):
     pass
 
 
+class TaskNotModifiedError(Exception):
+    """Исключение когда у клиента актуальная версия данных (ответ 304)"""
+    
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        super().__init__(etag)
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class TaskPreconditionFailedError(Exception):
+    """Исключение когда версия задачи не совпала с If-Match"""
+    pass
+
+
+class TaskArchivedError(Exception):
+    """Исключение при изменении архивной задачи: она доступна только для чтения (ответ 409)"""
+    pass
+
+
+class TaskLeaseConflictError(Exception):
+    """Исключение когда задача не в работе у исполнителя или ее аренда истекла (ответ 409)"""
+    pass
+
+
+class TaskSyncExpiredError(Exception):
+    """Исключение когда надгробия после токена синхронизации уже удалены (ответ 410)"""
+    pass
+
+
 class TaskService:
     """Сервис для работы с задачами"""
     
-    def __init__(self, repository: TaskRepository):
+    def __init__(
+        self,
+        repository: TaskRepository,
+        cache: Optional[CacheBackend] = None,
+        history: Optional[TaskHistoryBuffer] = None,
+        broadcast: Optional[TaskBroadcast] = None
+    ):
         self.repository = repository
+        self.cache = cache
+        self.history = history
+        self.broadcast = broadcast
+    
+    def _record(self, events: List[tuple]) -> None:
+        """Запись событий (task_id, event_type, status) в буфер истории"""
+        if self.history is not None and events:
+            self.history.record_many(events)
+    
+    def _publish(self, change_type: TaskChangeType, tasks: List[TaskResponse]) -> None:
+        """Публикация созданных / измененных задач подписчикам потока изменений"""
+        if self.broadcast is not None and tasks:
+            self.broadcast.publish(change_type, [(task.status, task.model_dump_json()) for task in tasks])
+    
+    def _publish_deleted(self, task_ids: List[UUID]) -> None:
+        """Публикация удалений подписчикам потока изменений"""
+        if self.broadcast is not None and task_ids:
+            self.broadcast.publish(TaskChangeType.DELETED, [(None, deleted_payload(task_id)) for task_id in task_ids])
+    
+    def _invalidate(self, *task_ids: UUID) -> None:
+        """Инвалидация закэшированных задач после записи"""
+        if self.cache is not None:
+            for task_id in task_ids:
+                self.cache.delete(str(task_id))
+    
+    def _not_found(self, task_id: UUID) -> Exception:
+        """Ошибка записи задачи, которой нет в tasks: архивную задачу изменить нельзя"""
+        if self.repository.is_archived(task_id):
+            return TaskArchivedError(f"Задача с ID {task_id} в архиве и доступна только для чтения")
+        return TaskNotFoundError(f"Задача с ID {task_id} не найдена")
     
     def create_task(self, task_data: TaskCreate) -> TaskResponse:
         """Создание новой задачи"""
@@ -38,37 +153,163 @@ class TaskService:
             
             # Создание задачи через repository
             db_task = self.repository.create(task_data)
+            self._record([(db_task.id, TaskEventType.CREATED, db_task.status)])
+            task = TaskResponse.model_validate(db_task)
+            self._publish(TaskChangeType.CREATED, [task])
             
             logger.info("Задача создана", task_id=str(db_task.id), title=task_data.title)
             
-            return TaskResponse.model_validate(db_task)
+            return task
             
         except ValueError as e:
             logger.error("Ошибка создания задачи", error=str(e))
             raise TaskValidationError(str(e))
     
-    def get_task(self, task_id: UUID) -> TaskResponse:
-        """Получение задачи по ID"""
-        db_task = self.repository.get_by_id(task_id)
+    @staticmethod
+    def _check_not_modified(
+        task_id: UUID,
+        updated_at: datetime,
+        if_none_match: Optional[str],
+        if_modified_since: Optional[str]
+    ) -> None:
+        """Проверка условных заголовков чтения; If-None-Match приоритетнее If-Modified-Since"""
+        etag = make_etag(task_id, updated_at)
+        
+        if if_none_match is not None:
+            not_modified = etag_matches(if_none_match, etag)
+        else:
+            not_modified = not_modified_since(if_modified_since, updated_at)
+        
+        if not_modified:
+            raise TaskNotModifiedError(etag, updated_at)
+    
+    def _expected_versions(self, task_id: UUID, if_match: Optional[str]) -> Optional[List[datetime]]:
+        """Версии updated_at из If-Match; None, если заголовка нет или он равен '*'"""
+        tags = parse_etag_header(if_match)
+        
+        if not tags or "*" in tags:
+            return None
+        
+        return [
+            version
+            for task_key, version in filter(None, map(parse_etag, tags))
+            if task_key == task_id
+        ]
+    
+    def _write_conflict(self, task_id: UUID) -> Exception:
+        """
+        Ошибка условной записи (If-Match), не затронувшей ни одной строки.
+
+        Задача есть - значит, ее версия изменилась (412); иначе задачи нет
+        или она в архиве. Запись не повторяется: версия проверяется только
+        условием самого UPDATE / DELETE, иначе параллельное изменение между
+        чтением и записью было бы потеряно.
+        """
+        if self.repository.exists(task_id):
+            logger.warning("Версия задачи не совпала", task_id=str(task_id))
+            return TaskPreconditionFailedError(f"Задача с ID {task_id} была изменена")
+        
+        return self._not_found(task_id)
+    
+    def get_task(
+        self,
+        task_id: UUID,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> TaskResponse:
+        """
+        Получение задачи по ID (через кэш, если он включен).
+
+        Задача, которой нет в tasks, ищется в архиве. Если версия у клиента
+        актуальна, бросает TaskNotModifiedError до сериализации задачи.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(str(task_id))
+            if cached is not None:
+                self._check_not_modified(cached.id, cached.updated_at, if_none_match, if_modified_since)
+                return cached
+        
+        db_task = self.repository.get_by_id(task_id) or self.repository.get_archived_by_id(task_id)
         
         if not db_task:
             logger.warning("Задача не найдена", task_id=str(task_id))
             raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
         
+        self._check_not_modified(db_task.id, db_task.updated_at, if_none_match, if_modified_since)
+        
         logger.info("Задача получена", task_id=str(task_id))
-        return TaskResponse.model_validate(db_task)
+        task = TaskResponse.model_validate(db_task)
+        
+        if self.cache is not None:
+            self.cache.set(str(task_id), task)
+        
+        return task
     
     def get_tasks(
         self, 
         status: Optional[TaskStatus] = None, 
         limit: int = 100, 
-        offset: int = 0
-    ) -> TaskList:
-        """Получение списка задач"""
-        db_tasks = self.repository.get_all(status=status, limit=limit, offset=offset)
-        total = self.repository.get_count(status=status)
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        if_none_match: Optional[str] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        fields: Optional[str] = None,
+        include_archived: bool = False
+    ) -> TaskList | TaskPartialList:
+        """
+        Получение списка задач.
+
+        Если передан cursor, страница выбирается keyset-пагинацией,
+        иначе используется offset (для обратной совместимости).
+        При order=ID задачи упорядочены только по id (хронологически для UUIDv7 / ULID).
+        Общее количество берется из счетчиков и пропускается при include_total=False.
+        Если ETag страницы совпал с If-None-Match, бросает TaskNotModifiedError.
+        С fields (имена через запятую) читаются только нужные колонки и
+        возвращается TaskPartialList. С include_archived в список и общее
+        количество входят архивные задачи.
+        """
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            logger.warning("Некорректный курсор", cursor=cursor)
+            raise TaskValidationError(str(e))
+        
+        if after is not None and (after[0] is None) != (order == ListOrder.ID):
+            raise TaskValidationError("Курсор получен для другого порядка сортировки")
+        
+        columns = self._parse_fields(fields)
+        
+        # Запрашиваем на одну задачу больше, чтобы узнать, есть ли следующая страница
+        if columns is None:
+            db_tasks = self.repository.get_all(
+                status=status, limit=limit + 1, offset=offset, after=after, order=order,
+                include_archived=include_archived
+            )
+        else:
+            db_tasks = self.repository.get_all_columns(
+                self._with_keys(columns), status=status, limit=limit + 1, offset=offset, after=after, order=order,
+                include_archived=include_archived
+            )
+        total = self.repository.get_count(status=status, include_archived=include_archived) if include_total else None
         
-        tasks = [TaskResponse.model_validate(task) for task in db_tasks]
+        has_more = len(db_tasks) > limit
+        db_tasks = db_tasks[:limit]
+        next_cursor = None
+        if has_more:
+            last = db_tasks[-1]
+            next_cursor = encode_cursor(None if order == ListOrder.ID else last.created_at, last.id)
+        
+        if if_none_match is not None or columns is not None:
+            etag = list_etag(db_tasks, total, next_cursor, columns)
+            if if_none_match is not None and etag_matches(if_none_match, etag):
+                raise TaskNotModifiedError(etag)
+        
+        if columns is None:
+            tasks = TASK_LIST_ADAPTER.validate_python(db_tasks, from_attributes=True)
+        else:
+            # Запрошенные колонки идут первыми, служебные (id, updated_at) в ответ не попадают
+            tasks = TASK_PARTIAL_LIST_ADAPTER.validate_python([dict(zip(columns, row)) for row in db_tasks])
         
         logger.info(
             "Список задач получен", 
@@ -77,46 +318,185 @@ class TaskService:
             status=status.value if status else None
         )
         
-        return TaskList(tasks=tasks, total=total)
+        if columns is None:
+            return TaskList.model_construct(tasks=tasks, total=total, next_cursor=next_cursor)
+        
+        page = TaskPartialList.model_construct(tasks=tasks, total=total, next_cursor=next_cursor)
+        page._etag = etag
+        return page
     
-    def update_task(self, task_id: UUID, task_data: TaskUpdate) -> TaskResponse:
-        """Обновление задачи"""
+    def get_task_fields(
+        self,
+        task_id: UUID,
+        fields: str,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> Tuple[TaskPartial, str, datetime]:
+        """
+        Выбранные поля задачи по ID (кэш не используется, с откатом на архив).
+
+        Возвращает задачу, ETag и время изменения: версия задачи не зависит
+        от набора полей, поэтому ETag совпадает с ETag полного ответа.
+        """
+        columns = self._parse_fields(fields)
+        row = (
+            self.repository.get_columns_by_id(task_id, self._with_keys(columns))
+            or self.repository.get_archived_columns_by_id(task_id, self._with_keys(columns))
+        )
+        
+        if row is None:
+            logger.warning("Задача не найдена", task_id=str(task_id))
+            raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
+        
+        self._check_not_modified(row.id, row.updated_at, if_none_match, if_modified_since)
+        
+        logger.info("Задача получена", task_id=str(task_id), fields=list(columns))
+        return TaskPartial.model_validate(dict(zip(columns, row))), make_etag(row.id, row.updated_at), row.updated_at
+    
+    @staticmethod
+    def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """Поля из параметра fields= в порядке схемы; None - все поля"""
+        if fields is None:
+            return None
+        
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise TaskValidationError("Не указаны поля задачи")
+        
+        unknown = requested.difference(TASK_FIELDS)
+        if unknown:
+            raise TaskValidationError(
+                f"Неизвестные поля задачи: {', '.join(sorted(unknown))}. Доступны: {', '.join(TASK_FIELDS)}"
+            )
+        return tuple(name for name in TASK_FIELDS if name in requested)
+    
+    @staticmethod
+    def _with_keys(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Выбранные колонки и служебные колонки для курсора и ETag (после выбранных)"""
+        return columns + tuple(name for name in ("id", "created_at", "updated_at") if name not in columns)
+    
+    def get_changes(self, since: Optional[str] = None, limit: int = 100) -> TaskChanges:
+        """
+        Изменения задач после токена синхронизации.
+
+        Без токена возвращаются все задачи (начальная синхронизация, удаления
+        не нужны). Задачи и удаления идут в порядке номера изменения; задача,
+        измененная несколько раз, возвращается один раз в последней версии.
+        Если надгробия после токена уже удалены, бросает TaskSyncExpiredError:
+        клиенту нужно начать синхронизацию заново.
+        """
+        try:
+            after = decode_sync_token(since) if since else (0, None)
+        except ValueError as e:
+            logger.warning("Некорректный токен синхронизации", token=since)
+            raise TaskValidationError(str(e))
+        
+        until, purged_seq = self.repository.get_change_bounds()
+        if since and after[0] < purged_seq:
+            raise TaskSyncExpiredError("Токен синхронизации устарел, требуется полная синхронизация")
+        
+        db_tasks, tombstones = self.repository.get_changes(
+            after, until, limit=limit + 1, include_deleted=bool(since)
+        )
+        
+        # Слияние двух упорядоченных выборок по позиции (change_seq, id)
+        merged = sorted(
+            [(task.change_seq, task.id, task) for task in db_tasks]
+            + [(row.change_seq, row.id, None) for row in tombstones],
+            key=lambda item: (item[0], item[1])
+        )
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+        
+        # Последняя страница продвигает токен до зафиксированного номера целиком
+        if has_more:
+            next_token = encode_sync_token(merged[-1][0], merged[-1][1])
+        else:
+            next_token = encode_sync_token(until, None)
+        
+        changes = TASK_LIST_ADAPTER.validate_python(
+            [task for _, _, task in merged if task is not None], from_attributes=True
+        )
+        deleted = [task_id for _, task_id, task in merged if task is None]
+        
+        logger.info("Изменения задач получены", changes=len(changes), deleted=len(deleted), has_more=has_more)
+        
+        return TaskChanges.model_construct(
+            changes=changes, deleted=deleted, next_token=next_token, has_more=has_more
+        )
+    
+    def search_tasks(
+        self,
+        q: str,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        include_total: bool = True
+    ) -> TaskList:
+        """Полнотекстовый поиск задач по названию и описанию (по убыванию релевантности)"""
+        if not q or not q.strip():
+            raise TaskValidationError("Поисковый запрос не может быть пустым")
+        
+        db_tasks = self.repository.search(q, status=status, limit=limit, offset=offset)
+        total = self.repository.search_count(q, status=status) if include_total else None
+        
+        tasks = TASK_LIST_ADAPTER.validate_python(db_tasks, from_attributes=True)
+        
+        logger.info("Поиск задач выполнен", query=q, count=len(tasks), total=total)
+        
+        return TaskList.model_construct(tasks=tasks, total=total, next_cursor=None)
+    
+    def update_task(self, task_id: UUID, task_data: TaskUpdate, if_match: Optional[str] = None) -> TaskResponse:
+        """Обновление задачи (с проверкой версии по If-Match, если он передан)"""
         try:
-            # Проверяем существование задачи
-            if not self.repository.exists(task_id):
-                raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
-            
             # Валидация данных
             if task_data.title is not None and (not task_data.title or not task_data.title.strip()):
                 raise TaskValidationError("Название задачи не может быть пустым")
             
-            # Обновление через repository
-            db_task = self.repository.update(task_id, task_data)
+            # Обновление через repository; отсутствие задачи видно по пустому RETURNING
+            expected = self._expected_versions(task_id, if_match)
+            db_task = self.repository.update(task_id, task_data, expected_updated_at=expected)
+            
+            self._invalidate(task_id)
+            
+            if not db_task and expected is not None:
+                raise self._write_conflict(task_id)
             
             if not db_task:
-                raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
+                raise self._not_found(task_id)
+            
+            if task_data.status is not None:
+                self._record([(task_id, TaskEventType.STATUS_CHANGED, db_task.status)])
+            task = TaskResponse.model_validate(db_task)
+            self._publish(TaskChangeType.UPDATED, [task])
             
             logger.info("Задача обновлена", task_id=str(task_id))
             
-            return TaskResponse.model_validate(db_task)
+            return task
             
         except ValueError as e:
             logger.error("Ошибка обновления задачи", task_id=str(task_id), error=str(e))
             raise TaskValidationError(str(e))
     
-    def delete_task(self, task_id: UUID) -> bool:
-        """Удаление задачи"""
+    def delete_task(self, task_id: UUID, if_match: Optional[str] = None) -> bool:
+        """Удаление задачи (с проверкой версии по If-Match, если он передан)"""
         try:
-            # Проверяем существование задачи
-            if not self.repository.exists(task_id):
-                raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
+            expected = self._expected_versions(task_id, if_match)
+            success = self.repository.delete(task_id, expected_updated_at=expected)
             
-            success = self.repository.delete(task_id)
+            self._invalidate(task_id)
             
-            if success:
-                logger.info("Задача удалена", task_id=str(task_id))
-            else:
-                logger.error("Не удалось удалить задачу", task_id=str(task_id))
+            if not success and expected is not None:
+                raise self._write_conflict(task_id)
+            
+            if not success:
+                logger.warning("Задача не найдена", task_id=str(task_id))
+                raise self._not_found(task_id)
+            
+            self._record([(task_id, TaskEventType.DELETED, None)])
+            self._publish_deleted([task_id])
+            
+            logger.info("Задача удалена", task_id=str(task_id))
             
             return success
             
@@ -124,6 +504,304 @@ class TaskService:
             logger.error("Ошибка удаления задачи", task_id=str(task_id), error=str(e))
             raise TaskValidationError(str(e))
     
+    def claim_tasks(self, n: int, owner: str, lease_seconds: Optional[float] = None) -> TaskClaim:
+        """
+        Захват до n задач из очереди: created -> in_progress с арендой у owner.
+
+        Захват атомарный: одну задачу не получат два исполнителя. Если аренда
+        не продлена до срока, фоновый процесс возвращает задачу в очередь.
+        """
+        owner = self._lease_owner(owner)
+        expires_at = utcnow() + self._lease_duration(lease_seconds)
+        
+        try:
+            db_tasks = self.repository.claim(n, owner, expires_at)
+        except ValueError as e:
+            logger.error("Ошибка захвата задач", owner=owner, error=str(e))
+            raise TaskValidationError(str(e))
+        
+        self._invalidate(*(db_task.id for db_task in db_tasks))
+        self._record([(db_task.id, TaskEventType.STATUS_CHANGED, db_task.status) for db_task in db_tasks])
+        tasks = TASK_LEASE_LIST_ADAPTER.validate_python(db_tasks, from_attributes=True)
+        self._publish(TaskChangeType.UPDATED, tasks)
+        
+        logger.info("Задачи захвачены", owner=owner, count=len(tasks), requested=n)
+        
+        return TaskClaim.model_construct(tasks=tasks)
+    
+    def renew_lease(self, task_id: UUID, owner: str, lease_seconds: Optional[float] = None) -> TaskLease:
+        """
+        Продление аренды задачи исполнителем на lease_seconds от текущего момента.
+
+        Продление не меняет задачу для клиентов (updated_at и ETag остаются
+        прежними). Если задача не в работе у owner или аренда уже истекла,
+        бросает TaskLeaseConflictError.
+        """
+        owner = self._lease_owner(owner)
+        now = utcnow()
+        
+        try:
+            db_task = self.repository.renew_lease(task_id, owner, now + self._lease_duration(lease_seconds), now)
+        except ValueError as e:
+            logger.error("Ошибка продления аренды задачи", task_id=str(task_id), error=str(e))
+            raise TaskValidationError(str(e))
+        
+        if db_task is None:
+            if not self.repository.exists(task_id):
+                raise TaskNotFoundError(f"Задача с ID {task_id} не найдена")
+            logger.warning("Аренда задачи не продлена", task_id=str(task_id), owner=owner)
+            raise TaskLeaseConflictError(f"Задача с ID {task_id} не в работе у исполнителя {owner} или аренда истекла")
+        
+        logger.info("Аренда задачи продлена", task_id=str(task_id), owner=owner)
+        
+        return TaskLease.model_validate(db_task)
+    
+    def release_expired_leases(self, batch_size: int = 1000) -> int:
+        """Возврат в очередь (in_progress -> created) до batch_size задач с истекшей арендой"""
+        try:
+            db_tasks = self.repository.release_expired(utcnow(), limit=batch_size)
+        except ValueError as e:
+            logger.error("Ошибка возврата задач в очередь", error=str(e))
+            raise TaskValidationError(str(e))
+        
+        if db_tasks:
+            self._invalidate(*(db_task.id for db_task in db_tasks))
+            self._record([(db_task.id, TaskEventType.STATUS_CHANGED, db_task.status) for db_task in db_tasks])
+            self._publish(TaskChangeType.UPDATED, TASK_LEASE_LIST_ADAPTER.validate_python(db_tasks, from_attributes=True))
+            logger.warning("Задачи с истекшей арендой возвращены в очередь", count=len(db_tasks))
+        
+        return len(db_tasks)
+    
+    def archive_tasks(self, before: datetime, batch_size: int = 200, pause: float = 0.0) -> int:
+        """
+        Перенос в архив всех завершенных задач, не изменявшихся с before.
+
+        Каждая пачка из batch_size задач - отдельная транзакция, между пачками
+        пауза pause секунд: блокировка записи (в SQLite - всей базы) держится
+        только на время одной пачки, и запросы приложения выполняются между
+        пачками. Возвращает число перенесенных задач.
+        """
+        archived = 0
+        while True:
+            try:
+                task_ids = self.repository.archive_completed(before, limit=batch_size)
+            except ValueError as e:
+                logger.error("Ошибка архивации задач", archived=archived, error=str(e))
+                raise TaskValidationError(str(e))
+            
+            archived += len(task_ids)
+            if len(task_ids) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+        
+        logger.info("Задачи перенесены в архив", count=archived, before=before.isoformat())
+        
+        return archived
+    
+    @staticmethod
+    def _lease_owner(owner: str) -> str:
+        """Идентификатор исполнителя без пробелов по краям"""
+        if not owner or not owner.strip():
+            raise TaskValidationError("Не указан исполнитель")
+        return owner.strip()
+    
+    @staticmethod
+    def _lease_duration(lease_seconds: Optional[float]) -> timedelta:
+        """Срок аренды: по умолчанию task_lease_seconds, не больше task_lease_max_seconds"""
+        seconds = settings.task_lease_seconds if lease_seconds is None else lease_seconds
+        if seconds <= 0 or seconds > settings.task_lease_max_seconds:
+            raise TaskValidationError(
+                f"Срок аренды должен быть больше 0 и не больше {settings.task_lease_max_seconds:g} секунд"
+            )
+        return timedelta(seconds=seconds)
+    
+    def bulk_create_tasks(self, items: List[TaskCreate]) -> BulkResult:
+        """Массовое создание задач в одной транзакции"""
+        results = {}
+        valid = []
+        
+        for index, item in enumerate(items):
+            if not item.title or not item.title.strip():
+                results[index] = BulkItemResult(
+                    index=index, success=False, error="Название задачи не может быть пустым"
+                )
+            else:
+                valid.append((index, item))
+        
+        try:
+            db_tasks = self.repository.bulk_create([item for _, item in valid]) if valid else []
+        except ValueError as e:
+            logger.error("Ошибка массового создания задач", error=str(e))
+            raise TaskValidationError(str(e))
+        
+        self._record([(db_task.id, TaskEventType.CREATED, db_task.status) for db_task in db_tasks])
+        
+        for (index, _), db_task in zip(valid, db_tasks):
+            results[index] = BulkItemResult(
+                index=index, id=db_task.id, success=True, data=TaskResponse.model_validate(db_task)
+            )
+        self._publish(TaskChangeType.CREATED, [results[index].data for index, _ in valid])
+        
+        logger.info("Задачи созданы пакетом", count=len(db_tasks), rejected=len(items) - len(db_tasks))
+        
+        return self._bulk_result(results)
+    
+    def bulk_update_tasks(self, items: List[TaskBulkUpdateItem]) -> BulkResult:
+        """Массовое обновление задач: элементы с одинаковыми изменениями обновляются одним запросом"""
+        results = {}
+        groups = {}
+        
+        for index, item in enumerate(items):
+            update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+            
+            if not update_data:
+                results[index] = BulkItemResult(
+                    index=index, id=item.id, success=False, error="Нет данных для обновления"
+                )
+            elif "title" in update_data and (not item.title or not item.title.strip()):
+                results[index] = BulkItemResult(
+                    index=index, id=item.id, success=False, error="Название задачи не может быть пустым"
+                )
+            else:
+                groups.setdefault(tuple(sorted(update_data.items())), []).append((index, item.id))
+        
+        try:
+            updated = self.repository.bulk_update([
+                ([task_id for _, task_id in members], dict(key))
+                for key, members in groups.items()
+            ]) if groups else {}
+        except ValueError as e:
+            logger.error("Ошибка массового обновления задач", error=str(e))
+            raise TaskValidationError(str(e))
+        
+        self._invalidate(*updated)
+        self._record([
+            (task_id, TaskEventType.STATUS_CHANGED, updated[task_id].status)
+            for key, members in groups.items() if "status" in dict(key)
+            for _, task_id in members if task_id in updated
+        ])
+        
+        for members in groups.values():
+            for index, task_id in members:
+                if task_id in updated:
+                    results[index] = BulkItemResult(
+                        index=index, id=task_id, success=True,
+                        data=TaskResponse.model_validate(updated[task_id])
+                    )
+                else:
+                    results[index] = BulkItemResult(
+                        index=index, id=task_id, success=False, error=f"Задача с ID {task_id} не найдена"
+                    )
+        self._publish(TaskChangeType.UPDATED, [result.data for result in results.values() if result.success])
+        
+        logger.info("Задачи обновлены пакетом", count=len(updated), requested=len(items))
+        
+        return self._bulk_result(results)
+    
+    def bulk_delete_tasks(self, task_ids: List[UUID]) -> BulkResult:
+        """Массовое удаление задач одним запросом"""
+        try:
+            deleted = self.repository.bulk_delete(list(set(task_ids)))
+        except ValueError as e:
+            logger.error("Ошибка массового удаления задач", error=str(e))
+            raise TaskValidationError(str(e))
+        
+        self._invalidate(*deleted)
+        self._record([(task_id, TaskEventType.DELETED, None) for task_id in deleted])
+        self._publish_deleted(list(deleted))
+        
+        results = {
+            index: BulkItemResult(index=index, id=task_id, success=True)
+            if task_id in deleted else
+            BulkItemResult(index=index, id=task_id, success=False, error=f"Задача с ID {task_id} не найдена")
+            for index, task_id in enumerate(task_ids)
+        }
+        
+        logger.info("Задачи удалены пакетом", count=len(deleted), requested=len(task_ids))
+        
+        return self._bulk_result(results)
+    
+    @staticmethod
+    def _bulk_result(results: dict) -> BulkResult:
+        """Сборка результата массовой операции в порядке элементов запроса"""
+        ordered = [results[index] for index in sorted(results)]
+        succeeded = sum(1 for result in ordered if result.success)
+        return BulkResult(results=ordered, succeeded=succeeded, failed=len(ordered) - succeeded)
+    
+    def get_task_history(self, task_id: UUID) -> TaskHistory:
+        """
+        История задачи: записанные события и еще не сброшенные из буфера.
+
+        Повторная установка того же статуса не считается сменой статуса.
+        """
+        events = [
+            (event.event_type, event.status, event.created_at)
+            for event in self.repository.get_events(task_id)
+        ]
+        if self.history is not None:
+            events.extend(
+                (event["event_type"], event["status"], event["created_at"])
+                for event in self.history.pending(task_id)
+            )
+            # Записанные события другого воркера могут быть позже еще не сброшенных
+            events.sort(key=lambda event: as_utc(event[2]))
+        
+        if not events:
+            raise TaskNotFoundError(f"История задачи с ID {task_id} не найдена")
+        
+        result = []
+        previous = None
+        for event_type, status, created_at in events:
+            if event_type == TaskEventType.STATUS_CHANGED and status == previous:
+                continue
+            result.append(TaskEventResponse(
+                event_type=event_type, previous_status=previous, status=status, created_at=created_at
+            ))
+            previous = status
+        
+        return TaskHistory(task_id=task_id, events=result)
+    
+    def get_stats(
+        self,
+        granularity: RollupGranularity = RollupGranularity.DAY,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> TaskStats:
+        """
+        Сводная статистика: количество задач по статусам и показатели по интервалам.
+
+        Читает только таблицы счетчиков и агрегатов, поэтому время ответа не
+        зависит от размера таблицы задач. По умолчанию возвращает последние
+        48 часов (hour) или 30 дней (day).
+        """
+        until = as_utc(until) if until else utcnow()
+        since = as_utc(since) if since else until - STATS_WINDOWS[granularity]
+        if since >= until:
+            raise TaskValidationError("Начало периода должно быть раньше конца")
+        
+        # Интервалы хранятся как naive-время UTC; начало периода округляется вниз до интервала
+        since = since.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+        if granularity == RollupGranularity.DAY:
+            since = since.replace(hour=0)
+        
+        by_status = {status: 0 for status in TaskStatus}
+        by_status.update(self.repository.get_status_counts())
+        
+        buckets = {}
+        for rollup in self.repository.get_rollups(granularity, since, until.replace(tzinfo=None)):
+            bucket = buckets.setdefault(
+                rollup.bucket_start, TaskStatsBucket(bucket_start=as_utc(rollup.bucket_start))
+            )
+            setattr(bucket, rollup.metric, rollup.count)
+        
+        return TaskStats(
+            by_status=by_status,
+            total=sum(by_status.values()),
+            granularity=granularity,
+            buckets=[buckets[key] for key in sorted(buckets)]
+        )
+    
     def get_tasks_by_status(self, status: TaskStatus) -> TaskList:
         """Получение задач по статусу"""
         return self.get_tasks(status=status)
@@ -132,3 +810,264 @@ class TaskService:
         """Изменение статуса задачи"""
         task_update = TaskUpdate(status=new_status)
         return self.update_task(task_id, task_update)
+
+
+class AsyncTaskService:
+    """
+    Асинхронный сервис для работы с задачами.
+
+    Бизнес-логика остается в TaskService и выполняется поверх
+    AsyncTaskRepository (AsyncSession, ASYNC_DATA_PATH=true) или
+    SyncTaskRepository (синхронная Session в event loop, по умолчанию).
+    """
+    
+    def __init__(
+        self,
+        repository: AsyncTaskRepository,
+        cache: Optional[CacheBackend] = None,
+        history: Optional[TaskHistoryBuffer] = None,
+        broadcast: Optional[TaskBroadcast] = None
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.history = history
+        self.broadcast = broadcast
+    
+    def _service(self, repository: TaskRepository) -> TaskService:
+        """Синхронный сервис поверх repository текущей асинхронной сессии"""
+        return TaskService(repository, cache=self.cache, history=self.history, broadcast=self.broadcast)
+    
+    async def create_task(self, task_data: TaskCreate) -> TaskResponse:
+        """Создание новой задачи"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).create_task(task_data))
+    
+    async def get_task(
+        self,
+        task_id: UUID,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> TaskResponse:
+        """Получение задачи по ID"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).get_task(task_id, if_none_match, if_modified_since)
+        )
+    
+    async def get_tasks(
+        self, 
+        status: Optional[TaskStatus] = None, 
+        limit: int = 100, 
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        if_none_match: Optional[str] = None,
+        order: ListOrder = ListOrder.CREATED_AT,
+        fields: Optional[str] = None,
+        include_archived: bool = False
+    ) -> TaskList | TaskPartialList:
+        """Получение списка задач"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).get_tasks(
+                status=status,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                include_total=include_total,
+                if_none_match=if_none_match,
+                order=order,
+                fields=fields,
+                include_archived=include_archived
+            )
+        )
+    
+    async def get_task_fields(
+        self,
+        task_id: UUID,
+        fields: str,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> Tuple[TaskPartial, str, datetime]:
+        """Выбранные поля задачи по ID"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).get_task_fields(task_id, fields, if_none_match, if_modified_since)
+        )
+    
+    async def get_changes(self, since: Optional[str] = None, limit: int = 100) -> TaskChanges:
+        """Изменения задач после токена синхронизации"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).get_changes(since, limit))
+    
+    async def search_tasks(
+        self,
+        q: str,
+        status: Optional[TaskStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        include_total: bool = True
+    ) -> TaskList:
+        """Полнотекстовый поиск задач"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).search_tasks(
+                q, status=status, limit=limit, offset=offset, include_total=include_total
+            )
+        )
+    
+    async def update_task(self, task_id: UUID, task_data: TaskUpdate, if_match: Optional[str] = None) -> TaskResponse:
+        """Обновление задачи"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).update_task(task_id, task_data, if_match)
+        )
+    
+    async def delete_task(self, task_id: UUID, if_match: Optional[str] = None) -> bool:
+        """Удаление задачи"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).delete_task(task_id, if_match))
+    
+    async def export_tasks(
+        self,
+        export_format: ExportFormat,
+        status: Optional[TaskStatus] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Потоковая выгрузка задач.
+
+        Строки читаются пачками по export_batch_size через серверный курсор,
+        поэтому расход памяти не зависит от размера таблицы.
+        """
+        exported = 0
+        
+        async for rows in self.repository.stream_all(status=status, batch_size=settings.export_batch_size):
+            if export_format == ExportFormat.CSV:
+                yield format_csv(rows, header=exported == 0)
+            else:
+                yield format_ndjson(rows)
+            exported += len(rows)
+        
+        if export_format == ExportFormat.CSV and exported == 0:
+            yield format_csv([], header=True)
+        
+        logger.info("Задачи выгружены", count=exported, format=export_format.value)
+    
+    async def import_tasks(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_format: ExportFormat,
+        chunk_size: Optional[int] = None
+    ) -> ImportSummary:
+        """
+        Потоковый импорт задач из NDJSON / CSV.
+
+        Каждая запись проверяется схемой TaskCreate; валидные задачи
+        вставляются пачками по chunk_size, каждая пачка - отдельная
+        транзакция. В памяти держится только текущая пачка.
+        """
+        chunk_size = chunk_size or settings.import_chunk_size
+        inserted = rejected = 0
+        errors: List[ImportLineError] = []
+        batch = []
+        
+        def reject(line: int, error: str) -> None:
+            nonlocal rejected
+            rejected += 1
+            if len(errors) < settings.import_max_errors:
+                errors.append(ImportLineError(line=line, error=error))
+        
+        async def flush() -> None:
+            nonlocal inserted
+            try:
+                items = [item for _, item in batch]
+                if self.broadcast is not None:
+                    # Подписчикам публикуются задачи целиком, как при создании через API,
+                    # поэтому пачка вставляется с RETURNING
+                    tasks = [TaskResponse.model_validate(task) for task in await self.repository.bulk_create(items)]
+                    task_ids = [task.id for task in tasks]
+                    self.broadcast.publish(
+                        TaskChangeType.CREATED, [(task.status, task.model_dump_json()) for task in tasks]
+                    )
+                else:
+                    task_ids = await self.repository.bulk_insert(items)
+                inserted += len(task_ids)
+                if self.history is not None:
+                    self.history.record_many(
+                        (task_id, TaskEventType.CREATED, item.status)
+                        for task_id, item in zip(task_ids, items)
+                    )
+            except ValueError as e:
+                logger.error("Ошибка вставки пачки импорта", error=str(e))
+                for line, _ in batch:
+                    reject(line, str(e))
+            batch.clear()
+        
+        async for line, record in iter_records(chunks, file_format):
+            if isinstance(record, Exception):
+                reject(line, str(record))
+                continue
+            
+            try:
+                item = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                reject(line, "; ".join(
+                    f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in e.errors()
+                ))
+                continue
+            
+            if not item.title.strip():
+                reject(line, "Название задачи не может быть пустым")
+                continue
+            
+            batch.append((line, item))
+            if len(batch) >= chunk_size:
+                await flush()
+        
+        if batch:
+            await flush()
+        
+        logger.info("Импорт задач завершен", inserted=inserted, rejected=rejected, format=file_format.value)
+        
+        return ImportSummary(inserted=inserted, rejected=rejected, errors=errors)
+    
+    async def claim_tasks(self, n: int, owner: str, lease_seconds: Optional[float] = None) -> TaskClaim:
+        """Захват задач из очереди"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).claim_tasks(n, owner, lease_seconds))
+    
+    async def renew_lease(self, task_id: UUID, owner: str, lease_seconds: Optional[float] = None) -> TaskLease:
+        """Продление аренды задачи"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).renew_lease(task_id, owner, lease_seconds)
+        )
+    
+    async def release_expired_leases(self, batch_size: int = 1000) -> int:
+        """Возврат в очередь задач с истекшей арендой"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).release_expired_leases(batch_size))
+    
+    async def bulk_create_tasks(self, items: List[TaskCreate]) -> BulkResult:
+        """Массовое создание задач в одной транзакции"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).bulk_create_tasks(items))
+    
+    async def bulk_update_tasks(self, items: List[TaskBulkUpdateItem]) -> BulkResult:
+        """Массовое обновление задач"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).bulk_update_tasks(items))
+    
+    async def bulk_delete_tasks(self, task_ids: List[UUID]) -> BulkResult:
+        """Массовое удаление задач"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).bulk_delete_tasks(task_ids))
+    
+    async def get_task_history(self, task_id: UUID) -> TaskHistory:
+        """История задачи"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).get_task_history(task_id))
+    
+    async def get_stats(
+        self,
+        granularity: RollupGranularity = RollupGranularity.DAY,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> TaskStats:
+        """Сводная статистика задач"""
+        return await self.repository.run_sync(
+            lambda repo: self._service(repo).get_stats(granularity, since, until)
+        )
+    
+    async def get_tasks_by_status(self, status: TaskStatus) -> TaskList:
+        """Получение задач по статусу"""
+        return await self.get_tasks(status=status)
+    
+    async def change_task_status(self, task_id: UUID, new_status: TaskStatus) -> TaskResponse:
+        """Изменение статуса задачи"""
+        return await self.repository.run_sync(lambda repo: self._service(repo).change_task_status(task_id, new_status))
@@ -0,0 +1,150 @@
+"""
+Бенчмарк горячего пути на большой истории задач до и после архивации.
+
+В базе --tasks задач, из них доля --completed завершена давно (updated_at
+старше срока политики), остальные - активные (created / in_progress).
+Замеряются операции горячего пути через TaskService (сессия на операцию,
+как в обработчике): списки с фильтром по статусу и без, чтение по ID,
+создание и смена статуса задачи. Затем завершенные задачи переносятся
+в tasks_archive пачками по --batch-size; в это время отдельный поток
+меняет статусы задач, и выводится задержка записи во время архивации.
+После архивации те же операции замеряются снова.
+
+Запуск:
+    python -m benchmarks.bench_archive --tasks 1000000 --sqlite-profile production
+"""
+
+import argparse
+import random
+import threading
+from datetime import timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, SQLITE_PROFILES, install_sqlite_pragmas
+from app.core.ids import new_task_id
+from app.models.task import Task, TaskStatus, utcnow
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.task_service import TaskService
+from benchmarks.common import Timer, summarize, temporary_database
+
+ACTIVE_STATUSES = (TaskStatus.CREATED, TaskStatus.IN_PROGRESS)
+
+
+def fill(engine, tasks: int, completed: float, chunk: int = 50000) -> list:
+    """Заполнение базы; возвращает ID активных задач"""
+    now = utcnow()
+    active = []
+    for start in range(0, tasks, chunk):
+        rows = []
+        for i in range(start, min(start + chunk, tasks)):
+            task_id = new_task_id()
+            if random.random() < completed:
+                # Завершенные задачи за последние годы: старше срока политики (90 дней)
+                updated = now - timedelta(days=random.uniform(91, 1000))
+                created = updated - timedelta(days=random.uniform(0, 30))
+                status = TaskStatus.COMPLETED
+            else:
+                created = updated = now - timedelta(days=random.uniform(0, 30))
+                status = ACTIVE_STATUSES[i % 2]
+                active.append(task_id)
+            rows.append({
+                "id": task_id, "title": f"Задача {i}", "description": "Описание задачи. " * 10,
+                "status": status, "created_at": created, "updated_at": updated,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Task), rows)
+    return active
+
+
+def hot_path(session_factory, active: list) -> dict:
+    """Операции горячего пути: метка -> функция одной операции"""
+
+    def call(method, *args, **kwargs):
+        with session_factory() as db:
+            return getattr(TaskService(TaskRepository(db)), method)(*args, **kwargs)
+
+    def update_status():
+        task_id = random.choice(active)
+        call("update_task", task_id, TaskUpdate(status=random.choice(ACTIVE_STATUSES)))
+
+    return {
+        "list status=created": lambda: call("get_tasks", status=TaskStatus.CREATED, limit=100),
+        "list status=in_progress p10": lambda: call("get_tasks", status=TaskStatus.IN_PROGRESS, limit=100, offset=1000),
+        "list first page": lambda: call("get_tasks", limit=100),
+        "get by id": lambda: call("get_task", random.choice(active)),
+        "create": lambda: call("create_task", TaskCreate(title="Новая задача", description="Описание задачи. " * 10)),
+        "update status": update_status,
+    }
+
+
+def measure(label: str, operations: dict, ops: int) -> None:
+    for name, operation in operations.items():
+        samples = []
+        for _ in range(ops):
+            with Timer() as timer:
+                operation()
+            samples.append(timer.elapsed)
+        print(summarize(f"{label} {name}", samples, sum(samples)))
+
+
+def archive_with_writer(session_factory, operations: dict, batch_size: int, pause: float) -> None:
+    """Архивация с параллельной сменой статусов; выводит задержку записи во время переноса"""
+    stop = threading.Event()
+    samples = []
+
+    def writer():
+        while not stop.is_set():
+            with Timer() as timer:
+                operations["update status"]()
+            samples.append(timer.elapsed)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    with Timer() as timer, session_factory() as db:
+        moved = TaskService(TaskRepository(db)).archive_tasks(
+            utcnow() - timedelta(days=90), batch_size=batch_size, pause=pause
+        )
+    stop.set()
+    thread.join()
+    # Журнал WAL после переноса сбрасывается в базу, как это сделал бы автоматический checkpoint
+    with session_factory() as db:
+        db.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    print(f"archive moved={moved} elapsed={timer.elapsed:.1f}s rows/s={moved / timer.elapsed:.0f}")
+    print(summarize("during update status", samples, timer.elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--completed", type=float, default=0.9, help="доля старых завершенных задач")
+    parser.add_argument("--ops", type=int, default=500, help="замеров на операцию")
+    parser.add_argument("--batch-size", type=int, default=settings.task_archive_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.task_archive_batch_pause)
+    parser.add_argument("--sqlite-profile", default="production", choices=sorted(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    random.seed(1)
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        install_sqlite_pragmas(engine, SQLITE_PROFILES[args.sqlite_profile])
+        Base.metadata.create_all(bind=engine)
+        with Timer() as timer:
+            active = fill(engine, args.tasks, args.completed)
+        print(f"filled tasks={args.tasks} active={len(active)} in {timer.elapsed:.1f}s")
+
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        operations = hot_path(session_factory, active)
+
+        measure("without", operations, args.ops)
+        archive_with_writer(session_factory, operations, args.batch_size, args.pause)
+        measure("with", operations, args.ops)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Бенчмарк массового создания задач: по одной задаче против пакетов.
+
+Запуск:
+    python -m benchmarks.bench_bulk --rows 20000 --batch 1000
+"""
+
+import argparse
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from benchmarks.common import Timer, temporary_database
+
+
+def run_single(repository: TaskRepository, items) -> None:
+    """Каждая задача - отдельные commit и refresh"""
+    for item in items:
+        repository.create(item)
+
+
+def run_bulk(repository: TaskRepository, items, batch: int) -> None:
+    """Пакеты по batch задач - один INSERT и один commit на пакет"""
+    for start in range(0, len(items), batch):
+        repository.bulk_create(items[start:start + batch])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    items = [TaskCreate(title=f"task {i}", description="bench") for i in range(args.rows)]
+
+    for label, runner in (
+        ("single-item path", lambda repo: run_single(repo, items)),
+        (f"bulk path (batch={args.batch})", lambda repo: run_bulk(repo, items, args.batch)),
+    ):
+        with temporary_database() as path:
+            engine = create_engine(f"sqlite:///{path}")
+            Base.metadata.create_all(bind=engine)
+            with sessionmaker(bind=engine, autoflush=False)() as db, Timer() as timer:
+                runner(TaskRepository(db))
+            engine.dispose()
+        print(f"{label:<28} rows={args.rows:<8} rows/sec={args.rows / timer.elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Бенчмарк чтения горячих задач: с кэшем и без.
+
+Запуск:
+    python -m benchmarks.bench_cache --reads 50000 --hot 100
+"""
+
+import argparse
+import asyncio
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.cache import LRUCache
+from app.core.database import Base
+from app.repositories.task_repository import AsyncTaskRepository
+from app.schemas.task import TaskCreate
+from app.services.task_service import AsyncTaskService
+from benchmarks.common import Timer, temporary_database
+
+
+async def read_hot_tasks(session_factory, task_ids, reads: int, cache) -> float:
+    """Чтение случайных горячих задач; возвращает чтений в секунду"""
+    async with session_factory() as db:
+        service = AsyncTaskService(AsyncTaskRepository(db), cache=cache)
+        with Timer() as timer:
+            for _ in range(reads):
+                await service.get_task(random.choice(task_ids))
+    return reads / timer.elapsed
+
+
+async def run(path: str, reads: int, hot: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        created = await AsyncTaskService(AsyncTaskRepository(db)).bulk_create_tasks(
+            [TaskCreate(title=f"hot {i}", description="x" * 500) for i in range(hot)]
+        )
+    task_ids = [result.id for result in created.results]
+
+    uncached = await read_hot_tasks(session_factory, task_ids, reads, cache=None)
+    lru = LRUCache(max_size=hot * 2, ttl=60)
+    cached = await read_hot_tasks(session_factory, task_ids, reads, cache=lru)
+
+    print(f"{'uncached':<10} reads/sec={uncached:>10.1f}")
+    print(f"{'cached':<10} reads/sec={cached:>10.1f}  stats={lru.stats().as_dict()}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reads", type=int, default=20000)
+    parser.add_argument("--hot", type=int, default=100)
+    args = parser.parse_args()
+
+    with temporary_database() as path:
+        Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+        asyncio.run(run(path, args.reads, args.hot))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Бенчмарк пути записи с историей задач и без нее.
+
+Каждая операция - создание задачи и смена ее статуса через AsyncTaskService.
+С историей события копятся в буфере и пишутся фоновым потоком пачками.
+
+Запуск:
+    python -m benchmarks.bench_history --ops 5000
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.task import TaskStatus
+from app.models.task_event import TaskEvent
+from app.repositories.task_repository import AsyncTaskRepository
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.history import TaskHistoryBuffer
+from app.services.task_service import AsyncTaskService
+from benchmarks.common import Timer, summarize, temporary_database
+
+
+async def run(path: str, ops: int, with_history: bool) -> str:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    sync_engine = create_engine(f"sqlite:///{path}")
+
+    buffer = None
+    if with_history:
+        buffer = TaskHistoryBuffer(sessionmaker(bind=sync_engine))
+        buffer.start()
+
+    samples = []
+    async with session_factory() as db:
+        service = AsyncTaskService(AsyncTaskRepository(db), history=buffer)
+        with Timer() as total:
+            for i in range(ops):
+                with Timer() as timer:
+                    task = await service.create_task(TaskCreate(title=f"task {i}"))
+                    await service.update_task(task.id, TaskUpdate(status=TaskStatus.IN_PROGRESS))
+                samples.append(timer.elapsed)
+
+    events = 0
+    if buffer is not None:
+        buffer.stop()
+        with sync_engine.connect() as conn:
+            events = conn.execute(select(func.count()).select_from(TaskEvent)).scalar_one()
+
+    await engine.dispose()
+    sync_engine.dispose()
+    label = "history on" if with_history else "history off"
+    return f"{summarize(label, samples, total.elapsed)} events={events}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    for with_history in (False, True):
+        with temporary_database() as path:
+            Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+            print(asyncio.run(run(path, args.ops, with_history)))
+
+
+if __name__ == "__main__":
+    main()
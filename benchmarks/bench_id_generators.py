@@ -0,0 +1,99 @@
+"""
+Бенчмарк вставки с разными генераторами идентификаторов: uuid4, uuid7, ulid.
+
+SQLite не считает расщепления страниц напрямую, поэтому их след показан
+через количество страниц, записанных в WAL на 1000 вставок: случайные ключи
+изменяют (и расщепляют) страницы по всему B-дереву первичного ключа,
+возрастающие - только правый край. Кэш страниц ограничен --cache-mb,
+чтобы индекс перерастал его, как в рабочей базе.
+
+Запуск:
+    python -m benchmarks.bench_id_generators --rows 1000000 10000000 50000000
+"""
+
+import argparse
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, event, insert, text
+
+from app.core.ids import ID_GENERATORS
+from app.models.task import GUID, UUID_STORAGES, utcnow
+from benchmarks.common import Timer, temporary_database
+
+
+def make_table(storage: str) -> Table:
+    """Таблица с той же структурой ключа, что и tasks"""
+    return Table(
+        "tasks", MetaData(),
+        Column("id", GUID(storage), primary_key=True),
+        Column("title", String(255), nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+    )
+
+
+def run(path: str, generator: str, rows: int, batch: int, storage: str, cache_mb: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def limit_cache(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"PRAGMA cache_size = -{cache_mb * 1024}")
+        dbapi_connection.execute("PRAGMA journal_mode = WAL")
+        dbapi_connection.execute("PRAGMA wal_autocheckpoint = 0")
+
+    table = make_table(storage)
+    table.metadata.create_all(engine)
+    new_id = ID_GENERATORS[generator]
+
+    # Пропускная способность по десятым долям прогона: видно падение по мере роста индекса
+    segments = []
+    pages_written = []
+    segment_rows = max(batch, rows // 10)
+    inserted = 0
+    with Timer() as total:
+        while inserted < rows:
+            with Timer() as segment:
+                end = min(rows, inserted + segment_rows)
+                for start in range(inserted, end, batch):
+                    with engine.begin() as conn:
+                        conn.execute(insert(table), [
+                            {"id": new_id(), "title": f"task {start + i}", "created_at": utcnow()}
+                            for i in range(min(batch, end - start))
+                        ])
+            segments.append((end - inserted) / segment.elapsed)
+            # Количество кадров WAL = страниц, записанных за сегмент
+            with engine.connect() as conn:
+                frames = conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()[1]
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            pages_written.append(frames * 1000 / (end - inserted))
+            inserted = end
+
+    with engine.connect() as conn:
+        pk_pages = conn.execute(text(
+            "SELECT COUNT(*) FROM dbstat WHERE name LIKE 'sqlite_autoindex_tasks%'"
+        )).scalar_one()
+
+    print(
+        f"{generator:<6} rows={rows:<10} inserts/sec={rows / total.elapsed:>9.1f} "
+        f"first10%={segments[0]:>9.1f} last10%={segments[-1]:>9.1f} "
+        f"pages/1000 rows: first10%={pages_written[0]:>7.1f} last10%={pages_written[-1]:>7.1f} "
+        f"pk_pages={pk_pages:>8}"
+    )
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000000])
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--storage", choices=UUID_STORAGES, default="binary")
+    parser.add_argument("--cache-mb", type=int, default=8)
+    parser.add_argument("--generators", nargs="+", choices=list(ID_GENERATORS), default=list(ID_GENERATORS))
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        for generator in args.generators:
+            with temporary_database() as path:
+                run(path, generator, rows, args.batch, args.storage, args.cache_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Бенчмарк потокового импорта NDJSON: строк в секунду и рост пикового RSS.
+
+Файл не материализуется: тело генерируется чанками по 64 КБ.
+
+Запуск:
+    python -m benchmarks.bench_import --lines 1000000 --chunk-size 5000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.repositories.task_repository import AsyncTaskRepository
+from app.services.task_export import ExportFormat
+from app.services.task_service import AsyncTaskService
+from benchmarks.common import Timer, temporary_database
+
+
+async def ndjson_body(lines: int, chunk_bytes: int = 65536):
+    """Генератор тела запроса с lines задачами"""
+    buffer = []
+    size = 0
+    for i in range(lines):
+        line = json.dumps({"title": f"imported {i}", "description": "x" * 100}) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def run(path: str, lines: int, chunk_size: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    async with session_factory() as db:
+        service = AsyncTaskService(AsyncTaskRepository(db))
+        with Timer() as timer:
+            summary = await service.import_tasks(ndjson_body(lines), ExportFormat.NDJSON, chunk_size)
+    peak_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1024
+
+    print(
+        f"lines={lines} chunk_size={chunk_size} inserted={summary.inserted} "
+        f"rows/sec={summary.inserted / timer.elapsed:.1f} peak RSS growth={peak_growth:.1f} MB"
+    )
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with temporary_database() as path:
+        sync_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=sync_engine)
+        sync_engine.dispose()
+        asyncio.run(run(path, args.lines, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
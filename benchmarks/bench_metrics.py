@@ -0,0 +1,167 @@
+"""
+Бенчмарк накладных расходов метрик Prometheus.
+
+Запросы идут через весь ASGI-стек приложения (middleware, маршруты, SQL).
+Настройки читаются при импорте, поэтому каждый режим запускается в
+отдельном процессе с METRICS_ENABLED=false/true; режимы чередуются,
+итог - медиана пропускной способности по раундам.
+
+Разброс сквозного замера на общей машине сопоставим с самими накладными
+расходами, поэтому отдельно измеряется стоимость инструментирования:
+middleware вокруг пустого ASGI-приложения и пара событий SQL на запрос.
+
+Запуск:
+    python -m benchmarks.bench_metrics --requests 5000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import Timer, percentile, temporary_database
+
+
+async def child(requests: int, tasks: int) -> dict:
+    import httpx
+
+    from app.core.database import create_tables
+    from app.core.metrics import DB_QUERY_DURATION
+    from app.main import app
+
+    def query_count():
+        return sum(sum(series[:-1]) for series in DB_QUERY_DURATION.values().values())
+
+    create_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/tasks/bulk", json={"items": [{"title": f"task {i}"} for i in range(tasks)]}
+        )
+        task_ids = [item["id"] for item in response.json()["data"]["results"]]
+
+        # Прогрев: соединения пула, кэш планов SQLite
+        for task_id in task_ids[:100]:
+            await client.get(f"/api/v1/tasks/{task_id}")
+
+        samples = []
+        queries = query_count()
+        with Timer() as total:
+            for i in range(requests):
+                url = "/api/v1/tasks/?limit=20" if i % 4 == 0 else f"/api/v1/tasks/{random.choice(task_ids)}"
+                with Timer() as timer:
+                    await client.get(url)
+                samples.append(timer.elapsed)
+
+    return {
+        "rps": requests / total.elapsed,
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "queries": (query_count() - queries) / requests,
+    }
+
+
+async def middleware_cost(iterations: int) -> float:
+    """Добавочное время MetricsMiddleware на запрос, секунды"""
+    from app.core.metrics import Histogram, MetricsMiddleware
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    instrumented = MetricsMiddleware(endpoint, Histogram("bench_seconds", "", ("method", "route", "status")))
+    timings = {}
+    for name, app in (("plain", endpoint), ("instrumented", instrumented)):
+        with Timer() as timer:
+            for _ in range(iterations):
+                await app({"type": "http", "method": "GET"}, None, send)
+        timings[name] = timer.elapsed
+    return (timings["instrumented"] - timings["plain"]) / iterations
+
+
+def query_event_cost(iterations: int) -> float:
+    """Добавочное время событий before/after_cursor_execute на запрос, секунды"""
+    from sqlalchemy import create_engine, text
+
+    from app.core.database import install_query_metrics
+    from app.core.metrics import Histogram
+
+    timings = {}
+    for instrumented in (False, True):
+        engine = create_engine("sqlite://")
+        if instrumented:
+            install_query_metrics(engine, "bench", Histogram("bench_query_seconds", "", ("engine", "operation")))
+        with engine.connect() as conn:
+            statement = text("SELECT 1")
+            with Timer() as timer:
+                for _ in range(iterations):
+                    conn.execute(statement)
+        timings[instrumented] = timer.elapsed
+    return (timings[True] - timings[False]) / iterations
+
+
+def run_mode(enabled: bool, requests: int, tasks: int) -> dict:
+    with temporary_database() as path:
+        env = dict(
+            os.environ,
+            METRICS_ENABLED=str(enabled).lower(),
+            DATABASE_URL=f"sqlite:///{path}",
+            ASYNC_DATABASE_URL="",
+            TASK_HISTORY_ENABLED="false",
+        )
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_metrics", "--child",
+             "--requests", str(requests), "--tasks", str(tasks)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(child(args.requests, args.tasks))))
+        return
+
+    results = {False: [], True: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            results[enabled].append(run_mode(enabled, args.requests, args.tasks))
+
+    for enabled, runs in results.items():
+        print(
+            f"metrics {'on ' if enabled else 'off'} "
+            f"rps={statistics.median(r['rps'] for r in runs):>8.1f} "
+            f"p50={statistics.median(r['p50'] for r in runs) * 1000:>6.2f}ms "
+            f"p99={statistics.median(r['p99'] for r in runs) * 1000:>6.2f}ms"
+        )
+    off = statistics.median(r["rps"] for r in results[False])
+    on = statistics.median(r["rps"] for r in results[True])
+    print(f"end-to-end overhead={(off - on) / off * 100:.2f}%")
+
+    middleware = statistics.median(asyncio.run(middleware_cost(100000)) for _ in range(5))
+    query = statistics.median(query_event_cost(100000) for _ in range(5))
+    queries = statistics.median(r["queries"] for r in results[True])
+    per_request = middleware + queries * query
+    p50 = statistics.median(r["p50"] for r in results[False])
+    print(
+        f"middleware={middleware * 1e6:.2f}us query events={query * 1e6:.2f}us x {queries:.1f} queries "
+        f"per request={per_request * 1e6:.2f}us ({per_request / p50 * 100:.2f}% of p50)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Бенчмарк пагинации: offset против keyset-курсора на разной глубине страниц.
+
+Запуск:
+    python -m benchmarks.bench_pagination --rows 1000000 --limit 100
+"""
+
+import argparse
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.task import Task, utcnow
+from app.repositories.task_repository import TaskRepository
+from benchmarks.common import temporary_database
+
+
+def seed(session_factory, rows: int, batch: int = 50_000) -> None:
+    """Заполнение таблицы задачами с возрастающим created_at"""
+    start = utcnow()
+    with session_factory() as db:
+        for offset in range(0, rows, batch):
+            db.execute(insert(Task), [
+                {
+                    "id": uuid.uuid4(),
+                    "title": f"task {i}",
+                    "created_at": start + timedelta(microseconds=i),
+                    "updated_at": start + timedelta(microseconds=i),
+                }
+                for i in range(offset, min(offset + batch, rows))
+            ])
+            db.commit()
+
+
+def measure(fn, repeats: int) -> float:
+    """Средняя задержка вызова в миллисекундах"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        SessionFactory = sessionmaker(bind=engine, autoflush=False)
+        seed(SessionFactory, args.rows)
+
+        print(f"{'page':>8} {'offset, ms':>12} {'keyset, ms':>12}")
+        depth = 1
+        while depth * args.limit < args.rows:
+            offset = depth * args.limit
+            with SessionFactory() as db:
+                repository = TaskRepository(db)
+                # Позиция курсора - последняя задача предыдущей страницы
+                anchor = repository.get_all(limit=1, offset=offset - 1)[0]
+                position = (anchor.created_at, anchor.id)
+                offset_ms = measure(lambda: repository.get_all(limit=args.limit, offset=offset), args.repeats)
+                keyset_ms = measure(lambda: repository.get_all(limit=args.limit, after=position), args.repeats)
+            print(f"{depth:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+            depth *= 10
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Бенчмарк выборки полей (fields=) против полной страницы задач.
+
+Замеряется путь обработчика списка: запрос страницы через TaskService и
+сериализация тела ответа. Пиковая память одной страницы - по tracemalloc.
+
+Запуск:
+    python -m benchmarks.bench_projection --tasks 20000 --page 1000 --fields id,title,status
+"""
+
+import argparse
+import tracemalloc
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import APIResponse
+from app.services.task_service import TaskService
+from benchmarks.common import Timer, percentile, temporary_database
+
+
+def render_page(session_factory, page: int, fields) -> int:
+    """Страница задач, сериализованная как в обработчике; возвращает размер тела"""
+    db = session_factory()
+    try:
+        tasks = TaskService(TaskRepository(db)).get_tasks(limit=page, include_total=False, fields=fields)
+        payload = APIResponse.model_construct(success=True, message="ok", data=tasks)
+        return len(payload.model_dump_json(exclude_unset=fields is not None))
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--fields", default="id,title,status")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    statuses = list(TaskStatus)
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [
+                {"title": f"Задача {i}", "description": "Подробное описание задачи. " * 35, "status": statuses[i % 3]}
+                for i in range(args.tasks)
+            ])
+        session_factory = sessionmaker(bind=engine)
+
+        for label, fields in (("full", None), (f"fields={args.fields}", args.fields)):
+            render_page(session_factory, args.page, fields)
+
+            samples = []
+            for _ in range(args.iterations):
+                with Timer() as timer:
+                    size = render_page(session_factory, args.page, fields)
+                samples.append(timer.elapsed)
+
+            tracemalloc.start()
+            render_page(session_factory, args.page, fields)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{label:<28} rows={args.page:<5} p50={percentile(samples, 50) * 1000:>8.2f}ms "
+                f"p99={percentile(samples, 99) * 1000:>8.2f}ms peak={peak / 1024:>8.0f}KiB body={size / 1024:>7.0f}KiB"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
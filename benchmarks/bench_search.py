@@ -0,0 +1,81 @@
+"""
+Бенчмарк поиска задач: полнотекстовый индекс FTS5 против LIKE '%q%'.
+
+Запуск:
+    python -m benchmarks.bench_search --rows 1000000 --queries 50
+"""
+
+import argparse
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from benchmarks.common import Timer, summarize, temporary_database
+
+WORDS = [
+    "отчет", "встреча", "релиз", "ревью", "баг", "клиент", "договор", "счет", "тест", "деплой",
+    "миграция", "бюджет", "дизайн", "документация", "интервью", "сервер", "оплата", "план",
+]
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    """Случайный текст из словаря с редкими уникальными словами"""
+    tokens = [rng.choice(WORDS) for _ in range(words)]
+    tokens.append(f"метка{rng.randrange(100000)}")
+    return " ".join(tokens)
+
+
+def seed(session_factory, rows: int, batch: int = 10000) -> None:
+    """Заполнение таблицы задачами пачками"""
+    rng = random.Random(42)
+    with session_factory() as db:
+        repository = TaskRepository(db)
+        for start in range(0, rows, batch):
+            repository.bulk_insert([
+                TaskCreate(title=random_text(rng, 3), description=random_text(rng, 20))
+                for _ in range(min(batch, rows - start))
+            ])
+
+
+def measure(session_factory, queries, use_index: bool) -> str:
+    """Серия поисковых запросов; строка отчета с задержками"""
+    samples = []
+    with session_factory() as db:
+        repository = TaskRepository(db)
+        with Timer() as total:
+            for q in queries:
+                with Timer() as timer:
+                    repository.search(q, limit=20, use_index=use_index)
+                samples.append(timer.elapsed)
+    return summarize("fts5" if use_index else "like", samples, total.elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    queries = [f"метка{rng.randrange(100000)}" for _ in range(args.queries)]
+
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        with Timer() as timer:
+            seed(session_factory, args.rows)
+        print(f"seeded {args.rows} rows in {timer.elapsed:.1f}s")
+
+        print(measure(session_factory, queries, use_index=True))
+        print(measure(session_factory, queries, use_index=False))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
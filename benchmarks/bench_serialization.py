@@ -0,0 +1,91 @@
+"""
+Бенчмарк сериализации страницы списка задач.
+
+validated - прежний путь: model_validate каждой строки, валидация TaskList
+и APIResponse, затем повторная валидация и jsonable_encoder в FastAPI
+через response_model и json.dumps в JSONResponse.
+fast      - TypeAdapter(list[TaskResponse]) по строкам ORM за один вызов
+            и model_dump_json ответа с конкретным типом data.
+
+Запуск:
+    python -m benchmarks.bench_serialization --rows 100,1000 --iterations 200
+"""
+
+import argparse
+import asyncio
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+# Все модели: create_all создает и таблицы, которые читают триггеры и значения по умолчанию tasks
+from app.models import task_archive, task_change, task_counter, task_event, task_rollup, task_search  # noqa: F401
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TASK_LIST_ADAPTER, APIResponse, TaskList, TaskListResponse, TaskResponse
+from benchmarks.common import Timer, percentile, temporary_database
+
+RESPONSE_FIELD = create_response_field(name="response", type_=APIResponse)
+
+
+async def validated(rows) -> bytes:
+    tasks = [TaskResponse.model_validate(task) for task in rows]
+    payload = APIResponse(success=True, message="ok", data=TaskList(tasks=tasks, total=len(tasks)))
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=payload)
+    return JSONResponse(content).body
+
+
+async def fast(rows) -> bytes:
+    tasks = TASK_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    payload = TaskListResponse.model_construct(
+        success=True, message="ok", data=TaskList.model_construct(tasks=tasks, total=len(tasks), next_cursor=None)
+    )
+    return payload.model_dump_json().encode()
+
+
+async def measure(serializer, rows, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        with Timer() as timer:
+            await serializer(rows)
+        samples.append(timer.elapsed)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100,1000")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.rows.split(",")]
+    statuses = list(TaskStatus)
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add_all(
+                Task(title=f"Задача {i}", description="Описание задачи " * 10, status=statuses[i % 3])
+                for i in range(max(sizes))
+            )
+            session.commit()
+
+            for size in sizes:
+                rows = session.scalars(select(Task).limit(size)).all()
+                assert asyncio.run(validated(rows)) == asyncio.run(fast(rows))
+                results = {}
+                for name, serializer in (("validated", validated), ("fast", fast)):
+                    samples = asyncio.run(measure(serializer, rows, args.iterations))
+                    results[name] = percentile(samples, 50)
+                    print(
+                        f"{name:<10} rows={size:<5} p50={percentile(samples, 50) * 1000:>8.3f}ms "
+                        f"p99={percentile(samples, 99) * 1000:>8.3f}ms"
+                    )
+                print(f"speedup rows={size}: {results['validated'] / results['fast']:.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Бенчмарк пропускной способности записи для профилей PRAGMA SQLite.
+
+Несколько процессов одновременно создают задачи через TaskRepository
+(каждая задача - отдельный commit, как у POST /api/v1/tasks/).
+
+Запуск:
+    python -m benchmarks.bench_sqlite_profile --workers 1 4 8 --duration 5
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, SQLITE_PROFILES, install_sqlite_pragmas
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from benchmarks.common import temporary_database
+
+
+def make_engine(path: str, profile: str):
+    """Движок с PRAGMA выбранного профиля"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    install_sqlite_pragmas(engine, SQLITE_PROFILES[profile])
+    return engine
+
+
+def writer(path: str, profile: str, duration: float, results) -> None:
+    """Процесс-писатель: создает задачи до истечения времени"""
+    engine = make_engine(path, profile)
+    written = errors = 0
+    deadline = time.perf_counter() + duration
+    with sessionmaker(bind=engine, autoflush=False)() as db:
+        repository = TaskRepository(db)
+        while time.perf_counter() < deadline:
+            try:
+                repository.create(TaskCreate(title="bench"))
+                written += 1
+            except OperationalError:
+                # "database is locked"
+                db.rollback()
+                errors += 1
+    engine.dispose()
+    results.put((written, errors))
+
+
+def run(profile: str, workers: int, duration: float) -> tuple[float, int]:
+    """Запуск workers процессов; возвращает вставок в секунду и число ошибок блокировки"""
+    with temporary_database() as path:
+        engine = make_engine(path, profile)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=writer, args=(path, profile, duration, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    return sum(w for w, _ in totals) / duration, sum(e for _, e in totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'workers':>8} {'inserts/sec':>12} {'lock errors':>12}")
+    for profile in args.profiles:
+        for workers in args.workers:
+            rate, errors = run(profile, workers, args.duration)
+            print(f"{profile:<12} {workers:>8} {rate:>12.1f} {errors:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Бенчмарк статистики задач: агрегаты против подсчета по таблице tasks.
+
+Таблица наполняется ступенями (--steps), задачи распределены по последним
+30 дням. На каждой ступени замеряется GET /stats (счетчики и агрегаты) и
+эквивалентный прямой подсчет GROUP BY по tasks.
+
+Запуск:
+    python -m benchmarks.bench_stats --steps 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.ids import new_task_id
+from app.models.task import Task, TaskStatus, utcnow
+from app.repositories.task_repository import AsyncTaskRepository
+from app.services.task_service import AsyncTaskService
+from benchmarks.common import Timer, summarize, temporary_database
+
+DIRECT_QUERIES = (
+    "SELECT status, count(*) FROM tasks GROUP BY status",
+    "SELECT strftime('%Y-%m-%d', created_at), count(*) FROM tasks "
+    "WHERE created_at >= :since GROUP BY 1",
+    "SELECT strftime('%Y-%m-%d', updated_at), count(*) FROM tasks "
+    "WHERE status = 'COMPLETED' AND updated_at >= :since GROUP BY 1",
+)
+
+
+def grow(engine, rows: int, batch: int = 10000) -> None:
+    """Добавление задач, созданных в случайные моменты последних 30 дней"""
+    rng = random.Random(rows)
+    now = utcnow()
+    statuses = list(TaskStatus)
+    for start in range(0, rows, batch):
+        values = []
+        for _ in range(min(batch, rows - start)):
+            created_at = now - timedelta(seconds=rng.randrange(30 * 24 * 3600))
+            values.append({
+                "id": new_task_id(), "title": "task", "status": rng.choice(statuses),
+                "created_at": created_at, "updated_at": created_at,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Task), values)
+
+
+async def measure(path: str, size: int, repeats: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    since = utcnow() - timedelta(days=30)
+
+    async with session_factory() as db:
+        service = AsyncTaskService(AsyncTaskRepository(db))
+        samples = []
+        with Timer() as total:
+            for _ in range(repeats):
+                with Timer() as timer:
+                    await service.get_stats()
+                samples.append(timer.elapsed)
+        print(summarize(f"rollups   rows={size}", samples, total.elapsed))
+
+        samples = []
+        with Timer() as total:
+            for _ in range(repeats):
+                with Timer() as timer:
+                    for query in DIRECT_QUERIES:
+                        (await db.execute(text(query), {"since": since})).all()
+                samples.append(timer.elapsed)
+        print(summarize(f"group by  rows={size}", samples, total.elapsed))
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        size = 0
+        for step in args.steps:
+            grow(engine, step - size)
+            size = step
+            asyncio.run(measure(path, size, args.repeats))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Бенчмарк потока изменений задач: память и CPU на одного подписчика.
+
+Для каждого числа подписчиков (--subscribers) в одном event loop
+запускаются читатели, которые работают как обработчик /api/v1/tasks/stream
+(Subscription.messages), но отбрасывают сообщения вместо отправки в сокет.
+Затем публикуется --events изменений с интервалом --interval секунд.
+
+memory    - прирост памяти (tracemalloc) на подписку вместе с задачей читателя;
+cpu/event - процессорное время публикации и доставки одного изменения;
+latency   - задержка от публикации до получения сообщения читателем.
+
+Запуск:
+    python -m benchmarks.bench_stream --subscribers 100,1000,5000 --events 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from app.models.task import TaskStatus
+from app.services.broadcast import TaskBroadcast, TaskChangeType
+from benchmarks.common import percentile
+
+PAYLOAD = json.dumps({
+    "id": "0190f1a2-7c3e-7d4e-9f00-123456789abc",
+    "title": "Задача",
+    "description": "Описание задачи " * 5,
+    "status": "created",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+})
+
+
+async def reader(subscription, published: dict, latencies: list) -> None:
+    async for message in subscription.messages(heartbeat=60.0):
+        received = time.perf_counter()
+        # id: <эпоха>-<номер> первого события пачки; задержка считается по нему
+        seq = int(message[4:message.index(b"\n")].split(b"-")[1])
+        latencies.extend([received - published[seq]] * message.count(b"\n\n"))
+
+
+async def run(subscribers: int, events: int, interval: float) -> dict:
+    hub = TaskBroadcast(buffer_size=1000, max_pending=events + 1)
+    published, latencies = {}, []
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    readers = [asyncio.ensure_future(reader(hub.subscribe(), published, latencies)) for _ in range(subscribers)]
+    await asyncio.sleep(0.1)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    cpu_start = time.process_time()
+    for seq in range(1, events + 1):
+        published[seq] = time.perf_counter()
+        hub.publish(TaskChangeType.CREATED, [(TaskStatus.CREATED, PAYLOAD)])
+        await asyncio.sleep(interval)
+    while len(latencies) < subscribers * events:
+        await asyncio.sleep(0.01)
+    cpu = time.process_time() - cpu_start
+
+    hub.close()
+    await asyncio.gather(*readers)
+    return {
+        "memory": memory / subscribers,
+        "cpu_event": cpu / events,
+        "cpu_delivery": cpu / events / subscribers,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", default="100,1000,5000")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    for subscribers in (int(count) for count in args.subscribers.split(",")):
+        result = asyncio.run(run(subscribers, args.events, args.interval))
+        print(
+            f"subscribers={subscribers:<6} memory={result['memory'] / 1024:>6.2f}KiB "
+            f"cpu/event={result['cpu_event'] * 1000:>8.3f}ms cpu/delivery={result['cpu_delivery'] * 1e6:>6.2f}us "
+            f"latency p50={result['p50'] * 1000:>7.2f}ms p99={result['p99'] * 1000:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Бенчмарк синхронизации изменений (/api/v1/tasks/changes) против полной перезагрузки списка.
+
+В базе --tasks задач; после получения токена изменяется --churn доля задач
+(80% обновлений, 10% удалений, 10% новых задач). Затем сравниваются:
+
+full  - клиент перечитывает весь список страницами по --page (keyset-курсор);
+delta - клиент дочитывает изменения после токена страницами по --page.
+
+Замеряется путь обработчика (TaskService и сериализация тела ответа):
+время полной синхронизации клиента, число запросов и объем ответов.
+
+Запуск:
+    python -m benchmarks.bench_sync --tasks 100000 --churn 0.01
+"""
+
+import argparse
+import random
+
+from sqlalchemy import bindparam, create_engine, delete, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.ids import new_task_id
+from app.core.pagination import encode_sync_token
+from app.models.task import Task, TaskStatus, utcnow
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskChangesResponse, TaskListResponse
+from app.services.task_service import TaskService
+from benchmarks.common import Timer, percentile, temporary_database
+
+
+def full_refetch(session_factory, page: int) -> tuple:
+    """Весь список задач страницами; возвращает (запросов, байт, задач)"""
+    requests = size = count = 0
+    cursor = None
+    while True:
+        with session_factory() as db:
+            tasks = TaskService(TaskRepository(db)).get_tasks(limit=page, cursor=cursor, include_total=False)
+        size += len(TaskListResponse.model_construct(success=True, message="ok", data=tasks).model_dump_json())
+        requests += 1
+        count += len(tasks.tasks)
+        cursor = tasks.next_cursor
+        if cursor is None:
+            return requests, size, count
+
+
+def delta_sync(session_factory, token: str, page: int) -> tuple:
+    """Изменения после токена страницами; возвращает (запросов, байт, изменений)"""
+    requests = size = count = 0
+    while True:
+        with session_factory() as db:
+            changes = TaskService(TaskRepository(db)).get_changes(token, limit=page)
+        size += len(TaskChangesResponse.model_construct(success=True, message="ok", data=changes).model_dump_json())
+        requests += 1
+        count += len(changes.changes) + len(changes.deleted)
+        token = changes.next_token
+        if not changes.has_more:
+            return requests, size, count
+
+
+def apply_churn(engine, ids: list, churn: float) -> None:
+    """Обновления, удаления и создание задач в доле churn от их числа"""
+    changed = random.sample(ids, int(len(ids) * churn))
+    deleted = changed[:len(changed) // 10]
+    updated = changed[len(changed) // 10:len(changed) * 9 // 10]
+    created = len(changed) - len(deleted) - len(updated)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Task).where(Task.id == bindparam("task_id")).values(status=TaskStatus.IN_PROGRESS, updated_at=utcnow()),
+            [{"task_id": task_id} for task_id in updated]
+        )
+        conn.execute(delete(Task).where(Task.id.in_(deleted)))
+        conn.execute(insert(Task), [{"title": f"Новая задача {i}"} for i in range(created)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--churn", type=float, default=0.01)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(1)
+    statuses = list(TaskStatus)
+    with temporary_database() as path:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        ids = [new_task_id() for _ in range(args.tasks)]
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [
+                {"id": task_id, "title": f"Задача {i}", "description": "Описание задачи. " * 10, "status": statuses[i % 3]}
+                for i, task_id in enumerate(ids)
+            ])
+        session_factory = sessionmaker(bind=engine)
+
+        # Токен клиента после начальной синхронизации: последний зафиксированный номер
+        with session_factory() as db:
+            token = encode_sync_token(TaskRepository(db).get_change_bounds()[0], None)
+        apply_churn(engine, ids, args.churn)
+
+        for label, run in (
+            ("full", lambda: full_refetch(session_factory, args.page)),
+            ("delta", lambda: delta_sync(session_factory, token, args.page)),
+        ):
+            samples = []
+            for _ in range(args.iterations):
+                with Timer() as timer:
+                    requests, size, count = run()
+                samples.append(timer.elapsed)
+
+            print(
+                f"{label:<6} tasks={args.tasks:<7} churn={args.churn:<5} items={count:<7} requests={requests:<4} "
+                f"body={size / 1024:>9.1f}KiB p50={percentile(samples, 50) * 1000:>9.2f}ms "
+                f"max={max(samples) * 1000:>9.2f}ms"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
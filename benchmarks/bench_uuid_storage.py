@@ -0,0 +1,73 @@
+"""
+Бенчмарк хранения идентификаторов: VARCHAR(36) против BLOB(16).
+
+Для каждого режима замеряются скорость вставки, размер таблицы и индекса
+первичного ключа (через dbstat) и время чтения и декодирования страниц списка.
+
+Запуск:
+    python -m benchmarks.bench_uuid_storage --rows 1000000
+"""
+
+import argparse
+import uuid
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, create_engine, insert, select, text
+
+from app.models.task import GUID, UUID_STORAGES, utcnow
+from benchmarks.common import Timer, temporary_database
+
+
+def make_table(storage: str) -> Table:
+    """Таблица с той же структурой ключа, что и tasks"""
+    return Table(
+        "tasks", MetaData(),
+        Column("id", GUID(storage), primary_key=True),
+        Column("title", String(255), nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+    )
+
+
+def run(path: str, storage: str, rows: int, batch: int, pages: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    table = make_table(storage)
+    table.metadata.create_all(engine)
+
+    with Timer() as insert_timer:
+        for start in range(0, rows, batch):
+            with engine.begin() as conn:
+                conn.execute(insert(table), [
+                    {"id": uuid.uuid4(), "title": f"task {start + i}", "created_at": utcnow()}
+                    for i in range(min(batch, rows - start))
+                ])
+
+    with engine.connect() as conn:
+        sizes = dict(conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all())
+        pk_index = next(name for name in sizes if name.startswith("sqlite_autoindex_tasks"))
+
+        query = select(table).order_by(table.c.id).limit(1000)
+        with Timer() as decode_timer:
+            for _ in range(pages):
+                conn.execute(query).all()
+
+    print(
+        f"{storage:<8} inserts/sec={rows / insert_timer.elapsed:>10.1f} "
+        f"table={sizes['tasks'] / 2 ** 20:>8.1f}MB pk_index={sizes[pk_index] / 2 ** 20:>8.1f}MB "
+        f"list(1000 rows)={decode_timer.elapsed / pages * 1000:>7.2f}ms"
+    )
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    for storage in UUID_STORAGES:
+        with temporary_database() as path:
+            run(path, storage, args.rows, args.batch, args.pages)
+
+
+if __name__ == "__main__":
+    main()
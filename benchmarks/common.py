@@ -0,0 +1,60 @@
+"""
+Общие утилиты для бенчмарков Task Manager API
+"""
+
+import logging
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import structlog
+
+# Логи запросов искажают замеры, поэтому в бенчмарках оставляем только предупреждения
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+
+@contextmanager
+def temporary_database() -> Iterator[str]:
+    """Временный файл SQLite для изолированного прогона бенчмарка"""
+    directory = tempfile.mkdtemp(prefix="task-manager-bench-")
+    path = os.path.join(directory, "bench.db")
+    try:
+        yield path
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        os.rmdir(directory)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Перцентиль q (0..100) по списку замеров"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label: str, samples: List[float], elapsed: float) -> str:
+    """Строка отчета: пропускная способность и перцентили задержки в миллисекундах"""
+    return (
+        f"{label:<28} n={len(samples):<7} rps={len(samples) / elapsed:>9.1f} "
+        f"p50={percentile(samples, 50) * 1000:>8.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:>8.2f}ms "
+        f"mean={statistics.fmean(samples) * 1000 if samples else 0:>8.2f}ms"
+    )
+
+
+class Timer:
+    """Секундомер для замеров внутри бенчмарков"""
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.start
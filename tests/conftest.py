@@ -3,16 +3,25 @@
 """
 
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.main import app
-from app.core.database import get_db, Base
+from app.core.config import settings
+from app.core.database import get_db, get_async_db, get_task_db, Base
 
 # Настройка тестовой базы данных
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingTaskSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 def override_get_db():
     """Override для тестовой базы данных"""
@@ -22,8 +31,40 @@ def override_get_db():
     finally:
         db.close()
 
-# Переопределяем зависимость для всех тестов
+async def override_get_async_db():
+    """Override для асинхронной тестовой базы данных"""
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+async def override_get_task_db():
+    """Override сессии обработчиков задач для тестовой базы данных"""
+    if settings.async_data_path:
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+    else:
+        with TestingTaskSessionLocal() as db:
+            yield db
+
+@contextmanager
+def count_statements():
+    """Подсчет SQL-запросов, выполненных через тестовые движки (синхронный и асинхронный)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+# Переопределяем зависимости для всех тестов
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_task_db] = override_get_task_db
 
 @pytest.fixture(scope="function")
 def setup_database():
@@ -33,6 +74,8 @@ def setup_database():
     yield
     # Очищаем таблицы после теста
     Base.metadata.drop_all(bind=engine)
+    # Соединения пула, открытые до пересоздания схемы, не переиспользуются
+    engine.dispose()
 
 @pytest.fixture(scope="function")
 def clean_database():
@@ -0,0 +1,72 @@
+"""
+Тесты путей данных обработчиков: синхронная Session (по умолчанию) и AsyncSession
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.v1.tasks import get_task_service
+from app.core.config import settings
+from app.repositories.task_repository import AsyncTaskRepository, SyncTaskRepository
+from app.services.task_service import AsyncTaskService
+from tests.conftest import AsyncTestingSessionLocal, TestingTaskSessionLocal
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def data_path(request, monkeypatch):
+    """Обработчики работают через выбранный путь данных"""
+    monkeypatch.setattr(settings, "async_data_path", request.param)
+    return request.param
+
+
+class TestAsyncDataPath:
+    """Проверка работы обработчиков поверх синхронной и асинхронной сессии"""
+
+    def test_dependency_returns_service_for_session(self):
+        """Dependency выбирает repository по типу сессии"""
+        service = get_task_service(AsyncTestingSessionLocal())
+        assert isinstance(service, AsyncTaskService)
+        assert isinstance(service.repository, AsyncTaskRepository)
+
+        service = get_task_service(TestingTaskSessionLocal())
+        assert isinstance(service.repository, SyncTaskRepository)
+
+    def test_crud_flow(self, client, setup_database, clean_database, data_path):
+        """Полный цикл CRUD через выбранный путь данных"""
+        created = client.post("/api/v1/tasks/", json={"title": "Асинхронная задача"})
+        assert created.status_code == 201
+        task_id = created.json()["data"]["id"]
+
+        response = client.get(f"/api/v1/tasks/{task_id}")
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == "Асинхронная задача"
+
+        response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "completed"
+
+        assert client.get("/api/v1/tasks/export").text.count("\n") == 1
+
+        response = client.delete(f"/api/v1/tasks/{task_id}")
+        assert response.status_code == 204
+
+        response = client.get(f"/api/v1/tasks/{task_id}")
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests(setup_database, clean_database, data_path):
+    """Параллельные запросы на чтение и запись обрабатываются одним event loop"""
+    from app.main import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+        creates = [ac.post("/api/v1/tasks/", json={"title": f"Задача {i}"}) for i in range(10)]
+        reads = [ac.get("/api/v1/tasks/") for _ in range(10)]
+        responses = await asyncio.gather(*creates, *reads)
+
+        assert all(r.status_code in (200, 201) for r in responses)
+
+        response = await ac.get("/api/v1/tasks/")
+        assert response.json()["data"]["total"] == 10
@@ -0,0 +1,72 @@
+"""
+Тесты массовых операций с задачами
+"""
+
+import uuid
+
+
+class TestBulkOperations:
+    """Проверка POST/PATCH/DELETE /api/v1/tasks/bulk"""
+
+    def _bulk_create(self, client, titles):
+        response = client.post("/api/v1/tasks/bulk", json={"items": [{"title": t} for t in titles]})
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    def test_bulk_create(self, client, setup_database, clean_database):
+        """Все задачи создаются, результаты идут в порядке запроса"""
+        data = self._bulk_create(client, ["Первая", "Вторая", "Третья"])
+
+        assert data["succeeded"] == 3
+        assert [r["data"]["title"] for r in data["results"]] == ["Первая", "Вторая", "Третья"]
+        assert client.get("/api/v1/tasks/").json()["data"]["total"] == 3
+
+    def test_bulk_create_reports_invalid_items(self, client, setup_database, clean_database):
+        """Невалидный элемент отклоняется, остальные создаются"""
+        data = self._bulk_create(client, ["Задача", "   "])
+
+        assert data["succeeded"] == 1
+        assert data["failed"] == 1
+        assert data["results"][1]["success"] is False
+        assert data["results"][1]["error"]
+
+    def test_bulk_create_limit(self, client, setup_database, clean_database):
+        """Пустой запрос отклоняется валидацией"""
+        response = client.post("/api/v1/tasks/bulk", json={"items": []})
+        assert response.status_code == 422
+
+    def test_bulk_update(self, client, setup_database, clean_database):
+        """Обновление по группам и отчет о несуществующих задачах"""
+        created = self._bulk_create(client, ["A", "B", "C"])
+        ids = [r["id"] for r in created["results"]]
+        missing = str(uuid.uuid4())
+
+        response = client.patch("/api/v1/tasks/bulk", json={"items": [
+            {"id": ids[0], "status": "completed"},
+            {"id": ids[1], "status": "completed"},
+            {"id": ids[2], "title": "C2"},
+            {"id": missing, "status": "completed"},
+        ]})
+
+        assert response.status_code == 200
+        results = response.json()["data"]["results"]
+        assert [r["success"] for r in results] == [True, True, True, False]
+        assert results[0]["data"]["status"] == "completed"
+        assert results[2]["data"]["title"] == "C2"
+        assert results[3]["id"] == missing
+
+        listing = client.get("/api/v1/tasks/", params={"task_status": "completed"}).json()["data"]
+        assert listing["total"] == 2
+
+    def test_bulk_delete(self, client, setup_database, clean_database):
+        """Удаление существующих и отчет о несуществующих задачах"""
+        created = self._bulk_create(client, ["A", "B"])
+        ids = [r["id"] for r in created["results"]]
+        missing = str(uuid.uuid4())
+
+        response = client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": ids + [missing]})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [r["success"] for r in data["results"]] == [True, True, False]
+        assert client.get("/api/v1/tasks/").json()["data"]["total"] == 0
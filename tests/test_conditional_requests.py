@@ -0,0 +1,126 @@
+"""
+Тесты ETag, If-None-Match, If-Modified-Since и If-Match
+"""
+
+from sqlalchemy import text
+
+from tests.conftest import TestingSessionLocal
+
+
+class TestConditionalReads:
+    """Условные GET-запросы"""
+
+    def _create(self, client, title="Задача"):
+        response = client.post("/api/v1/tasks/", json={"title": title})
+        return response.json()["data"]["id"]
+
+    def test_get_returns_validators(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+
+        response = client.get(f"/api/v1/tasks/{task_id}")
+
+        assert response.headers["ETag"].startswith('"')
+        assert "Last-Modified" in response.headers
+
+    def test_if_none_match_returns_304(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+
+        response = client.get(f"/api/v1/tasks/{task_id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_etag_changes_after_update(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Новое название"})
+        response = client.get(f"/api/v1/tasks/{task_id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_if_modified_since(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        last_modified = client.get(f"/api/v1/tasks/{task_id}").headers["Last-Modified"]
+
+        fresh = client.get(f"/api/v1/tasks/{task_id}", headers={"If-Modified-Since": last_modified})
+        stale = client.get(
+            f"/api/v1/tasks/{task_id}", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+        )
+
+        assert fresh.status_code == 304
+        assert stale.status_code == 200
+
+    def test_list_etag(self, client, setup_database, clean_database):
+        self._create(client)
+        etag = client.get("/api/v1/tasks/").headers["ETag"]
+
+        assert client.get("/api/v1/tasks/", headers={"If-None-Match": etag}).status_code == 304
+
+        self._create(client, "Еще одна")
+        assert client.get("/api/v1/tasks/", headers={"If-None-Match": etag}).status_code == 200
+
+
+class TestOptimisticConcurrency:
+    """If-Match на PUT и DELETE"""
+
+    def _create(self, client):
+        response = client.post("/api/v1/tasks/", json={"title": "Задача"})
+        return response.json()["data"]["id"]
+
+    def test_put_with_current_etag(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+
+        response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers={"If-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_put_with_stale_etag(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Параллельное изменение"})
+
+        response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers={"If-Match": etag})
+
+        assert response.status_code == 412
+        assert client.get(f"/api/v1/tasks/{task_id}").json()["data"]["status"] == "created"
+
+    def test_delete_with_stale_etag(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Параллельное изменение"})
+
+        assert client.delete(f"/api/v1/tasks/{task_id}", headers={"If-Match": etag}).status_code == 412
+
+        current = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        assert client.delete(f"/api/v1/tasks/{task_id}", headers={"If-Match": current}).status_code == 204
+
+    def test_if_match_on_legacy_timestamp(self, client, setup_database, clean_database):
+        """Строка в формате до миграции 0005 не перезаписывается без проверки версии"""
+        task_id = self._create(client)
+        with TestingSessionLocal() as db:
+            db.execute(text("UPDATE tasks SET updated_at = '2024-01-01 10:00:00'"))
+            db.commit()
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+
+        response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers={"If-Match": etag})
+        assert response.status_code == 412
+
+        # После нормализации формата (миграция 0005) тот же ETag совпадает
+        with TestingSessionLocal() as db:
+            db.execute(text("UPDATE tasks SET updated_at = updated_at || '.000000'"))
+            db.commit()
+        response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers={"If-Match": etag})
+        assert response.status_code == 200
+
+    def test_if_match_missing_task(self, client, setup_database, clean_database):
+        task_id = self._create(client)
+        etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+        client.delete(f"/api/v1/tasks/{task_id}")
+
+        assert client.put(f"/api/v1/tasks/{task_id}", json={"title": "X"}, headers={"If-Match": etag}).status_code == 404
@@ -0,0 +1,124 @@
+"""
+Тесты профилей базы данных: PRAGMA SQLite и пул соединений
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.database import (
+    SQLITE_PROFILES,
+    get_async_database_url,
+    get_engine_options,
+    get_pool_settings,
+    get_sqlite_pragmas,
+    install_sqlite_pragmas,
+)
+
+
+class TestSQLiteProfile:
+    """Проверка выбора и применения PRAGMA"""
+
+    def test_default_profile_is_empty(self):
+        assert get_sqlite_pragmas("default") == {}
+
+    def test_overrides_take_precedence(self, monkeypatch):
+        monkeypatch.setattr(settings, "sqlite_synchronous", "FULL")
+
+        pragmas = get_sqlite_pragmas("production")
+
+        assert pragmas["synchronous"] == "FULL"
+        assert pragmas["journal_mode"] == "WAL"
+        assert list(pragmas)[0] == "busy_timeout"
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_sqlite_pragmas("turbo")
+
+    def test_invalid_pragma_value(self):
+        engine = create_engine("sqlite://")
+        with pytest.raises(ValueError):
+            install_sqlite_pragmas(engine, {"journal_mode": "WAL; DROP TABLE tasks"})
+
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+        install_sqlite_pragmas(engine, SQLITE_PROFILES["production"])
+
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+        engine.dispose()
+
+    def test_health_reports_profile(self, client):
+        data = client.get("/health").json()
+
+        assert data["database_profile"]["name"] == settings.sqlite_profile
+        assert data["database_profile"]["pragmas"] == get_sqlite_pragmas()
+
+
+class TestPoolSettings:
+    """Проверка профилей и параметров пула соединений"""
+
+    def test_overrides_take_precedence(self, monkeypatch):
+        monkeypatch.setattr(settings, "db_pool_size", 50)
+
+        options = get_pool_settings("postgresql")
+
+        assert options["pool_size"] == 50
+        assert options["pool_pre_ping"] is True
+        assert get_pool_settings("default") == {"pool_size": 50}
+
+    def test_unknown_profile_and_pool_class(self, monkeypatch):
+        with pytest.raises(ValueError):
+            get_pool_settings("turbo")
+
+        monkeypatch.setattr(settings, "db_pool_class", "lifo")
+        with pytest.raises(ValueError):
+            get_pool_settings("default")
+
+    def test_queue_pool_for_async_driver(self):
+        options = get_engine_options(
+            "sqlite+aiosqlite:///tasks.db", "async", {"pool_class": "queue", "pool_size": 3}
+        )
+
+        assert issubclass(options["poolclass"], AsyncAdaptedQueuePool)
+        assert options["pool_size"] == 3
+
+    def test_queue_arguments_dropped_for_null_pool(self):
+        options = get_engine_options(
+            "sqlite:///tasks.db", "sync", {"pool_class": "null", "pool_size": 3, "pool_recycle": 60}
+        )
+
+        assert issubclass(options["poolclass"], NullPool)
+        assert "pool_size" not in options
+        assert options["pool_recycle"] == 60
+
+    def test_statement_cache_size_by_driver(self):
+        sqlite = get_engine_options("sqlite:///tasks.db", "sync", {"statement_cache_size": 256})
+        asyncpg = get_engine_options(
+            "postgresql+asyncpg://user@localhost/tasks", "async", {"statement_cache_size": 256}
+        )
+
+        assert sqlite["connect_args"]["cached_statements"] == 256
+        assert asyncpg["connect_args"] == {"prepared_statement_cache_size": 256}
+
+    def test_async_driver_for_postgresql(self):
+        assert get_async_database_url("postgresql://localhost/tasks") == "postgresql+asyncpg://localhost/tasks"
+        assert get_async_database_url("postgresql+psycopg://localhost/tasks") == "postgresql+asyncpg://localhost/tasks"
+        assert get_async_database_url("sqlite+aiosqlite:///tasks.db") == "sqlite+aiosqlite:///tasks.db"
+
+    def test_engine_uses_pool_settings(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'pool.db'}"
+        options = get_engine_options(url, "sync", {"pool_class": "queue", "pool_size": 2, "max_overflow": 0})
+        engine = create_engine(url, **options)
+
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 2
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+
+        engine.dispose()
@@ -0,0 +1,84 @@
+"""
+Тесты выборки полей задачи (fields=)
+"""
+
+from tests.conftest import count_statements
+
+
+class TestFieldProjection:
+    """Проверка параметра fields у списка и получения задачи"""
+
+    def _create(self, client, count=3):
+        return [
+            client.post(
+                "/api/v1/tasks/", json={"title": f"Задача {i}", "description": "Длинное описание " * 20}
+            ).json()["data"]
+            for i in range(count)
+        ]
+
+    def test_list_returns_only_requested_fields(self, client, setup_database, clean_database):
+        self._create(client)
+
+        response = client.get("/api/v1/tasks/", params={"fields": "status,title"})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] == 3
+        assert [list(task) for task in data["tasks"]] == [["title", "status"]] * 3
+        assert data["tasks"][0] == {"title": "Задача 0", "status": "created"}
+
+    def test_unselected_columns_are_not_read(self, client, setup_database, clean_database):
+        self._create(client)
+
+        with count_statements() as statements:
+            client.get("/api/v1/tasks/", params={"fields": "id,title"})
+
+        page_query = next(statement for statement in statements if "FROM tasks" in statement)
+        assert "description" not in page_query
+
+    def test_cursor_pagination_with_projection(self, client, setup_database, clean_database):
+        created = self._create(client, 5)
+
+        first = client.get("/api/v1/tasks/", params={"fields": "title", "limit": 2}).json()["data"]
+        second = client.get(
+            "/api/v1/tasks/", params={"fields": "title", "limit": 3, "cursor": first["next_cursor"]}
+        ).json()["data"]
+
+        titles = [task["title"] for task in first["tasks"] + second["tasks"]]
+        assert titles == [task["title"] for task in created]
+        assert second["next_cursor"] is None
+
+    def test_list_etag_depends_on_fields(self, client, setup_database, clean_database):
+        self._create(client)
+
+        full = client.get("/api/v1/tasks/")
+        projected = client.get("/api/v1/tasks/", params={"fields": "title"})
+        assert full.headers["ETag"] != projected.headers["ETag"]
+
+        cached = client.get(
+            "/api/v1/tasks/", params={"fields": "title"}, headers={"If-None-Match": projected.headers["ETag"]}
+        )
+        assert cached.status_code == 304
+
+    def test_get_task_fields(self, client, setup_database, clean_database):
+        task = self._create(client, 1)[0]
+
+        response = client.get(f"/api/v1/tasks/{task['id']}", params={"fields": "id,status"})
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {"id": task["id"], "status": "created"}
+        # Версия задачи не зависит от набора полей
+        assert response.headers["ETag"] == client.get(f"/api/v1/tasks/{task['id']}").headers["ETag"]
+
+    def test_get_missing_task_fields(self, client, setup_database, clean_database):
+        response = client.get(
+            "/api/v1/tasks/00000000-0000-0000-0000-000000000000", params={"fields": "title"}
+        )
+
+        assert response.status_code == 404
+
+    def test_unknown_field(self, client, setup_database, clean_database):
+        task = self._create(client, 1)[0]
+
+        assert client.get("/api/v1/tasks/", params={"fields": "title,secret"}).status_code == 400
+        assert client.get(f"/api/v1/tasks/{task['id']}", params={"fields": ""}).status_code == 400
@@ -0,0 +1,143 @@
+"""
+Тесты групповой фиксации создания задач
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from app.services import group_commit
+from app.services.group_commit import GroupCommitWriter
+from app.services.task_service import TaskValidationError
+from tests.conftest import AsyncTestingSessionLocal, TestingSessionLocal
+
+
+def run_with_writer(scenario, writer_class=GroupCommitWriter, **options):
+    """Запуск сценария с писателем, работающим в том же event loop"""
+    writer = writer_class(AsyncTestingSessionLocal, **options)
+
+    async def main():
+        writer.start()
+        try:
+            return await scenario(writer)
+        finally:
+            await writer.stop()
+
+    return asyncio.run(main()), writer.stats()
+
+
+def stored_titles():
+    db = TestingSessionLocal()
+    try:
+        return sorted(title for (title,) in db.query(Task.title))
+    finally:
+        db.close()
+
+
+class FlakyWriter(GroupCommitWriter):
+    """Писатель, у которого транзакция из нескольких задач всегда падает"""
+
+    async def _create(self, items):
+        if len(items) > 1:
+            raise RuntimeError("database is locked")
+        return await super()._create(items)
+
+
+class TestGroupCommitWriter:
+    """Проверка пачек, ответов и ошибок писателя"""
+
+    def test_concurrent_creates_share_one_transaction(self, setup_database, clean_database):
+        titles = [f"Задача {i}" for i in range(10)]
+
+        async def scenario(writer):
+            return await asyncio.gather(*(writer.submit(TaskCreate(title=title)) for title in titles))
+
+        tasks, stats = run_with_writer(scenario, max_items=50, interval=0.05)
+
+        assert [task.title for task in tasks] == titles
+        assert len({task.id for task in tasks}) == 10
+        assert stats.batches == 1
+        assert stats.max_batch == 10
+        assert stats.committed == 10
+        assert stored_titles() == sorted(titles)
+
+    def test_batch_is_limited_by_max_items(self, setup_database, clean_database):
+        async def scenario(writer):
+            return await asyncio.gather(*(writer.submit(TaskCreate(title=f"Задача {i}")) for i in range(10)))
+
+        tasks, stats = run_with_writer(scenario, max_items=4, interval=0.05)
+
+        assert len(tasks) == 10
+        assert stats.batches == 3
+        assert stats.max_batch == 4
+
+    def test_invalid_task_fails_only_its_caller(self, setup_database, clean_database):
+        async def scenario(writer):
+            return await asyncio.gather(
+                writer.submit(TaskCreate(title="Первая")),
+                writer.submit(TaskCreate(title="   ")),
+                writer.submit(TaskCreate(title="Третья")),
+                return_exceptions=True
+            )
+
+        (first, invalid, third), stats = run_with_writer(scenario, interval=0.05)
+
+        assert first.title == "Первая"
+        assert third.title == "Третья"
+        assert isinstance(invalid, TaskValidationError)
+        assert stats.batches == 1
+        assert stored_titles() == ["Первая", "Третья"]
+
+    def test_failed_batch_is_retried_per_task(self, setup_database, clean_database):
+        async def scenario(writer):
+            return await asyncio.gather(*(writer.submit(TaskCreate(title=f"Задача {i}")) for i in range(3)))
+
+        tasks, stats = run_with_writer(scenario, writer_class=FlakyWriter, interval=0.05)
+
+        assert [task.title for task in tasks] == ["Задача 0", "Задача 1", "Задача 2"]
+        assert stats.retried_batches == 1
+        assert stats.committed == 3
+
+    def test_stop_writes_queued_tasks(self, setup_database, clean_database):
+        async def scenario(writer):
+            futures = [asyncio.ensure_future(writer.submit(TaskCreate(title=f"Задача {i}"))) for i in range(5)]
+            await asyncio.sleep(0)
+            return futures
+
+        # Писатель останавливается сразу, пока задачи еще в очереди
+        futures, stats = run_with_writer(scenario, interval=10.0)
+
+        assert all(future.done() and future.exception() is None for future in futures)
+        assert stats.committed == 5
+        assert len(stored_titles()) == 5
+
+    def test_submit_requires_started_writer(self):
+        writer = GroupCommitWriter(AsyncTestingSessionLocal)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(writer.submit(TaskCreate(title="Задача")))
+
+
+class TestGroupCommitEndpoint:
+    """Создание задач через API при включенной групповой фиксации"""
+
+    def test_create_endpoint_uses_writer(self, monkeypatch, setup_database, clean_database):
+        async def scenario(writer):
+            monkeypatch.setattr(group_commit, "task_group_commit", writer)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    *(client.post("/api/v1/tasks/", json={"title": f"Задача {i}"}) for i in range(5)),
+                    client.post("/api/v1/tasks/", json={"title": "   "})
+                )
+
+        responses, stats = run_with_writer(scenario, interval=0.05)
+
+        assert [response.status_code for response in responses] == [201] * 5 + [400]
+        assert responses[0].json()["data"]["title"] == "Задача 0"
+        assert stats.batches == 1
+        assert stats.committed == 5
@@ -0,0 +1,121 @@
+"""
+Тесты проверок живости и готовности
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.core import health
+from app.core.health import ReadinessProbe
+from tests.conftest import async_engine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    clock = FakeClock()
+    probe = ReadinessProbe(async_engine, timeout=1.0, checkout_wait_threshold=1.0, cache_ttl=5.0, clock=clock)
+    monkeypatch.setattr(health, "readiness_probe", probe)
+    return probe
+
+
+class TestHealthProbes:
+    """Проверка /health/live и /health/ready"""
+
+    def test_liveness(self, client):
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+    def test_ready_reports_pool(self, client, probe):
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["error"] is None
+        assert data["checkout_wait"] >= 0
+        assert "async" in data["pools"]
+
+    def test_ready_result_is_cached(self, client, probe):
+        calls = []
+        ping = probe._ping
+
+        async def counting_ping(timings):
+            calls.append(1)
+            await ping(timings)
+
+        probe._ping = counting_ping
+
+        client.get("/health/ready")
+        client.get("/health/ready")
+        assert len(calls) == 1
+
+        probe.clock.now += 10
+        client.get("/health/ready")
+        assert len(calls) == 2
+
+    def test_not_ready_on_timeout(self, client, probe):
+        async def slow_ping(timings):
+            await asyncio.sleep(5)
+
+        probe.timeout = 0.05
+        probe._ping = slow_ping
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+        assert "0.05" in response.json()["error"]
+
+    def test_not_ready_on_slow_checkout(self, client, probe):
+        probe.checkout_wait_threshold = 0.0
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert "Ожидание соединения" in response.json()["error"]
+
+    def test_not_ready_on_database_error(self, client, probe):
+        probe.query = "SELECT * FROM missing_table"
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert "OperationalError" in response.json()["error"]
+
+    def test_not_ready_when_database_locked(self, probe, setup_database):
+        probe.timeout = 0.2
+        locker = sqlite3.connect("test.db", isolation_level=None)
+
+        async def check_locked():
+            locker.execute("BEGIN EXCLUSIVE")
+            try:
+                start = time.perf_counter()
+                result = await probe.check()
+                elapsed = time.perf_counter() - start
+            finally:
+                locker.execute("ROLLBACK")
+            # Зависшая проверка завершается после снятия блокировки
+            await asyncio.wait({probe._pending})
+            return result, elapsed
+
+        try:
+            result, elapsed = asyncio.run(check_locked())
+        finally:
+            locker.close()
+
+        assert result.ready is False
+        assert "0.2" in result.error
+        assert elapsed < 1.0
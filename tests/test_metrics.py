@@ -0,0 +1,92 @@
+"""
+Тесты метрик Prometheus
+"""
+
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.core.database import install_query_metrics
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+
+
+class TestMetricPrimitives:
+    """Проверка счетчиков, гистограмм и текстового формата"""
+
+    def test_histogram_render_is_cumulative(self):
+        histogram = Histogram("latency_seconds", "Задержка", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, ("/tasks",))
+
+        registry = MetricsRegistry()
+        registry.register(histogram)
+        lines = registry.render().splitlines()
+
+        assert lines[:2] == ["# HELP latency_seconds Задержка", "# TYPE latency_seconds histogram"]
+        assert lines[2:] == [
+            'latency_seconds_bucket{route="/tasks",le="0.1"} 2',
+            'latency_seconds_bucket{route="/tasks",le="1.0"} 3',
+            'latency_seconds_bucket{route="/tasks",le="+Inf"} 4',
+            'latency_seconds_sum{route="/tasks"} 3.65',
+            'latency_seconds_count{route="/tasks"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("requests_total", "Запросы", ("path",))
+        counter.inc(('a"b\\c',))
+
+        assert list(counter.render()) == ['requests_total{path="a\\"b\\\\c"} 1']
+
+    def test_counter_sums_thread_shards(self):
+        counter = Counter("ops_total", "Операции", ("kind",))
+
+        def work():
+            for _ in range(10000):
+                counter.inc(("write",))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.values() == {("write",): 80000}
+
+    def test_query_metrics_by_operation(self):
+        histogram = Histogram("queries_seconds", "Запросы", ("engine", "operation"))
+        engine = create_engine("sqlite://")
+        install_query_metrics(engine, "test", histogram)
+
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+            conn.execute(text("SELECT x FROM t"))
+            conn.execute(text("WITH q AS (SELECT 1) SELECT * FROM q"))
+
+        counts = {labels: sum(series[:-1]) for labels, series in histogram.values().items()}
+        assert counts == {
+            ("test", "other"): 1,
+            ("test", "INSERT"): 1,
+            ("test", "SELECT"): 1,
+            ("test", "WITH"): 1,
+        }
+
+
+class TestMetricsEndpoint:
+    """Проверка GET /metrics"""
+
+    def test_request_latency_by_route_and_status(self, client, setup_database, clean_database):
+        task_id = client.post("/api/v1/tasks/", json={"title": "Метрики"}).json()["data"]["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+        client.get("/api/v1/tasks/00000000-0000-0000-0000-000000000000")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert 'route="/api/v1/tasks/{task_id}",status="200"' in body
+        assert 'route="/api/v1/tasks/{task_id}",status="404"' in body
+        assert 'http_request_duration_seconds_count{method="POST",route="/api/v1/tasks/",status="201"}' in body
+        assert "# TYPE db_query_duration_seconds histogram" in body
+        assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
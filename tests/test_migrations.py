@@ -0,0 +1,193 @@
+"""
+Тесты миграций Alembic на базе, созданной исходной версией приложения
+"""
+
+import argparse
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import create_tables
+from app.models.task import utcnow
+from app.models.task_rollup import RollupGranularity
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Схема tasks исходной версии (create_all без миграций): ID строками,
+# временные метки server_default CURRENT_TIMESTAMP без микросекунд
+# (задачи фикстуры созданы в одну секунду)
+BASELINE_SCHEMA = """
+CREATE TABLE tasks (
+    id VARCHAR(36) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    status VARCHAR(11) NOT NULL,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (id)
+)
+"""
+
+
+@pytest.fixture
+def baseline_database(tmp_path):
+    """Файл SQLite со схемой и задачами исходной версии; возвращает URL и ID задач"""
+    url = f"sqlite:///{tmp_path / 'baseline.db'}"
+    task_ids = [str(uuid.uuid4()) for _ in range(4)]
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(BASELINE_SCHEMA))
+        for i, task_id in enumerate(task_ids):
+            conn.execute(
+                text(
+                    "INSERT INTO tasks (id, title, description, status, created_at, updated_at) "
+                    "VALUES (:id, :title, NULL, :status, '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+                ),
+                {"id": task_id, "title": f"Задача {i}", "status": "COMPLETED" if i % 2 else "CREATED"},
+            )
+    engine.dispose()
+    return url, task_ids
+
+
+def alembic_config(url: str) -> Config:
+    """Конфигурация Alembic без alembic.ini (не перенастраивает логирование тестов)"""
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.cmd_opts = argparse.Namespace(x=[f"url={url}"])
+    return config
+
+
+def query(url: str, sql: str) -> list:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(sql)).all()
+    finally:
+        engine.dispose()
+
+
+class TestBinaryTaskIds:
+    """Перевод ID в BLOB выполняется только при UUID_STORAGE=binary"""
+
+    def test_default_storage_keeps_string_ids(self, baseline_database):
+        url, task_ids = baseline_database
+
+        command.upgrade(alembic_config(url), "0001_binary_task_ids")
+
+        rows = query(url, "SELECT id, typeof(id) FROM tasks")
+        assert sorted(rows) == sorted((task_id, "text") for task_id in task_ids)
+
+    def test_binary_storage_round_trip(self, baseline_database, monkeypatch):
+        url, task_ids = baseline_database
+        monkeypatch.setattr(settings, "uuid_storage", "binary")
+
+        command.upgrade(alembic_config(url), "0001_binary_task_ids")
+        assert {row[0] for row in query(url, "SELECT typeof(id) FROM tasks")} == {"blob"}
+
+        command.downgrade(alembic_config(url), "base")
+        assert sorted(row[0] for row in query(url, "SELECT id FROM tasks")) == sorted(task_ids)
+
+
+class TestUpgradeFromBaseline:
+    """alembic upgrade head на базе исходной версии, затем запуск приложения"""
+
+    def test_upgrade_head_then_startup(self, baseline_database):
+        url, task_ids = baseline_database
+
+        command.upgrade(alembic_config(url), "head")
+        assert query(url, "SELECT DISTINCT change_seq FROM tasks") == [(1,)]
+
+        # Остальные таблицы, триггеры и начальные значения создает приложение при запуске
+        engine = create_engine(url)
+        try:
+            create_tables(engine)
+            with Session(engine) as db:
+                repository = TaskRepository(db)
+                assert repository.get_by_id(uuid.UUID(task_ids[0])).title == "Задача 0"
+                assert repository.get_count() == 4
+                assert repository.get_change_bounds()[0] == 1
+
+                assert repository.delete(uuid.UUID(task_ids[0])) is True
+                assert len(repository.archive_completed(utcnow() + timedelta(seconds=1), 100)) == 2
+                assert repository.get_count(include_archived=True) == 3
+        finally:
+            engine.dispose()
+
+        assert [row[0] for row in query(url, "SELECT id FROM task_tombstones")] == [task_ids[0]]
+
+    def test_downgrade_to_baseline(self, baseline_database):
+        url, task_ids = baseline_database
+        command.upgrade(alembic_config(url), "head")
+        engine = create_engine(url)
+        try:
+            create_tables(engine)
+            with Session(engine) as db:
+                TaskRepository(db).archive_completed(utcnow() + timedelta(seconds=1), 100)
+        finally:
+            engine.dispose()
+
+        command.downgrade(alembic_config(url), "base")
+
+        assert sorted(row[0] for row in query(url, "SELECT id FROM tasks")) == sorted(task_ids)
+        assert query(url, "SELECT name FROM sqlite_master WHERE name IN ('tasks_archive', 'task_tombstones')") == []
+
+    def test_cursor_pages_legacy_timestamps(self, baseline_database):
+        url, task_ids = baseline_database
+        command.upgrade(alembic_config(url), "head")
+        assert {row[0] for row in query(url, "SELECT created_at FROM tasks")} == {"2026-01-01 00:00:00.000000"}
+
+        engine = create_engine(url)
+        try:
+            create_tables(engine)
+            with Session(engine) as db:
+                service = TaskService(TaskRepository(db))
+                seen, cursor = [], None
+                while True:
+                    page = service.get_tasks(limit=1, cursor=cursor)
+                    seen.extend(str(task.id) for task in page.tasks)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+        finally:
+            engine.dispose()
+
+        assert sorted(seen) == sorted(task_ids)
+
+    def test_rollup_buckets_normalized(self, baseline_database):
+        url, task_ids = baseline_database
+        command.upgrade(alembic_config(url), "0005_normalize_timestamps")
+        engine = create_engine(url)
+        try:
+            create_tables(engine)
+            # Агрегаты в формате предыдущей версии
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE task_rollups SET bucket_start = substr(bucket_start, 1, 19)"))
+
+            command.upgrade(alembic_config(url), "head")
+
+            with Session(engine) as db:
+                service = TaskService(TaskRepository(db))
+                since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+                db.execute(
+                    text("INSERT INTO tasks (id, title, status, created_at, updated_at, change_seq) "
+                         "VALUES (:id, 'Новая', 'CREATED', '2026-01-01 00:30:00.000000', "
+                         "'2026-01-01 00:30:00.000000', 1)"),
+                    {"id": str(uuid.uuid4())},
+                )
+                db.commit()
+                stats = service.get_stats(RollupGranularity.DAY, since=since, until=since + timedelta(days=1))
+        finally:
+            engine.dispose()
+
+        assert [(bucket.created, bucket.completed) for bucket in stats.buckets] == [(5, 2)]
+        assert {row[0] for row in query(url, "SELECT length(bucket_start) FROM task_rollups")} == {26}
@@ -0,0 +1,67 @@
+"""
+Тесты пагинации списка задач (offset и keyset-курсор)
+"""
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+class TestKeysetPagination:
+    """Тесты курсорной пагинации GET /api/v1/tasks"""
+
+    def _create_tasks(self, client, count, status="created"):
+        return [
+            client.post("/api/v1/tasks/", json={"title": f"Задача {i}", "status": status}).json()["data"]["id"]
+            for i in range(count)
+        ]
+
+    def test_cursor_pages_cover_all_tasks(self, client, setup_database, clean_database):
+        """Проход по курсорам возвращает все задачи по одному разу и по порядку"""
+        created = self._create_tasks(client, 5)
+
+        seen = []
+        response = client.get("/api/v1/tasks/", params={"limit": 2})
+        while True:
+            data = response.json()["data"]
+            seen.extend(task["id"] for task in data["tasks"])
+            if not data["next_cursor"]:
+                break
+            response = client.get("/api/v1/tasks/", params={"limit": 2, "cursor": data["next_cursor"]})
+
+        assert seen == created
+
+    def test_cursor_with_status_filter(self, client, setup_database, clean_database):
+        """Курсор работает вместе с фильтром по статусу"""
+        self._create_tasks(client, 3, status="created")
+        completed = self._create_tasks(client, 3, status="completed")
+
+        first = client.get("/api/v1/tasks/", params={"limit": 2, "task_status": "completed"}).json()["data"]
+        second = client.get(
+            "/api/v1/tasks/",
+            params={"limit": 2, "task_status": "completed", "cursor": first["next_cursor"]}
+        ).json()["data"]
+
+        assert [t["id"] for t in first["tasks"] + second["tasks"]] == completed
+        assert second["next_cursor"] is None
+
+    def test_offset_mode_still_supported(self, client, setup_database, clean_database):
+        """Offset-пагинация сохранена для обратной совместимости"""
+        created = self._create_tasks(client, 4)
+
+        data = client.get("/api/v1/tasks/", params={"limit": 2, "offset": 2}).json()["data"]
+
+        assert [t["id"] for t in data["tasks"]] == created[2:]
+        assert data["total"] == 4
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor(self, client, setup_database, clean_database):
+        """Некорректный курсор возвращает 400"""
+        response = client.get("/api/v1/tasks/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    def test_cursor_roundtrip(self):
+        """Курсор декодируется в исходную позицию"""
+        from datetime import datetime
+        from uuid import uuid4
+
+        position = (datetime(2024, 1, 2, 3, 4, 5, 678901), uuid4())
+        assert decode_cursor(encode_cursor(*position)) == position
@@ -0,0 +1,57 @@
+"""
+Тесты быстрой сериализации списков задач
+"""
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+
+from app.models.task import Task
+from app.schemas.task import TASK_LIST_ADAPTER, APIResponse, TaskResponse
+from tests.conftest import TestingSessionLocal
+
+
+def encoded_by_response_model(body: dict) -> bytes:
+    """Тело, которое FastAPI построил бы через response_model=APIResponse"""
+    return JSONResponse(jsonable_encoder(APIResponse.model_validate(body))).body
+
+
+class TestFastSerialization:
+    """Ответы списков совпадают с ответами через response_model"""
+
+    def _create(self, client):
+        client.post("/api/v1/tasks/", json={"title": "Отчет", "description": "Квартальный \"итог\""})
+        client.post("/api/v1/tasks/", json={"title": "Без описания", "status": "in_progress"})
+        client.post("/api/v1/tasks/", json={"title": "Готово", "status": "completed"})
+
+    def test_adapter_matches_model_validate(self, client, setup_database, clean_database):
+        self._create(client)
+
+        db = TestingSessionLocal()
+        try:
+            rows = db.scalars(select(Task)).all()
+            assert TASK_LIST_ADAPTER.validate_python(rows, from_attributes=True) == [
+                TaskResponse.model_validate(task) for task in rows
+            ]
+        finally:
+            db.close()
+
+    def test_list_body_is_identical(self, client, setup_database, clean_database):
+        self._create(client)
+
+        for params in ({}, {"limit": 2}, {"status": "completed", "include_total": False}):
+            response = client.get("/api/v1/tasks/", params=params)
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert "ETag" in response.headers
+            assert response.content == encoded_by_response_model(response.json())
+
+    def test_search_body_is_identical(self, client, setup_database, clean_database):
+        self._create(client)
+
+        response = client.get("/api/v1/tasks/search", params={"q": "отчет"})
+
+        assert response.status_code == 200
+        assert response.json()["data"]["total"] == 1
+        assert response.content == encoded_by_response_model(response.json())
@@ -0,0 +1,53 @@
+"""
+Тесты количества SQL-запросов на операциях записи
+"""
+
+import uuid
+
+import pytest
+
+from tests.conftest import count_statements
+
+
+class TestWriteStatementCount:
+    """Каждая операция записи выполняет не более двух запросов"""
+
+    @pytest.fixture
+    def task_id(self, client, setup_database, clean_database):
+        return client.post("/api/v1/tasks/", json={"title": "Задача"}).json()["data"]["id"]
+
+    def test_create(self, client, setup_database, clean_database):
+        with count_statements() as statements:
+            response = client.post("/api/v1/tasks/", json={"title": "Задача"})
+
+        assert response.status_code == 201
+        assert len(statements) <= 2, statements
+
+    def test_update(self, client, task_id):
+        with count_statements() as statements:
+            response = client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "completed"
+        assert len(statements) <= 2, statements
+
+    def test_update_not_found(self, client, task_id):
+        with count_statements() as statements:
+            response = client.put(f"/api/v1/tasks/{uuid.uuid4()}", json={"status": "completed"})
+
+        assert response.status_code == 404
+        assert len(statements) <= 2, statements
+
+    def test_delete(self, client, task_id):
+        with count_statements() as statements:
+            response = client.delete(f"/api/v1/tasks/{task_id}")
+
+        assert response.status_code == 204
+        assert len(statements) <= 2, statements
+
+    def test_delete_not_found(self, client, task_id):
+        with count_statements() as statements:
+            response = client.delete(f"/api/v1/tasks/{uuid.uuid4()}")
+
+        assert response.status_code == 404
+        assert len(statements) <= 2, statements
@@ -0,0 +1,112 @@
+"""
+Тесты архивации завершенных задач (tasks_archive)
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.task import utcnow
+from app.models.task_archive import TaskArchive
+from app.models.task_change import TaskTombstone
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
+from tests.conftest import TestingSessionLocal
+
+
+def create_tasks(client, statuses: list) -> list:
+    items = [{"title": f"Задача {i}", "status": status} for i, status in enumerate(statuses)]
+    response = client.post("/api/v1/tasks/bulk", json={"items": items})
+    return [result["data"] for result in response.json()["data"]["results"]]
+
+
+def archive(batch_size: int = 1000) -> int:
+    with TestingSessionLocal() as db:
+        return TaskService(TaskRepository(db)).archive_tasks(utcnow() + timedelta(seconds=1), batch_size=batch_size)
+
+
+@pytest.mark.usefixtures("setup_database", "clean_database")
+class TestTaskArchive:
+    """Перенос задач в архив, чтение архивных задач и неизменность статистики"""
+
+    def test_archive_moves_only_completed_tasks(self, client):
+        tasks = create_tasks(client, ["completed", "created", "completed", "in_progress", "completed"])
+
+        assert archive(batch_size=2) == 3
+
+        with TestingSessionLocal() as db:
+            archived = set(str(task_id) for task_id in db.scalars(select(TaskArchive.id)))
+        assert archived == {tasks[0]["id"], tasks[2]["id"], tasks[4]["id"]}
+        assert [task["id"] for task in client.get("/api/v1/tasks/").json()["data"]["tasks"]] == [tasks[1]["id"], tasks[3]["id"]]
+
+        # Повторный запуск ничего не переносит
+        assert archive() == 0
+
+    def test_policy_keeps_recent_tasks(self, client):
+        create_tasks(client, ["completed"])
+
+        with TestingSessionLocal() as db:
+            assert TaskRepository(db).archive_completed(utcnow() - timedelta(days=1), 100) == []
+
+    def test_get_falls_back_to_archive(self, client):
+        task = create_tasks(client, ["completed"])[0]
+        archive()
+
+        response = client.get(f"/api/v1/tasks/{task['id']}")
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == task["title"]
+
+        response = client.get(f"/api/v1/tasks/{task['id']}", params={"fields": "id,status"})
+        assert response.json()["data"] == {"id": task["id"], "status": "completed"}
+
+    def test_list_with_archived(self, client):
+        tasks = create_tasks(client, ["completed", "created", "completed"])
+        archive()
+        tasks.append(create_tasks(client, ["completed"])[0])
+
+        data = client.get("/api/v1/tasks/", params={"include_archived": "true"}).json()["data"]
+        assert [task["id"] for task in data["tasks"]] == [task["id"] for task in tasks]
+        assert data["total"] == 4
+
+        data = client.get("/api/v1/tasks/", params={"task_status": "completed"}).json()["data"]
+        assert data["total"] == 1
+
+        # Страницы по offset и по курсору сливают обе таблицы в одном порядке
+        params = {"include_archived": "true", "task_status": "completed", "limit": 2}
+        first = client.get("/api/v1/tasks/", params=params).json()["data"]
+        second = client.get("/api/v1/tasks/", params={**params, "offset": 2}).json()["data"]
+        assert [task["id"] for task in first["tasks"] + second["tasks"]] == [tasks[0]["id"], tasks[2]["id"], tasks[3]["id"]]
+        assert first["total"] == 3
+        by_cursor = client.get("/api/v1/tasks/", params={**params, "cursor": first["next_cursor"]}).json()["data"]
+        assert by_cursor["tasks"] == second["tasks"]
+
+    def test_stats_are_unchanged(self, client):
+        create_tasks(client, ["completed", "created", "completed"])
+        before = client.get("/api/v1/tasks/stats").json()["data"]
+
+        archive()
+
+        assert client.get("/api/v1/tasks/stats").json()["data"] == before
+        with TestingSessionLocal() as db:
+            repository = TaskRepository(db)
+            repository.rebuild_counters()
+            repository.rebuild_rollups()
+        assert client.get("/api/v1/tasks/stats").json()["data"] == before
+
+    def test_archived_task_is_read_only(self, client):
+        task = create_tasks(client, ["completed"])[0]
+        archive()
+
+        assert client.put(f"/api/v1/tasks/{task['id']}", json={"title": "Новое"}).status_code == 409
+        assert client.delete(f"/api/v1/tasks/{task['id']}").status_code == 409
+        assert client.delete("/api/v1/tasks/00000000-0000-0000-0000-000000000000").status_code == 404
+
+    def test_archive_does_not_write_tombstones(self, client):
+        tasks = create_tasks(client, ["completed", "created"])
+        archive()
+        client.delete(f"/api/v1/tasks/{tasks[1]['id']}")
+
+        with TestingSessionLocal() as db:
+            assert [str(task_id) for task_id in db.scalars(select(TaskTombstone.id))] == [tasks[1]["id"]]
+            assert db.scalar(select(func.count()).select_from(TaskArchive)) == 1
@@ -0,0 +1,94 @@
+"""
+Тесты кэша задач
+"""
+
+import pytest
+
+from app.core import cache
+from app.core.cache import LRUCache
+from tests.conftest import count_statements
+
+
+class FakeClock:
+    """Управляемые часы для проверки TTL"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    """Проверка LRU-кэша"""
+
+    def test_hit_and_miss(self):
+        lru = LRUCache(max_size=10, ttl=10)
+        assert lru.get("a") is None
+        lru.set("a", 1)
+        assert lru.get("a") == 1
+
+        stats = lru.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_ratio == 0.5
+
+    def test_ttl_expiration(self):
+        clock = FakeClock()
+        lru = LRUCache(max_size=10, ttl=5, clock=clock)
+        lru.set("a", 1)
+
+        clock.now = 5
+        assert lru.get("a") is None
+        assert lru.stats().expirations == 1
+
+    def test_lru_eviction(self):
+        lru = LRUCache(max_size=2, ttl=10)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("b") is None
+        assert lru.get("a") == 1
+        assert lru.stats().evictions == 1
+
+
+class TestTaskCacheIntegration:
+    """Кэширование GET /api/v1/tasks/{id} и инвалидация при записи"""
+
+    @pytest.fixture
+    def task_cache(self, monkeypatch):
+        lru = LRUCache(max_size=100, ttl=60)
+        monkeypatch.setattr(cache, "task_cache", lru)
+        return lru
+
+    def test_second_read_served_from_cache(self, client, setup_database, clean_database, task_cache):
+        task_id = client.post("/api/v1/tasks/", json={"title": "Горячая задача"}).json()["data"]["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+
+        with count_statements() as statements:
+            response = client.get(f"/api/v1/tasks/{task_id}")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["title"] == "Горячая задача"
+        assert statements == []
+        assert task_cache.stats().hits == 1
+
+    def test_update_invalidates(self, client, setup_database, clean_database, task_cache):
+        task_id = client.post("/api/v1/tasks/", json={"title": "Задача"}).json()["data"]["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+
+        assert client.get(f"/api/v1/tasks/{task_id}").json()["data"]["status"] == "completed"
+
+    def test_delete_invalidates(self, client, setup_database, clean_database, task_cache):
+        task_id = client.post("/api/v1/tasks/", json={"title": "Задача"}).json()["data"]["id"]
+        client.get(f"/api/v1/tasks/{task_id}")
+
+        client.delete(f"/api/v1/tasks/{task_id}")
+
+        assert client.get(f"/api/v1/tasks/{task_id}").status_code == 404
+
+    def test_health_reports_cache_stats(self, client, task_cache):
+        assert client.get("/health").json()["cache"]["size"] == 0
@@ -0,0 +1,173 @@
+"""
+Тесты очереди задач: захват, продление аренды и возврат в очередь
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.task import TaskStatus, utcnow
+from app.repositories.task_repository import TaskRepository
+from app.schemas.task import TaskCreate
+from app.services.lease_reaper import LeaseReaper
+from tests.conftest import AsyncTestingSessionLocal, TestingSessionLocal
+
+
+def create_tasks(client, count: int) -> list:
+    response = client.post("/api/v1/tasks/bulk", json={"items": [{"title": f"Задача {i}"} for i in range(count)]})
+    return [result["data"] for result in response.json()["data"]["results"]]
+
+
+def claim(client, n: int, owner: str, **params) -> list:
+    response = client.post("/api/v1/tasks/claim", params={"n": n, "owner": owner, **params})
+    assert response.status_code == 200
+    return response.json()["data"]["tasks"]
+
+
+def expire_leases() -> None:
+    """Сдвиг срока всех аренд в прошлое"""
+    with TestingSessionLocal() as db:
+        repository = TaskRepository(db)
+        for task in repository.get_all(status=TaskStatus.IN_PROGRESS):
+            task.lease_expires_at = utcnow() - timedelta(seconds=1)
+        db.commit()
+
+
+@pytest.mark.usefixtures("setup_database", "clean_database")
+class TestTaskClaim:
+    """Атомарный захват задач исполнителями"""
+
+    def test_claim_moves_tasks_to_in_progress(self, client):
+        tasks = create_tasks(client, 3)
+
+        before = utcnow()
+        claimed = claim(client, 2, "worker-1", lease=60)
+
+        assert [task["id"] for task in claimed] == [task["id"] for task in tasks[:2]]
+        assert all(task["status"] == "in_progress" and task["lease_owner"] == "worker-1" for task in claimed)
+        expires_at = datetime.fromisoformat(claimed[0]["lease_expires_at"])
+        assert timedelta(seconds=59) < expires_at.replace(tzinfo=before.tzinfo) - before < timedelta(seconds=61)
+
+        assert [task["id"] for task in claim(client, 5, "worker-2")] == [tasks[2]["id"]]
+        assert claim(client, 5, "worker-3") == []
+
+    def test_claim_skips_tasks_in_other_statuses(self, client):
+        tasks = create_tasks(client, 3)
+        client.put(f"/api/v1/tasks/{tasks[0]['id']}", json={"status": "completed"})
+        client.put(f"/api/v1/tasks/{tasks[1]['id']}", json={"status": "in_progress"})
+
+        assert [task["id"] for task in claim(client, 3, "worker")] == [tasks[2]["id"]]
+
+    def test_claim_validation(self, client):
+        assert client.post("/api/v1/tasks/claim", params={"n": 0, "owner": "w"}).status_code == 422
+        assert client.post("/api/v1/tasks/claim", params={"n": 1}).status_code == 422
+        assert client.post("/api/v1/tasks/claim", params={"n": 1, "owner": " "}).status_code == 400
+
+    def test_concurrent_claims_do_not_overlap(self):
+        with TestingSessionLocal() as db:
+            TaskRepository(db).bulk_insert([TaskCreate(title=f"Задача {i}") for i in range(200)])
+
+        claimed, errors = [], []
+
+        def worker(owner: str) -> None:
+            try:
+                with TestingSessionLocal() as db:
+                    repository = TaskRepository(db)
+                    while True:
+                        tasks = repository.claim(3, owner, utcnow() + timedelta(minutes=1))
+                        if not tasks:
+                            return
+                        claimed.extend((task.id, owner) for task in tasks)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(f"worker-{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(claimed) == 200
+        assert len({task_id for task_id, _ in claimed}) == 200
+
+
+@pytest.mark.usefixtures("setup_database", "clean_database")
+class TestTaskLease:
+    """Продление аренды и возврат задач с истекшей арендой в очередь"""
+
+    def test_renew_lease(self, client):
+        create_tasks(client, 1)
+        task = claim(client, 1, "worker", lease=10)[0]
+
+        response = client.post(f"/api/v1/tasks/{task['id']}/lease", params={"owner": "worker", "lease": 600})
+
+        assert response.status_code == 200
+        renewed = response.json()["data"]
+        assert renewed["lease_expires_at"] > task["lease_expires_at"]
+        # Продление не меняет версию задачи
+        assert renewed["updated_at"] == task["updated_at"]
+
+    def test_renew_lease_conflicts(self, client):
+        create_tasks(client, 1)
+        task = claim(client, 1, "worker")[0]
+
+        other = client.post(f"/api/v1/tasks/{task['id']}/lease", params={"owner": "other"})
+        missing = client.post(
+            "/api/v1/tasks/00000000-0000-0000-0000-000000000000/lease", params={"owner": "worker"}
+        )
+        expire_leases()
+        expired = client.post(f"/api/v1/tasks/{task['id']}/lease", params={"owner": "worker"})
+
+        assert other.status_code == 409
+        assert missing.status_code == 404
+        assert expired.status_code == 409
+
+    def test_reaper_returns_expired_tasks_to_queue(self, client):
+        tasks = create_tasks(client, 3)
+        claim(client, 2, "worker")
+        expire_leases()
+        claim(client, 1, "live")
+
+        reaper = LeaseReaper(AsyncTestingSessionLocal, batch_size=1)
+        released = asyncio.run(reaper.run_once())
+
+        assert released == 2
+        assert reaper.stats().released == 2
+        statuses = {task["id"]: client.get(f"/api/v1/tasks/{task['id']}").json()["data"]["status"] for task in tasks}
+        assert statuses == {tasks[0]["id"]: "created", tasks[1]["id"]: "created", tasks[2]["id"]: "in_progress"}
+
+        # Возвращенные задачи снова доступны для захвата
+        assert [task["id"] for task in claim(client, 5, "next")] == [task["id"] for task in tasks[:2]]
+
+    def test_status_change_clears_lease(self, client):
+        tasks = create_tasks(client, 2)
+        claim(client, 2, "worker", lease=0.5)
+
+        # Клиент завершает задачи и снова переводит их в работу: через PUT и массово
+        client.put(f"/api/v1/tasks/{tasks[0]['id']}", json={"status": "completed"})
+        client.put(f"/api/v1/tasks/{tasks[0]['id']}", json={"status": "in_progress"})
+        client.patch("/api/v1/tasks/bulk", json={"items": [{"id": tasks[1]["id"], "status": "completed"}]})
+        client.patch("/api/v1/tasks/bulk", json={"items": [{"id": tasks[1]["id"], "status": "in_progress"}]})
+        time.sleep(1)
+
+        assert asyncio.run(LeaseReaper(AsyncTestingSessionLocal).run_once()) == 0
+        with TestingSessionLocal() as db:
+            leases = {(task.status, task.lease_owner, task.lease_expires_at) for task in TaskRepository(db).get_all()}
+        assert leases == {(TaskStatus.IN_PROGRESS, None, None)}
+
+    def test_reaper_start_stop(self):
+        async def scenario():
+            reaper = LeaseReaper(AsyncTestingSessionLocal, interval=0.01)
+            reaper.start()
+            await asyncio.sleep(0.05)
+            await reaper.stop()
+            return reaper.stats()
+
+        stats = asyncio.run(scenario())
+
+        assert stats.runs >= 1
+        assert stats.errors == 0
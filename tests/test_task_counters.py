@@ -0,0 +1,87 @@
+"""
+Тесты счетчиков задач по статусам
+"""
+
+from sqlalchemy import delete, event, update
+
+from app.core.database import Base
+from app.models.task import TaskStatus
+from app.models.task_counter import SEED_COUNTERS_SQL, TaskCounter
+from app.repositories.task_repository import TaskRepository
+from tests.conftest import TestingSessionLocal, engine
+
+
+class TestTaskCounters:
+    """Проверка поддержки счетчиков при записи и их пересчета"""
+
+    def _total(self, client, **params):
+        return client.get("/api/v1/tasks/", params=params).json()["data"]["total"]
+
+    def test_counters_follow_writes(self, client, setup_database, clean_database):
+        """Создание, смена статуса и удаление обновляют total"""
+        first = client.post("/api/v1/tasks/", json={"title": "Первая"}).json()["data"]["id"]
+        client.post("/api/v1/tasks/", json={"title": "Вторая"})
+
+        assert self._total(client) == 2
+        assert self._total(client, task_status="created") == 2
+
+        client.put(f"/api/v1/tasks/{first}", json={"status": "completed"})
+        assert self._total(client, task_status="created") == 1
+        assert self._total(client, task_status="completed") == 1
+
+        client.put(f"/api/v1/tasks/{first}", json={"title": "Без смены статуса"})
+        assert self._total(client, task_status="completed") == 1
+
+        client.delete(f"/api/v1/tasks/{first}")
+        assert self._total(client) == 1
+        assert self._total(client, task_status="completed") == 0
+
+    def test_include_total_false(self, client, setup_database, clean_database):
+        """include_total=false не возвращает общее количество"""
+        client.post("/api/v1/tasks/", json={"title": "Задача"})
+
+        response = client.get("/api/v1/tasks/", params={"include_total": "false"})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] is None
+        assert len(data["tasks"]) == 1
+
+    def test_rebuild_counters(self, client, setup_database, clean_database):
+        """Пересчет восстанавливает рассинхронизированные счетчики"""
+        for status in ("created", "created", "in_progress"):
+            client.post("/api/v1/tasks/", json={"title": "Задача", "status": status})
+
+        with TestingSessionLocal() as db:
+            db.execute(update(TaskCounter).values(count=100))
+            db.commit()
+
+            repository = TaskRepository(db)
+            counters = repository.rebuild_counters()
+
+            assert counters == {TaskStatus.CREATED: 2, TaskStatus.IN_PROGRESS: 1}
+            assert repository.get_count() == repository.get_exact_count() == 3
+
+    def test_create_all_seeds_only_empty_counters(self, client, setup_database, clean_database):
+        """Повторный create_all не пересчитывает tasks, пока счетчики заполнены"""
+        for status in ("created", "completed"):
+            client.post("/api/v1/tasks/", json={"title": "Задача", "status": status})
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            Base.metadata.create_all(bind=engine)
+            assert SEED_COUNTERS_SQL not in statements
+
+            with TestingSessionLocal() as db:
+                db.execute(delete(TaskCounter))
+                db.commit()
+            Base.metadata.create_all(bind=engine)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        with TestingSessionLocal() as db:
+            assert TaskRepository(db).get_count() == 2
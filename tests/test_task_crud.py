@@ -30,6 +30,14 @@ class TestTaskCRUD:
         assert data["data"]["status"] == TaskStatus.CREATED.value
         assert "id" in data["data"]
         
+    def test_create_task_returns_stored_timestamps(self, client, setup_database, clean_database):
+        """Ответ на создание содержит временные метки в том же виде, что и чтение задачи"""
+        created = client.post("/api/v1/tasks/", json={"title": "Задача"}).json()["data"]
+        
+        fetched = client.get(f"/api/v1/tasks/{created['id']}").json()["data"]
+        
+        assert (created["created_at"], created["updated_at"]) == (fetched["created_at"], fetched["updated_at"])
+        
     def test_create_task_without_description(self, client, setup_database, clean_database):
         """Тест создания задачи без описания"""
         task_data = {
@@ -0,0 +1,87 @@
+"""
+Тесты потоковой выгрузки задач
+"""
+
+import csv
+import io
+import json
+import os
+import resource
+import sqlite3
+import uuid
+
+import pytest
+
+from app.repositories.task_repository import AsyncTaskRepository
+from app.services.task_export import ExportFormat
+from app.services.task_service import AsyncTaskService
+from tests.conftest import AsyncTestingSessionLocal
+
+# Размер таблицы для проверки памяти; для полного прогона: TASK_EXPORT_TEST_ROWS=1000000
+EXPORT_TEST_ROWS = int(os.environ.get("TASK_EXPORT_TEST_ROWS", "100000"))
+
+
+class TestTaskExport:
+    """Проверка форматов GET /api/v1/tasks/export"""
+
+    def _create(self, client, title, status="created"):
+        client.post("/api/v1/tasks/", json={"title": title, "status": status, "description": "a,b\n\"c\""})
+
+    def test_ndjson_export(self, client, setup_database, clean_database):
+        for i in range(3):
+            self._create(client, f"Задача {i}")
+
+        response = client.get("/api/v1/tasks/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["title"] for row in rows] == ["Задача 0", "Задача 1", "Задача 2"]
+        assert rows[0]["description"] == "a,b\n\"c\""
+
+    def test_csv_export_with_status(self, client, setup_database, clean_database):
+        self._create(client, "Новая")
+        self._create(client, "Готовая", status="completed")
+
+        response = client.get("/api/v1/tasks/export", params={"format": "csv", "status": "completed"})
+
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["title"] for row in rows] == ["Готовая"]
+        assert rows[0]["status"] == "completed"
+        assert rows[0]["description"] == "a,b\n\"c\""
+
+    def test_empty_csv_has_header(self, client, setup_database, clean_database):
+        response = client.get("/api/v1/tasks/export", params={"format": "csv"})
+
+        assert response.text.strip() == "id,title,description,status,created_at,updated_at"
+
+
+@pytest.mark.asyncio
+async def test_export_memory_is_bounded(setup_database, clean_database):
+    """Выгрузка большой таблицы не увеличивает пиковый RSS пропорционально числу строк"""
+    with sqlite3.connect("./test.db") as connection:
+        connection.executemany(
+            "INSERT INTO tasks (id, title, description, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'CREATED', ?, ?)",
+            (
+                (str(uuid.uuid4()), f"task {i}", "x" * 200, f"2024-01-01 00:00:00.{i % 1000000:06d}",
+                 "2024-01-01 00:00:00.000000")
+                for i in range(EXPORT_TEST_ROWS)
+            )
+        )
+
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    exported_bytes = lines = 0
+
+    async with AsyncTestingSessionLocal() as db:
+        service = AsyncTaskService(AsyncTaskRepository(db))
+        async for chunk in service.export_tasks(ExportFormat.NDJSON):
+            exported_bytes += len(chunk)
+            lines += chunk.count(b"\n")
+
+    peak_growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before) / 1024
+
+    assert lines == EXPORT_TEST_ROWS
+    # Весь результат занимает сотни мегабайт на миллион строк; потоковая выгрузка - единицы
+    assert peak_growth_mb < 64, f"peak RSS grew by {peak_growth_mb:.1f} MB for {exported_bytes} bytes"
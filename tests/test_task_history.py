@@ -0,0 +1,135 @@
+"""
+Тесты истории задач и буфера событий
+"""
+
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.models.task import TaskStatus, utcnow
+from app.models.task_event import TaskEvent, TaskEventType
+from app.services import history
+from app.services.history import TaskHistoryBuffer
+from tests.conftest import TestingSessionLocal
+
+
+def stored_events():
+    db = TestingSessionLocal()
+    try:
+        return db.query(TaskEvent).order_by(TaskEvent.id).all()
+    finally:
+        db.close()
+
+
+class TestTaskHistoryApi:
+    """Проверка GET /api/v1/tasks/{id}/history"""
+
+    @pytest.fixture
+    def task_history(self, monkeypatch):
+        buffer = TaskHistoryBuffer(TestingSessionLocal, batch_size=1000, flush_interval=60)
+        monkeypatch.setattr(history, "task_history", buffer)
+        return buffer
+
+    def _history(self, client, task_id):
+        response = client.get(f"/api/v1/tasks/{task_id}/history")
+        assert response.status_code == 200
+        return [(e["event_type"], e["previous_status"], e["status"]) for e in response.json()["data"]["events"]]
+
+    def test_lifecycle_is_recorded(self, client, setup_database, clean_database, task_history):
+        task_id = client.post("/api/v1/tasks/", json={"title": "История"}).json()["data"]["id"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "in_progress"})
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Без смены статуса"})
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "in_progress"})
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+        client.delete(f"/api/v1/tasks/{task_id}")
+
+        expected = [
+            ("created", None, "created"),
+            ("status_changed", "created", "in_progress"),
+            ("status_changed", "in_progress", "completed"),
+            ("deleted", "completed", None),
+        ]
+        # До записи в базу история собирается из буфера, после - из task_events
+        assert self._history(client, task_id) == expected
+        assert stored_events() == []
+
+        assert task_history.flush() == 5
+        assert self._history(client, task_id) == expected
+        assert task_history.stats().flushes == 1
+
+    def test_bulk_operations_are_recorded(self, client, setup_database, clean_database, task_history):
+        created = client.post("/api/v1/tasks/bulk", json={"items": [{"title": "a"}, {"title": "b"}]}).json()
+        task_ids = [result["id"] for result in created["data"]["results"]]
+        client.patch("/api/v1/tasks/bulk", json={"items": [{"id": task_ids[0], "status": "completed"}]})
+        client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": task_ids})
+        task_history.flush()
+
+        assert [event[0] for event in self._history(client, task_ids[0])] == ["created", "status_changed", "deleted"]
+        assert [event[0] for event in self._history(client, task_ids[1])] == ["created", "deleted"]
+
+    def test_import_is_recorded(self, client, setup_database, clean_database, task_history):
+        client.post("/api/v1/tasks/import", content=b'{"title": "imported"}\n')
+
+        assert task_history.stats().recorded == 1
+
+    def test_events_ordered_by_time(self, client, setup_database, clean_database, task_history):
+        """Буферы воркеров сбрасываются в произвольном порядке: история упорядочена по времени событий"""
+        task_id = uuid.uuid4()
+        start = utcnow()
+        late = TaskHistoryBuffer(TestingSessionLocal, batch_size=1000)
+        late.record(task_id, TaskEventType.STATUS_CHANGED, TaskStatus.COMPLETED, start + timedelta(seconds=2))
+        late.flush()
+        early = TaskHistoryBuffer(TestingSessionLocal, batch_size=1000)
+        early.record(task_id, TaskEventType.CREATED, TaskStatus.CREATED, start)
+        early.flush()
+        task_history.record(task_id, TaskEventType.STATUS_CHANGED, TaskStatus.IN_PROGRESS, start + timedelta(seconds=1))
+
+        assert self._history(client, task_id) == [
+            ("created", None, "created"),
+            ("status_changed", "created", "in_progress"),
+            ("status_changed", "in_progress", "completed"),
+        ]
+
+    def test_unknown_task(self, client, setup_database, clean_database, task_history):
+        assert client.get(f"/api/v1/tasks/{uuid.uuid4()}/history").status_code == 404
+
+
+class TestTaskHistoryBuffer:
+    """Сброс буфера по размеру, по времени и при переполнении"""
+
+    def test_flush_by_size(self, setup_database, clean_database):
+        buffer = TaskHistoryBuffer(TestingSessionLocal, batch_size=3, flush_interval=60)
+        buffer.start()
+        try:
+            for _ in range(3):
+                buffer.record(uuid.uuid4(), TaskEventType.CREATED)
+            deadline = time.monotonic() + 5
+            while buffer.stats().flushed < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            buffer.stop()
+
+        assert len(stored_events()) == 3
+
+    def test_flush_by_interval_and_on_stop(self, setup_database, clean_database):
+        buffer = TaskHistoryBuffer(TestingSessionLocal, batch_size=1000, flush_interval=0.05)
+        buffer.start()
+        buffer.record(uuid.uuid4(), TaskEventType.CREATED)
+        time.sleep(0.3)
+        assert buffer.stats().flushed == 1
+
+        buffer.record(uuid.uuid4(), TaskEventType.DELETED)
+        buffer.stop()
+        assert len(stored_events()) == 2
+
+    def test_overflow_drops_oldest(self):
+        buffer = TaskHistoryBuffer(TestingSessionLocal, batch_size=1000, max_pending=2)
+        task_ids = [uuid.uuid4() for _ in range(3)]
+        for task_id in task_ids:
+            buffer.record(task_id, TaskEventType.CREATED)
+
+        assert buffer.pending(task_ids[0]) == []
+        assert buffer.stats().dropped == 1
+        assert buffer.stats().pending == 2
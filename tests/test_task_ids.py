@@ -0,0 +1,69 @@
+"""
+Тесты генераторов идентификаторов задач и пагинации по id
+"""
+
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.ids import get_id_generator, ulid, uuid7
+
+
+def test_uuid7_layout_and_order():
+    ids = [uuid7() for _ in range(10000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(task_id.version == 7 and task_id.variant == uuid.RFC_4122 for task_id in ids)
+    assert abs((ids[0].int >> 80) - time.time() * 1000) < 1000
+
+
+def test_ulid_order():
+    ids = [ulid() for _ in range(10000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_unknown_generator_rejected():
+    with pytest.raises(ValueError):
+        get_id_generator("snowflake")
+
+
+class TestIdOrderedPagination:
+    """Порядок и курсоры по id при упорядоченных по времени идентификаторах"""
+
+    @pytest.fixture
+    def uuid7_ids(self, monkeypatch):
+        monkeypatch.setattr(settings, "task_id_generator", "uuid7")
+
+    def _create_tasks(self, client, count):
+        return [
+            client.post("/api/v1/tasks/", json={"title": f"Задача {i}"}).json()["data"]["id"]
+            for i in range(count)
+        ]
+
+    def test_id_order_matches_creation_order(self, client, setup_database, clean_database, uuid7_ids):
+        created = self._create_tasks(client, 5)
+
+        seen = []
+        params = {"limit": 2, "order": "id"}
+        while True:
+            data = client.get("/api/v1/tasks/", params=params).json()["data"]
+            seen.extend(task["id"] for task in data["tasks"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert uuid.UUID(created[0]).version == 7
+        assert seen == created
+
+    def test_cursor_of_other_order_rejected(self, client, setup_database, clean_database, uuid7_ids):
+        self._create_tasks(client, 3)
+        cursor = client.get("/api/v1/tasks/", params={"limit": 1}).json()["data"]["next_cursor"]
+
+        response = client.get("/api/v1/tasks/", params={"limit": 1, "order": "id", "cursor": cursor})
+
+        assert response.status_code == 400
@@ -0,0 +1,81 @@
+"""
+Тесты потокового импорта задач
+"""
+
+import json
+
+import pytest
+
+from app.services.task_import import iter_csv, iter_lines
+
+
+class TestTaskImport:
+    """Проверка POST /api/v1/tasks/import"""
+
+    def test_ndjson_import(self, client, setup_database, clean_database):
+        body = "\n".join([
+            json.dumps({"title": "Первая", "status": "completed"}),
+            "",
+            json.dumps({"title": "Вторая", "description": "Описание"}),
+            "{broken json",
+            json.dumps({"description": "Без названия"}),
+            json.dumps({"title": "   "}),
+            json.dumps({"title": "Третья"}),
+        ])
+
+        response = client.post("/api/v1/tasks/import", content=body.encode(), params={"chunk_size": 2})
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["inserted"] == 3
+        assert data["rejected"] == 3
+        assert [error["line"] for error in data["errors"]] == [4, 5, 6]
+        assert client.get("/api/v1/tasks/").json()["data"]["total"] == 3
+        assert client.get("/api/v1/tasks/", params={"task_status": "completed"}).json()["data"]["total"] == 1
+
+    def test_csv_import_with_multiline_field(self, client, setup_database, clean_database):
+        body = 'title,description,status\r\nПервая,"строка 1\r\nстрока 2",in_progress\r\nВторая,,\r\n'
+
+        response = client.post("/api/v1/tasks/import", content=body.encode(), params={"format": "csv"})
+
+        data = response.json()["data"]
+        assert (data["inserted"], data["rejected"]) == (2, 0)
+        tasks = client.get("/api/v1/tasks/").json()["data"]["tasks"]
+        assert tasks[0]["description"] == "строка 1\nстрока 2"
+        assert tasks[0]["status"] == "in_progress"
+        assert tasks[1]["description"] is None
+
+    def test_csv_field_count_mismatch(self, client, setup_database, clean_database):
+        body = "title,status\nЗадача,created,лишнее\n"
+
+        data = client.post("/api/v1/tasks/import", content=body.encode(), params={"format": "csv"}).json()["data"]
+
+        assert (data["inserted"], data["rejected"]) == (0, 1)
+        assert data["errors"][0]["line"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks():
+    """Строки и многобайтовые символы, разрезанные границей чанков, собираются целиком"""
+    payload = "первая\nвторая\r\nтретья".encode()
+
+    async def byte_by_byte():
+        for i in range(len(payload)):
+            yield payload[i:i + 1]
+
+    assert [line async for line in iter_lines(byte_by_byte())] == ["первая", "вторая", "третья"]
+
+
+@pytest.mark.asyncio
+async def test_csv_unclosed_quote_is_capped():
+    """Запись с незакрытой кавычкой отклоняется по достижении предела, разбор продолжается"""
+    lines = ["title,description", 'Плохая,"незакрыто'] + [f"Задача {i}," for i in range(5)]
+
+    async def chunks():
+        yield "\n".join(lines).encode()
+
+    records = [record async for record in iter_csv(chunks(), max_record_size=40)]
+
+    assert [line for line, _ in records] == [2, 6, 7]
+    assert isinstance(records[0][1], ValueError)
+    assert [record for _, record in records[1:]] == [{"title": "Задача 3"}, {"title": "Задача 4"}]
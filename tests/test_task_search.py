@@ -0,0 +1,97 @@
+"""
+Тесты полнотекстового поиска задач
+"""
+
+from sqlalchemy import text
+
+from app.models.task_search import to_fts5_query
+from app.repositories.task_repository import TaskRepository
+from tests.conftest import TestingSessionLocal
+
+
+class TestTaskSearch:
+    """Проверка GET /api/v1/tasks/search"""
+
+    def _create(self, client, title, description=None, status="created"):
+        response = client.post(
+            "/api/v1/tasks/", json={"title": title, "description": description, "status": status}
+        )
+        return response.json()["data"]["id"]
+
+    def _search(self, client, **params):
+        response = client.get("/api/v1/tasks/search", params=params)
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    def test_search_by_title_and_description(self, client, setup_database, clean_database):
+        self._create(client, "Купить молоко", "в магазине у дома")
+        self._create(client, "Позвонить маме", "вечером, после работы")
+        self._create(client, "Починить кран", "купить прокладку")
+
+        data = self._search(client, q="купить")
+
+        assert data["total"] == 2
+        assert {task["title"] for task in data["tasks"]} == {"Купить молоко", "Починить кран"}
+
+    def test_ranked_by_relevance(self, client, setup_database, clean_database):
+        self._create(client, "Отчет", "подготовить данные для квартального отчета")
+        self._create(client, "Квартальный отчет", "квартальный отчет для руководства")
+
+        data = self._search(client, q="квартальн")
+
+        assert [task["title"] for task in data["tasks"]] == ["Квартальный отчет", "Отчет"]
+
+    def test_prefix_and_multiple_words(self, client, setup_database, clean_database):
+        self._create(client, "Обновить документацию API")
+        self._create(client, "Обновить зависимости")
+
+        assert self._search(client, q="документ")["total"] == 1
+        assert self._search(client, q="обновить завис")["total"] == 1
+
+    def test_index_follows_updates_and_deletes(self, client, setup_database, clean_database):
+        task_id = self._create(client, "Старое название")
+
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Новое название"})
+        assert self._search(client, q="старое")["total"] == 0
+        assert self._search(client, q="новое")["total"] == 1
+
+        client.delete(f"/api/v1/tasks/{task_id}")
+        assert self._search(client, q="новое")["total"] == 0
+
+    def test_status_filter_and_pagination(self, client, setup_database, clean_database):
+        for i in range(3):
+            self._create(client, f"Задача ревью {i}", status="completed" if i else "created")
+
+        data = self._search(client, q="ревью", status="completed", limit=1, offset=1)
+
+        assert data["total"] == 2
+        assert len(data["tasks"]) == 1
+        assert data["tasks"][0]["status"] == "completed"
+
+    def test_query_syntax_is_escaped(self, client, setup_database, clean_database):
+        self._create(client, 'Задача "NEAR" OR *')
+
+        assert self._search(client, q='"NEAR" OR')["total"] == 1
+        assert self._search(client, q="AND (")["total"] == 0
+
+    def test_empty_query_rejected(self, client, setup_database, clean_database):
+        assert client.get("/api/v1/tasks/search", params={"q": ""}).status_code == 422
+        assert client.get("/api/v1/tasks/search", params={"q": "   "}).status_code == 400
+
+    def test_like_fallback_without_index(self, client, setup_database, clean_database):
+        self._create(client, "Проверка 100% покрытия")
+
+        db = TestingSessionLocal()
+        try:
+            db.execute(text("DROP TABLE tasks_fts"))
+            repository = TaskRepository(db)
+            assert [task.title for task in repository.search("100%")] == ["Проверка 100% покрытия"]
+            assert repository.search_count("покрытия") == 1
+        finally:
+            db.close()
+
+
+def test_to_fts5_query():
+    assert to_fts5_query("купить молоко") == '"купить" "молоко"*'
+    assert to_fts5_query('a"b') == '"a""b"*'
+    assert to_fts5_query("   ") == ""
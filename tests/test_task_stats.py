@@ -0,0 +1,106 @@
+"""
+Тесты сводной статистики и агрегатов задач
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.models.task import Task
+from app.models.task_rollup import TaskRollup
+from app.repositories.task_repository import TaskRepository
+from tests.conftest import TestingSessionLocal
+
+
+def rollup_rows():
+    db = TestingSessionLocal()
+    try:
+        return sorted(
+            (row.granularity, row.metric, row.bucket_start, row.count)
+            for row in db.scalars(select(TaskRollup)) if row.count
+        )
+    finally:
+        db.close()
+
+
+class TestTaskStats:
+    """Проверка GET /api/v1/tasks/stats"""
+
+    def _stats(self, client, **params):
+        response = client.get("/api/v1/tasks/stats", params=params)
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    def test_stats_follow_writes(self, client, setup_database, clean_database):
+        first = client.post("/api/v1/tasks/", json={"title": "Первая"}).json()["data"]["id"]
+        client.post("/api/v1/tasks/", json={"title": "Вторая", "status": "completed"})
+        client.put(f"/api/v1/tasks/{first}", json={"status": "completed"})
+
+        data = self._stats(client)
+
+        assert data["by_status"] == {"created": 0, "in_progress": 0, "completed": 2}
+        assert data["total"] == 2
+        assert [(b["created"], b["completed"]) for b in data["buckets"]] == [(2, 2)]
+
+        client.put(f"/api/v1/tasks/{first}", json={"status": "in_progress"})
+        client.delete(f"/api/v1/tasks/{first}")
+
+        data = self._stats(client, granularity="hour")
+        assert data["by_status"]["completed"] == 1
+        assert [(b["created"], b["completed"]) for b in data["buckets"]] == [(1, 1)]
+
+    def test_period_filter(self, client, setup_database, clean_database):
+        task_id = client.post("/api/v1/tasks/", json={"title": "Старая"}).json()["data"]["id"]
+        db = TestingSessionLocal()
+        old = datetime.now(timezone.utc) - timedelta(days=3)
+        db.execute(update(Task).where(Task.id == task_id).values(created_at=old))
+        db.commit()
+        TaskRepository(db).rebuild_rollups()
+        db.close()
+        client.post("/api/v1/tasks/", json={"title": "Новая"})
+
+        recent = self._stats(client, since=(datetime.now(timezone.utc) - timedelta(days=1)).isoformat())
+        everything = self._stats(client)
+
+        assert [b["created"] for b in recent["buckets"]] == [1]
+        assert [b["created"] for b in everything["buckets"]] == [1, 1]
+        assert everything["buckets"][0]["bucket_start"].startswith(old.date().isoformat())
+
+    def test_since_at_bucket_start(self, client, setup_database, clean_database):
+        client.post("/api/v1/tasks/", json={"title": "Задача"})
+        now = datetime.now(timezone.utc)
+
+        day = self._stats(client, since=now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat())
+        hour = self._stats(
+            client, granularity="hour", since=now.replace(minute=0, second=0, microsecond=0).isoformat()
+        )
+
+        assert [b["created"] for b in day["buckets"]] == [1]
+        assert [b["created"] for b in hour["buckets"]] == [1]
+
+    def test_invalid_period(self, client, setup_database, clean_database):
+        now = datetime.now(timezone.utc)
+        response = client.get(
+            "/api/v1/tasks/stats", params={"since": now.isoformat(), "until": (now - timedelta(hours=1)).isoformat()}
+        )
+
+        assert response.status_code == 400
+
+    def test_rebuild_matches_incremental(self, client, setup_database, clean_database):
+        ids = [
+            client.post("/api/v1/tasks/", json={"title": f"Задача {i}"}).json()["data"]["id"]
+            for i in range(6)
+        ]
+        for task_id in ids[:4]:
+            client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+        client.put(f"/api/v1/tasks/{ids[0]}", json={"title": "Правка после завершения"})
+        client.put(f"/api/v1/tasks/{ids[1]}", json={"status": "created"})
+        client.delete(f"/api/v1/tasks/{ids[2]}")
+        client.request("DELETE", "/api/v1/tasks/bulk", json={"ids": ids[4:]})
+
+        incremental = rollup_rows()
+        db = TestingSessionLocal()
+        TaskRepository(db).rebuild_rollups()
+        db.close()
+
+        assert rollup_rows() == incremental
@@ -0,0 +1,219 @@
+"""
+Тесты потока изменений задач (SSE)
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.main import app
+from app.models.task import TaskStatus
+from app.services import broadcast
+from app.services.broadcast import OVERFLOW_MESSAGE, RESET_MESSAGE, TaskBroadcast, TaskChangeType
+
+
+def parse_events(data: bytes) -> list:
+    """Разбор сообщений SSE в список (id, event, data); комментарии пропускаются"""
+    events = []
+    for block in data.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def publish(hub, change_type, *tasks):
+    hub.publish(change_type, [(status, json.dumps({"id": task_id})) for task_id, status in tasks])
+
+
+async def read_stream(path: str, count: int, headers: list = (), on_start=None) -> tuple:
+    """GET через ASGI-приложение: статус и тело потока до count событий, затем отключение клиента"""
+    disconnected = asyncio.Event()
+    started = asyncio.Event()
+    body = bytearray()
+    status_code = None
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            started.set()
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if body.count(b"\n\n") >= count or not message.get("more_body"):
+                disconnected.set()
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"test"), *headers],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    request = asyncio.ensure_future(app(scope, receive, send))
+    await started.wait()
+    if on_start is not None:
+        on_start()
+    await asyncio.wait_for(request, 5)
+    return status_code, bytes(body)
+
+
+class TestTaskBroadcast:
+    """Общий буфер, очереди подписчиков и дочитывание по Last-Event-ID"""
+
+    def test_subscriber_receives_published_changes(self):
+        hub = TaskBroadcast()
+
+        async def scenario():
+            subscription = hub.subscribe()
+            publish(hub, TaskChangeType.CREATED, ("a", TaskStatus.CREATED))
+            publish(hub, TaskChangeType.DELETED, ("b", None))
+            return await subscription.get(1.0)
+
+        changes = asyncio.run(scenario())
+
+        events = parse_events(b"".join(change.message for change in changes))
+        assert [(event, data["id"]) for _, event, data in events] == [("created", "a"), ("deleted", "b")]
+        assert events[0][0] == f"{hub.epoch}-1"
+
+    def test_status_filter(self):
+        hub = TaskBroadcast()
+
+        async def scenario():
+            subscription = hub.subscribe([TaskStatus.COMPLETED])
+            publish(hub, TaskChangeType.UPDATED, ("a", TaskStatus.IN_PROGRESS), ("b", TaskStatus.COMPLETED))
+            publish(hub, TaskChangeType.DELETED, ("c", None))
+            return await subscription.get(1.0)
+
+        changes = asyncio.run(scenario())
+
+        assert [data["id"] for _, _, data in parse_events(b"".join(c.message for c in changes))] == ["b", "c"]
+
+    def test_heartbeat_when_idle(self):
+        hub = TaskBroadcast()
+
+        async def scenario():
+            return await hub.subscribe().get(0.01)
+
+        assert asyncio.run(scenario()) == []
+
+    def test_slow_subscriber_overflows(self):
+        hub = TaskBroadcast(max_pending=3)
+
+        async def scenario():
+            slow = hub.subscribe()
+            fast = hub.subscribe()
+            publish(hub, TaskChangeType.CREATED, *[(str(i), TaskStatus.CREATED) for i in range(2)])
+            fast_changes = await fast.get(1.0)
+            publish(hub, TaskChangeType.CREATED, *[(str(i), TaskStatus.CREATED) for i in range(2, 4)])
+            messages = [message async for message in slow.messages(1.0)]
+            return messages, fast_changes, await fast.get(1.0)
+
+        messages, first, second = asyncio.run(scenario())
+
+        assert messages == [OVERFLOW_MESSAGE]
+        assert len(first) + len(second) == 4
+        assert hub.stats().overflows == 1
+        assert hub.stats().subscribers == 1
+
+    def test_resume_from_last_event_id(self):
+        hub = TaskBroadcast()
+        publish(hub, TaskChangeType.CREATED, *[(str(i), TaskStatus.CREATED) for i in range(5)])
+
+        async def scenario():
+            return await hub.subscribe(last_event_id=f"{hub.epoch}-2").get(1.0)
+
+        changes = asyncio.run(scenario())
+
+        assert [data["id"] for _, _, data in parse_events(b"".join(c.message for c in changes))] == ["2", "3", "4"]
+
+    @pytest.mark.parametrize("event_id", ["other-2", "{epoch}-1", "{epoch}-99", "garbage"])
+    def test_reset_when_events_are_lost(self, event_id):
+        hub = TaskBroadcast(buffer_size=3)
+        publish(hub, TaskChangeType.CREATED, *[(str(i), TaskStatus.CREATED) for i in range(5)])
+
+        async def scenario():
+            subscription = hub.subscribe(last_event_id=event_id.format(epoch=hub.epoch))
+            hub.close()
+            return [message async for message in subscription.messages(1.0)]
+
+        assert asyncio.run(scenario()) == [RESET_MESSAGE]
+        assert hub.stats().resets == 1
+
+    def test_publish_from_other_thread(self):
+        hub = TaskBroadcast()
+
+        async def scenario():
+            subscription = hub.subscribe()
+            thread = threading.Thread(target=publish, args=(hub, TaskChangeType.CREATED, ("a", TaskStatus.CREATED)))
+            thread.start()
+            changes = await subscription.get(5.0)
+            thread.join()
+            return changes
+
+        assert len(asyncio.run(scenario())) == 1
+
+
+class TestTaskStreamEndpoint:
+    """Публикация изменений сервисом и поток /api/v1/tasks/stream"""
+
+    @pytest.fixture
+    def hub(self, monkeypatch):
+        hub = TaskBroadcast()
+        monkeypatch.setattr(broadcast, "task_broadcast", hub)
+        return hub
+
+    def test_service_publishes_changes(self, client, hub, setup_database, clean_database):
+        task = client.post("/api/v1/tasks/", json={"title": "Задача"}).json()["data"]
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "completed"})
+        client.delete(f"/api/v1/tasks/{task['id']}")
+        client.post("/api/v1/tasks/bulk", json={"items": [{"title": "Первая"}, {"title": "Вторая"}]})
+
+        events = parse_events(b"".join(change.message for change in hub._buffer))
+
+        assert [event for _, event, _ in events] == ["created", "updated", "deleted", "created", "created"]
+        assert events[0][2] == task
+        assert events[1][2]["status"] == "completed"
+        assert events[2][2] == {"id": task["id"]}
+        assert [data["title"] for _, _, data in events[3:]] == ["Первая", "Вторая"]
+
+    def test_import_publishes_full_tasks(self, client, hub, setup_database, clean_database):
+        body = "\n".join(json.dumps({"title": title}) for title in ("Первая", "Вторая"))
+        client.post("/api/v1/tasks/import", content=body.encode(), params={"chunk_size": 1})
+
+        events = parse_events(b"".join(change.message for change in hub._buffer))
+
+        assert [event for _, event, _ in events] == ["created", "created"]
+        for _, _, data in events:
+            assert data == client.get(f"/api/v1/tasks/{data['id']}").json()["data"]
+
+    def test_stream_endpoint(self, hub):
+        def on_start():
+            publish(hub, TaskChangeType.CREATED, ("a", TaskStatus.CREATED), ("b", TaskStatus.COMPLETED))
+
+        status_code, body = asyncio.run(read_stream("/api/v1/tasks/stream?status=completed", 1, on_start=on_start))
+
+        assert status_code == 200
+        assert [(event, data) for _, event, data in parse_events(body)] == [("created", {"id": "b"})]
+        # Подписка снимается при отключении клиента
+        assert hub.stats().subscribers == 0
+
+    def test_stream_resumes_with_last_event_id(self, hub):
+        publish(hub, TaskChangeType.CREATED, ("a", TaskStatus.CREATED), ("b", TaskStatus.CREATED))
+
+        _, body = asyncio.run(read_stream(
+            "/api/v1/tasks/stream", 1, headers=[(b"last-event-id", f"{hub.epoch}-1".encode())]
+        ))
+
+        assert parse_events(body) == [(f"{hub.epoch}-2", "created", {"id": "b"})]
+
+    def test_stream_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(broadcast, "task_broadcast", None)
+
+        assert client.get("/api/v1/tasks/stream").status_code == 404
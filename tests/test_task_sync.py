@@ -0,0 +1,138 @@
+"""
+Тесты синхронизации изменений задач (/api/v1/tasks/changes)
+"""
+
+from datetime import timedelta
+
+import pytest
+
+from app.models.task import utcnow
+from app.repositories.task_repository import TaskRepository
+from tests.conftest import TestingSessionLocal
+
+
+def create_tasks(client, count: int) -> list:
+    response = client.post("/api/v1/tasks/bulk", json={"items": [{"title": f"Задача {i}"} for i in range(count)]})
+    return [result["data"] for result in response.json()["data"]["results"]]
+
+
+def sync(client, token=None, limit=100) -> dict:
+    params = {"limit": limit}
+    if token is not None:
+        params["since"] = token
+    response = client.get("/api/v1/tasks/changes", params=params)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.mark.usefixtures("setup_database", "clean_database")
+class TestTaskSync:
+    """Номера изменений, надгробия удалений и токены синхронизации"""
+
+    def test_initial_sync_returns_all_tasks(self, client):
+        tasks = create_tasks(client, 3)
+        client.delete(f"/api/v1/tasks/{tasks[0]['id']}")
+
+        data = sync(client)
+
+        assert sorted(task["id"] for task in data["changes"]) == sorted(task["id"] for task in tasks[1:])
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+
+    def test_incremental_sync(self, client):
+        tasks = create_tasks(client, 3)
+        token = sync(client)["next_token"]
+
+        client.put(f"/api/v1/tasks/{tasks[1]['id']}", json={"status": "completed"})
+        client.delete(f"/api/v1/tasks/{tasks[2]['id']}")
+        created = client.post("/api/v1/tasks/", json={"title": "Новая"}).json()["data"]
+        client.put(f"/api/v1/tasks/{tasks[1]['id']}", json={"title": "Переименована"})
+
+        data = sync(client, token)
+
+        # Задача, измененная дважды, возвращается один раз в последней версии и после новой
+        assert [task["id"] for task in data["changes"]] == [created["id"], tasks[1]["id"]]
+        assert data["changes"][1]["title"] == "Переименована"
+        assert data["changes"][1]["status"] == "completed"
+        assert data["deleted"] == [tasks[2]["id"]]
+
+        # Без новых изменений ответ пустой
+        empty = sync(client, data["next_token"])
+        assert empty["changes"] == [] and empty["deleted"] == [] and empty["has_more"] is False
+
+    def test_lease_renewal_is_not_a_change(self, client):
+        create_tasks(client, 1)
+        task = client.post("/api/v1/tasks/claim", params={"owner": "worker"}).json()["data"]["tasks"][0]
+        token = sync(client)["next_token"]
+
+        response = client.post(f"/api/v1/tasks/{task['id']}/lease", params={"owner": "worker", "lease": 600})
+
+        assert response.status_code == 200
+        assert sync(client, token)["changes"] == []
+
+    def test_pagination_returns_each_change_once(self, client):
+        tasks = create_tasks(client, 4)
+        token = sync(client)["next_token"]
+        for task in tasks[:3]:
+            client.delete(f"/api/v1/tasks/{task['id']}")
+        created = create_tasks(client, 3)
+
+        changes, deleted, pages = [], [], 0
+        while True:
+            data = sync(client, token, limit=2)
+            changes.extend(task["id"] for task in data["changes"])
+            deleted.extend(data["deleted"])
+            token = data["next_token"]
+            pages += 1
+            if not data["has_more"]:
+                break
+
+        assert pages == 3
+        assert deleted == [task["id"] for task in tasks[:3]]
+        assert sorted(changes) == sorted(task["id"] for task in created)
+
+    def test_sync_payload_is_smaller_than_full_refetch(self, client):
+        tasks = create_tasks(client, 200)
+        token = sync(client, limit=1000)["next_token"]
+
+        # 1% изменений: одна задача изменена, одна удалена
+        client.put(f"/api/v1/tasks/{tasks[0]['id']}", json={"status": "in_progress"})
+        client.delete(f"/api/v1/tasks/{tasks[1]['id']}")
+
+        full = client.get("/api/v1/tasks/", params={"limit": 1000})
+        delta = client.get("/api/v1/tasks/changes", params={"since": token, "limit": 1000})
+
+        assert len(full.json()["data"]["tasks"]) == 199
+        assert len(delta.json()["data"]["changes"]) == 1
+        assert len(delta.content) * 50 < len(full.content)
+
+    def test_expired_token_after_purge(self, client):
+        tasks = create_tasks(client, 2)
+        token = sync(client)["next_token"]
+        client.delete(f"/api/v1/tasks/{tasks[0]['id']}")
+
+        with TestingSessionLocal() as db:
+            assert TaskRepository(db).purge_tombstones(utcnow() + timedelta(seconds=1)) == 1
+
+        response = client.get("/api/v1/tasks/changes", params={"since": token})
+        assert response.status_code == 410
+
+        # После полной синхронизации токен снова действителен
+        fresh = sync(client)
+        assert [task["id"] for task in fresh["changes"]] == [tasks[1]["id"]]
+        assert sync(client, fresh["next_token"])["changes"] == []
+
+    def test_purge_keeps_recent_tombstones(self, client):
+        tasks = create_tasks(client, 1)
+        token = sync(client)["next_token"]
+        client.delete(f"/api/v1/tasks/{tasks[0]['id']}")
+
+        with TestingSessionLocal() as db:
+            assert TaskRepository(db).purge_tombstones(utcnow() - timedelta(days=1)) == 0
+
+        assert sync(client, token)["deleted"] == [tasks[0]["id"]]
+
+    def test_invalid_token(self, client):
+        response = client.get("/api/v1/tasks/changes", params={"since": "not-a-token"})
+
+        assert response.status_code == 400
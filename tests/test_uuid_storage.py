@@ -0,0 +1,43 @@
+"""
+Тесты режимов хранения идентификаторов (GUID)
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, select, text
+
+from app.models.task import GUID
+
+
+def make_table(storage):
+    metadata = MetaData()
+    table = Table(
+        "items", metadata,
+        Column("id", GUID(storage), primary_key=True),
+        Column("title", String(50)),
+    )
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    return engine, table
+
+
+@pytest.mark.parametrize("storage, stored_type, stored_length", [("string", "text", 36), ("binary", "blob", 16)])
+def test_round_trip(storage, stored_type, stored_length):
+    engine, table = make_table(storage)
+    ids = sorted(uuid.uuid4() for _ in range(3))
+
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"id": task_id, "title": str(i)} for i, task_id in enumerate(ids)])
+        conn.execute(insert(table).values(id=str(uuid.uuid4()), title="строка"))
+
+        assert conn.execute(text("SELECT typeof(id), length(id) FROM items LIMIT 1")).one() == (
+            stored_type, stored_length
+        )
+        assert conn.execute(select(table.c.title).where(table.c.id == ids[1])).scalar_one() == "1"
+        assert conn.execute(select(table.c.id).where(table.c.id.in_(ids)).order_by(table.c.id)).scalars().all() == ids
+
+
+def test_unknown_storage_rejected():
+    with pytest.raises(ValueError):
+        GUID("hex")